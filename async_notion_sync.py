@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# async_notion_sync.py - Notion → Obsidian Sync mit asyncio (notion_client.AsyncClient)
+
+import os
+import signal
+import asyncio
+from enhanced_notion_sync import EnhancedNotionToObsidian
+from notion_transport import AsyncNotionTransport, create_async_notion_client
+
+
+class AsyncNotionToObsidian(EnhancedNotionToObsidian):
+    """Gleiche Hierarchie und Dateistruktur wie EnhancedNotionToObsidian,
+    aber Block-Bäume werden über einen AsyncClient geladen.
+
+    Alle Pages laufen gleichzeitig (begrenzt durch ein Semaphore), jede mit
+    eigenem Timeout. Der Async-Transport teilt sich Token-Bucket und Zähler
+    mit dem Sync-Transport, damit beide zusammen im Notion-Limit bleiben.
+    Search-Pagination bleibt sequentiell (Cursor-basiert).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.concurrency = int(os.getenv('NOTION_ASYNC_CONCURRENCY', '16'))
+        self.page_timeout = float(os.getenv('NOTION_PAGE_TIMEOUT', '120'))
+
+        # Prefetch immer aktiv - die Parallelität regelt das Semaphore
+        self.fetch_workers = self.concurrency
+
+    def fetch_block_trees(self, page_ids):
+        """Block-Bäume aller Pages in einem Event-Loop laden"""
+        try:
+            return asyncio.run(self.fetch_block_trees_async(page_ids))
+        except asyncio.CancelledError:
+            print("🛑 Async-Sync abgebrochen")
+            raise SystemExit(1)
+
+    async def fetch_block_trees_async(self, page_ids):
+        # SIGTERM (docker stop) bricht alle laufenden Requests sauber ab
+        loop = asyncio.get_running_loop()
+        current_task = asyncio.current_task()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, current_task.cancel)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+        transport = AsyncNotionTransport(share_with=self.transport)
+        client = create_async_notion_client(self.notion_token, transport)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        try:
+            results = await asyncio.gather(*(
+                self.fetch_page_tree_with_timeout(client, semaphore, page_id)
+                for page_id in page_ids
+            ))
+        finally:
+            await client.aclose()
+            try:
+                loop.remove_signal_handler(signal.SIGTERM)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        return {page_id: tree for page_id, tree in zip(page_ids, results) if tree is not None}
+
+    async def fetch_page_tree_with_timeout(self, client, semaphore, page_id):
+        """Block-Baum einer Page oder None bei Timeout/Fehler (Page steht dann in failed_pages)"""
+        try:
+            return await asyncio.wait_for(
+                self.fetch_page_tree(client, semaphore, page_id),
+                timeout=self.page_timeout
+            )
+        except asyncio.TimeoutError:
+            print(f"⏰ Timeout beim Laden von {page_id[:8]}... - Page wird übersprungen")
+            self.failed_pages[page_id] = f"Block-Fetch Timeout (>{self.page_timeout:.0f}s)"
+            return None
+        except Exception as e:
+            print(f"⚠️ Blocks von {page_id[:8]}... nicht vollständig geladen ({e}) - Page wird übersprungen")
+            self.failed_pages[page_id] = str(e)
+            return None
+
+    async def fetch_page_tree(self, client, semaphore, page_id):
+        """Breitensuche über den Block-Baum einer Page: eine Ebene pro Round-Trip"""
+        tree = []
+        budget = self.block_budget
+        level = [(page_id, tree)]
+        depth = 0
+
+        while level:
+            results = await asyncio.gather(*(
+                self.fetch_block_children_async(client, semaphore, block_id)
+                for block_id, _ in level
+            ), return_exceptions=True)
+            # Eine fehlgeschlagene Ebene macht den ganzen Baum unvollständig
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                raise errors[0]
+            next_level = []
+
+            for (block_id, target), children in zip(level, results):
+                if len(children) > budget:
+                    print(f"⚠️ Block-Budget ({self.block_budget}) erreicht für {page_id[:8]}... - Rest abgeschnitten")
+                    children = children[:budget]
+                budget -= len(children)
+                target.extend(children)
+
+                if depth >= self.block_max_depth:
+                    continue
+
+                for child in children:
+                    if self.should_descend(child):
+                        child['children'] = []
+                        next_level.append((child['id'], child['children']))
+
+            level = next_level if budget > 0 else []
+            depth += 1
+
+        return tree
+
+    async def fetch_block_children_async(self, client, semaphore, block_id):
+        """Alle direkten Kinder eines Blocks (paginiert) - Fehler schlagen bis zur Page durch"""
+        async with semaphore:
+            blocks = []
+            has_more = True
+            next_cursor = None
+
+            while has_more:
+                query_params = {"block_id": block_id}
+
+                if next_cursor:
+                    query_params["start_cursor"] = next_cursor
+
+                response = await client.blocks.children.list(**query_params)
+                blocks.extend(response.get('results', []))
+
+                has_more = response.get('has_more', False)
+                next_cursor = response.get('next_cursor')
+
+            return blocks
+
+
+if __name__ == "__main__":
+    # Gleicher Einstieg wie enhanced_notion_sync.py, nur mit Async-Engine
+    os.environ['NOTION_SYNC_ENGINE'] = 'async'
+    from enhanced_notion_sync import main
+    main()
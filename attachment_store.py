@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# attachment_store.py - Notion-Dateien (Bilder, PDFs, Videos, ...) in einen content-addressed Store laden
+
+import os
+import json
+import hashlib
+import mimetypes
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+import httpx
+
+DEFAULT_WORKERS = int(os.getenv('NOTION_ATTACHMENT_WORKERS', '4'))
+DEFAULT_MAX_MB = int(os.getenv('NOTION_ATTACHMENT_MAX_MB', '100'))
+
+# Block-Typen mit Datei-Inhalt (file: von Notion gehostet, external: fremde URL)
+ATTACHMENT_BLOCK_TYPES = ('image', 'file', 'pdf', 'video', 'audio')
+
+
+class AttachmentStore:
+    """Downloads nach `attachments/<sha256>.<ext>` - gleiche Inhalte liegen nur einmal im Vault
+
+    Notion-URLs laufen nach einer Stunde ab, deshalb wird während des Syncs
+    geladen. `.notion_attachments.json` merkt sich pro Block die
+    last_edited_time und die Zieldatei; unveränderte Blocks werden nicht
+    erneut geladen. Dateien werden gestreamt (nie komplett im Speicher).
+
+    Blocks aus dem Block-Cache tragen oft längst abgelaufene URLs. Mit
+    `refresh_block` (block_id → frischer Block, z.B. blocks.retrieve) wird
+    eine abgelaufene URL vor dem Download und nach einem fehlgeschlagenen
+    Download einmal neu geholt.
+    """
+
+    def __init__(self, obsidian_path: Path, workers: int = DEFAULT_WORKERS,
+                 max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024, refresh_block=None):
+        self.obsidian_path = Path(obsidian_path)
+        self.refresh_block = refresh_block
+        self.store_dir = self.obsidian_path / 'attachments'
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.obsidian_path / '.notion_attachments.json'
+        self.workers = workers
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.dirty = False
+        # Fehlgeschlagene Blocks nur einmal pro Lauf versuchen (Prefetch + Rendern)
+        self.failed_blocks = set()
+        self.stats = {'downloaded': 0, 'unchanged': 0, 'deduplicated': 0, 'failed': 0, 'bytes': 0}
+        self.client = httpx.Client(
+            follow_redirects=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=max(1, workers), max_keepalive_connections=max(1, workers))
+        )
+        self.load()
+
+    def load(self):
+        self.manifest = {}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    self.manifest = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden des Attachment-Manifests: {e}")
+
+    def save(self):
+        """Manifest speichern (nur wenn geändert)"""
+        if not self.dirty:
+            return
+        try:
+            tmp_file = self.manifest_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2)
+            tmp_file.replace(self.manifest_file)
+            self.dirty = False
+        except Exception as e:
+            print(f"⚠️ Fehler beim Speichern des Attachment-Manifests: {e}")
+
+    @staticmethod
+    def is_attachment(block) -> bool:
+        return block.get('type') in ATTACHMENT_BLOCK_TYPES
+
+    def ensure(self, block):
+        """Vault-Pfad der Datei eines Blocks - lädt nur, wenn Block neu oder geändert ist
+
+        Returns den relativen Pfad oder None (externe URL oder Download fehlgeschlagen).
+        """
+        file_info = block.get(block.get('type'), {})
+        if file_info.get('type') != 'file':
+            return None
+
+        block_id = block['id']
+        last_edited_time = block.get('last_edited_time')
+
+        with self.lock:
+            entry = self.manifest.get(block_id)
+        if (entry and entry.get('last_edited_time') == last_edited_time
+                and (self.obsidian_path / entry['path']).exists()):
+            self.count('unchanged')
+            return entry['path']
+
+        if block_id in self.failed_blocks:
+            return None
+
+        # Abgelaufene URL (Block aus dem Cache) gar nicht erst versuchen
+        refreshed = self.is_expired(file_info)
+        if refreshed:
+            file_info = self.refreshed_file_info(block_id) or file_info
+
+        try:
+            try:
+                relative_path = self.download(file_info.get('file', {}).get('url'),
+                                              file_info.get('name') or block.get('name'))
+            except Exception:
+                # Signierte URL evtl. abgelaufen (403) → einmal frisch holen und erneut laden
+                fresh_info = None if refreshed else self.refreshed_file_info(block_id)
+                if not fresh_info:
+                    raise
+                relative_path = self.download(fresh_info.get('file', {}).get('url'),
+                                              fresh_info.get('name') or block.get('name'))
+        except Exception as e:
+            self.failed_blocks.add(block_id)
+            self.count('failed')
+            print(f"⚠️ Download fehlgeschlagen für Block {block_id}: {str(e).splitlines()[0]}")
+            return None
+
+        with self.lock:
+            self.manifest[block_id] = {'last_edited_time': last_edited_time, 'path': relative_path}
+            self.dirty = True
+        return relative_path
+
+    @staticmethod
+    def is_expired(file_info) -> bool:
+        """expiry_time der signierten URL liegt in der Vergangenheit (oder gleich dort)"""
+        expiry_time = file_info.get('file', {}).get('expiry_time')
+        if not expiry_time:
+            return False
+        try:
+            expires = datetime.fromisoformat(expiry_time.replace('Z', '+00:00'))
+        except ValueError:
+            return False
+        return expires - timedelta(minutes=1) <= datetime.now(timezone.utc)
+
+    def refreshed_file_info(self, block_id):
+        """Datei-Info des Blocks mit frischer URL oder None (kein refresh_block / Fehler)"""
+        if not self.refresh_block:
+            return None
+        try:
+            block = self.refresh_block(block_id)
+        except Exception as e:
+            print(f"⚠️ Block {block_id} für frische Datei-URL nicht abrufbar: {e}")
+            return None
+        file_info = block.get(block.get('type'), {})
+        return file_info if file_info.get('type') == 'file' and file_info.get('file', {}).get('url') else None
+
+    def ensure_all(self, blocks):
+        """Viele Blocks parallel laden (begrenzter Worker-Pool)"""
+        blocks = [block for block in blocks if self.is_attachment(block)]
+        if not blocks:
+            return
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            list(executor.map(self.ensure, blocks))
+
+    def download(self, url: str, name_hint: str = None) -> str:
+        """URL streamend in den Store laden, Dateiname = sha256 des Inhalts"""
+        tmp_path = self.store_dir / f".download-{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with self.client.stream('GET', url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_bytes(chunk_size=64 * 1024):
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            raise ValueError(f"Datei größer als {self.max_bytes // (1024 * 1024)} MB")
+                        digest.update(chunk)
+                        f.write(chunk)
+
+            extension = self.guess_extension(url, name_hint, content_type)
+            target = self.store_dir / f"{digest.hexdigest()}{extension}"
+
+            if target.exists():
+                # Gleicher Inhalt bereits im Store
+                tmp_path.unlink()
+                self.count('deduplicated')
+            else:
+                os.replace(tmp_path, target)
+                self.count('downloaded', size)
+
+            return str(target.relative_to(self.obsidian_path))
+
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @staticmethod
+    def guess_extension(url: str, name_hint: str = None, content_type: str = '') -> str:
+        for candidate in (unquote(urlparse(url).path), name_hint or ''):
+            suffix = Path(candidate).suffix.lower()
+            if suffix and len(suffix) <= 6:
+                return suffix
+        return mimetypes.guess_extension(content_type or '') or ''
+
+    def count(self, key: str, size: int = 0):
+        with self.lock:
+            self.stats[key] += 1
+            self.stats['bytes'] += size
+
+    def print_stats(self):
+        """Download-Statistik des aktuellen Laufs ausgeben"""
+        print(f"   📎 Attachments: {self.stats['downloaded']} geladen "
+              f"({self.stats['bytes'] / 1024 / 1024:.1f} MB), {self.stats['unchanged']} unverändert, "
+              f"{self.stats['deduplicated']} dedupliziert, {self.stats['failed']} fehlgeschlagen")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# bench_render.py - Microbenchmark: Markdown-Rendering über alle Block-Typen (Blocks/s im Zeitverlauf)
+
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+from datetime import datetime
+
+os.environ.setdefault('NOTION_TOKEN', 'benchmark')
+os.environ.setdefault('OBSIDIAN_PATH', tempfile.mkdtemp(prefix='bench_vault_'))
+
+from enhanced_notion_sync import EnhancedNotionToObsidian
+
+HISTORY_FILE = os.getenv('BENCH_HISTORY_FILE', 'bench_render_history.jsonl')
+
+
+def rich_text(content, **annotations):
+    return [{"type": "text", "text": {"content": content}, "annotations": annotations}]
+
+
+def text_block(block_type, content, **extra):
+    return {"type": block_type, block_type: {"rich_text": rich_text(content), **extra}}
+
+
+def file_block(block_type, i):
+    return {"id": f"f{i}", "type": block_type, block_type: {
+        "type": "external", "external": {"url": f"https://example.com/{block_type}/{i}"}, "caption": []
+    }}
+
+
+# Eine Vorlage pro Notion Block-Typ - das Korpus wiederholt sie reihum
+BLOCK_FACTORIES = [
+    lambda i: text_block("paragraph", f"Absatz {i} mit etwas Text. " * 4),
+    lambda i: {"type": "paragraph", "paragraph": {"rich_text": (
+        rich_text("fett", bold=True) + rich_text("kursiv", italic=True) + rich_text("code", code=True)
+        + rich_text("alles", bold=True, italic=True, strikethrough=True, underline=True)
+    )}},
+    lambda i: text_block("heading_1", f"Kapitel {i}"),
+    lambda i: text_block("heading_2", f"Abschnitt {i}"),
+    lambda i: text_block("heading_3", f"Unterabschnitt {i}"),
+    lambda i: {**text_block("bulleted_list_item", f"Punkt {i}"),
+               "children": [text_block("bulleted_list_item", "verschachtelt")]},
+    lambda i: text_block("numbered_list_item", f"Schritt {i}"),
+    lambda i: text_block("to_do", f"Aufgabe {i}", checked=i % 2 == 0),
+    lambda i: {**text_block("toggle", f"Toggle {i}"), "children": [text_block("paragraph", "versteckt")]},
+    lambda i: text_block("code", f"print({i})", language="python"),
+    lambda i: text_block("quote", f"Zitat {i}"),
+    lambda i: {**text_block("callout", f"Hinweis {i}"), "callout": {
+        "rich_text": rich_text(f"Hinweis {i}"), "icon": {"emoji": "💡"}}},
+    lambda i: {"type": "divider", "divider": {}},
+    lambda i: {"type": "column_list", "column_list": {}, "children": [
+        {"type": "column", "column": {}, "children": [text_block("paragraph", "links")]},
+        {"type": "column", "column": {}, "children": [text_block("paragraph", "rechts")]},
+    ]},
+    lambda i: {"type": "synced_block", "synced_block": {}, "children": [text_block("paragraph", "synced")]},
+    lambda i: {"type": "table", "table": {"table_width": 2}, "children": [
+        {"type": "table_row", "table_row": {"cells": [rich_text("A"), rich_text("B")]}},
+        {"type": "table_row", "table_row": {"cells": [rich_text(str(i)), rich_text("x")]}},
+    ]},
+    lambda i: file_block("image", i),
+    lambda i: file_block("file", i),
+    lambda i: file_block("pdf", i),
+    lambda i: file_block("video", i),
+    lambda i: file_block("audio", i),
+    lambda i: {"type": "bookmark", "bookmark": {"url": f"https://example.com/{i}", "caption": []}},
+    lambda i: {"type": "embed", "embed": {"url": f"https://example.com/embed/{i}", "caption": []}},
+    lambda i: {"type": "link_preview", "link_preview": {"url": f"https://example.com/preview/{i}"}},
+    lambda i: {"type": "equation", "equation": {"expression": f"e^{{i\\pi}} + {i} = {i - 1}"}},
+    lambda i: {"id": f"cp{i}", "type": "child_page", "child_page": {"title": f"Unterseite {i}"}},
+    lambda i: {"id": f"cd{i}", "type": "child_database", "child_database": {"title": f"Database {i}"}},
+    lambda i: {"type": "link_to_page", "link_to_page": {"type": "page_id", "page_id": f"lp{i}"}},
+    lambda i: text_block("template", f"Vorlage {i}"),
+    lambda i: {"type": "table_of_contents", "table_of_contents": {}},
+    lambda i: {"type": "breadcrumb", "breadcrumb": {}},
+    lambda i: {"type": "unsupported", "unsupported": {}},
+]
+
+
+def synthetic_blocks(count):
+    """Synthetisches Korpus, das alle Block-Typen reihum enthält"""
+    return [BLOCK_FACTORIES[i % len(BLOCK_FACTORIES)](i) for i in range(count)]
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except Exception:
+        return None
+
+
+def load_last_result():
+    if not os.path.exists(HISTORY_FILE):
+        return None
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def main():
+    """Rendert Pages mit 2.5k…20k Blocks, gibt Blocks/s aus und hängt das Ergebnis an die Historie an"""
+    syncer = EnhancedNotionToObsidian()
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2500, 5000, 10000, 20000]
+    previous = load_last_result()
+
+    results = {}
+    print(f"{len(BLOCK_FACTORIES)} Block-Vorlagen im Korpus")
+    print("Blocks    Zeit (ms)   µs/Block    Blocks/s")
+    for size in sizes:
+        blocks = synthetic_blocks(size)
+        page = {
+            'id': f"bench-{size}",
+            'properties': {'title': {'type': 'title', 'title': rich_text('Benchmark')}}
+        }
+        syncer.prefetched_content[page['id']] = blocks
+
+        start = time.perf_counter()
+        syncer.page_to_markdown(page)
+        elapsed = time.perf_counter() - start
+
+        blocks_per_second = size / elapsed
+        results[str(size)] = round(blocks_per_second)
+        print(f"{size:>6}    {elapsed * 1000:>9.1f}   {elapsed * 1e6 / size:>8.2f}   {blocks_per_second:>9.0f}")
+
+    if previous:
+        print(f"\nVergleich mit {previous.get('timestamp')} ({previous.get('revision') or '?'}):")
+        for size, blocks_per_second in results.items():
+            before = previous.get('blocks_per_second', {}).get(size)
+            if before:
+                print(f"{size:>6}    {(blocks_per_second - before) / before * 100:>+7.1f}%")
+
+    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'blocks_per_second': results
+        }) + "\n")
+    print(f"\n📈 Ergebnis an {HISTORY_FILE} angehängt")
+
+
+if __name__ == "__main__":
+    main()
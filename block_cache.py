@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# block_cache.py - Lokaler Cache für Notion Block-Bäume (komprimiert, LRU)
+
+import os
+import sys
+import json
+import gzip
+import threading
+from pathlib import Path
+
+DEFAULT_MAX_MB = int(os.getenv('NOTION_CACHE_MAX_MB', '200'))
+
+
+class BlockCache:
+    """Block-Baum einer Page, gültig solange sich last_edited_time nicht ändert
+
+    Ein gzip-JSON pro Page unter `.notion_cache/blocks/`. Die mtime einer
+    Datei dient als LRU-Zeitstempel; wird die Größengrenze überschritten,
+    fliegen die am längsten nicht genutzten Einträge raus.
+    """
+
+    def __init__(self, obsidian_path: Path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_dir = Path(obsidian_path) / '.notion_cache' / 'blocks'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+        # Größen einmal beim Start erfassen, danach inkrementell pflegen
+        self.sizes = {}
+        for entry in self.cache_dir.glob('*.json.gz'):
+            try:
+                self.sizes[entry] = entry.stat().st_size
+            except OSError:
+                continue
+        self.total_bytes = sum(self.sizes.values())
+
+    def entry_path(self, block_id: str) -> Path:
+        return self.cache_dir / f"{block_id}.json.gz"
+
+    def get(self, block_id: str, last_edited_time: str):
+        """Gecachte Blocks oder None (Miss oder veraltet)"""
+        path = self.entry_path(block_id)
+        if not last_edited_time or not path.exists():
+            self.stats['misses'] += 1
+            return None
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            self.stats['misses'] += 1
+            return None
+
+        if data.get('last_edited_time') != last_edited_time:
+            self.stats['misses'] += 1
+            return None
+
+        # LRU: Zugriff vermerken
+        os.utime(path)
+        self.stats['hits'] += 1
+        return data.get('blocks', [])
+
+    def put(self, block_id: str, last_edited_time: str, blocks: list):
+        """Blocks für (block_id, last_edited_time) speichern"""
+        if not last_edited_time:
+            return
+
+        path = self.entry_path(block_id)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'last_edited_time': last_edited_time, 'blocks': blocks}, f)
+            os.replace(tmp_path, path)
+            size = path.stat().st_size
+        except Exception as e:
+            print(f"⚠️ Fehler beim Cachen von {block_id}: {e}")
+            return
+
+        with self.lock:
+            self.total_bytes += size - self.sizes.get(path, 0)
+            self.sizes[path] = size
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """Älteste Einträge löschen bis der Cache wieder unter 90% der Grenze liegt"""
+        target = self.max_bytes * 0.9
+        entries = []
+        for path in self.sizes:
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                entries.append((0, path))
+
+        for _, path in sorted(entries):
+            if self.total_bytes <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            self.total_bytes -= self.sizes.pop(path)
+            self.stats['evictions'] += 1
+
+    def clear(self) -> int:
+        """Kompletten Cache löschen"""
+        removed = 0
+        for path in list(self.sizes):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        self.sizes = {}
+        self.total_bytes = 0
+        return removed
+
+    def show_status(self):
+        """Cache-Status ausgeben"""
+        print("📦 Block-Cache Status:")
+        print(f"   📍 Verzeichnis: {self.cache_dir}")
+        print(f"   📄 Einträge: {len(self.sizes)}")
+        print(f"   💾 Größe: {self.total_bytes / 1024 / 1024:.1f} MB "
+              f"von {self.max_bytes / 1024 / 1024:.0f} MB")
+
+    def print_stats(self):
+        """Treffer-Statistik des aktuellen Laufs ausgeben"""
+        print(f"   📦 Block-Cache: {self.stats['hits']} Treffer, {self.stats['misses']} Misses, "
+              f"{self.stats['evictions']} verdrängt")
+
+
+def main():
+    """Main function mit Command-Line Interface"""
+    cache = BlockCache(Path(os.getenv('OBSIDIAN_PATH', '/shared/obsidian')))
+
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else 'status'
+
+    if command == 'status':
+        cache.show_status()
+
+    elif command == 'clear':
+        removed = cache.clear()
+        print(f"🧹 {removed} Cache-Einträge gelöscht")
+
+    else:
+        print(f"❌ Unbekannter Command: {command}")
+        print_usage()
+        sys.exit(1)
+
+
+def print_usage():
+    """Usage Information"""
+    print("""
+📦 Notion Block-Cache
+
+Usage:
+    python3 block_cache.py [command]
+
+Commands:
+    status      Cache-Größe und Anzahl Einträge anzeigen (Standard)
+    clear       Cache komplett leeren
+
+Environment Variables:
+    OBSIDIAN_PATH          Pfad zum Obsidian Vault (Standard: /shared/obsidian)
+    NOTION_CACHE_MAX_MB    Maximale Cache-Größe in MB (Standard: 200)
+    """)
+
+
+if __name__ == "__main__":
+    main()
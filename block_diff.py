@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# block_diff.py - Minimaler Block-Diff: bestehende Notion-Blocks → neue Blocks aus Markdown
+
+import json
+import hashlib
+from difflib import SequenceMatcher
+
+# Blocks, die der Reverse-Sync nie anfasst (Löschen würde die Unterseite archivieren)
+PROTECTED_BLOCK_TYPES = ('child_page', 'child_database')
+
+# Zusätzliche Felder, die neben dem Text zum Inhalt eines Blocks gehören
+CONTENT_FIELDS = ('language', 'checked', 'expression', 'url', 'color')
+
+
+def normalize_rich_text(rich_text):
+    """Rich Text ohne API-Beiwerk (plain_text, href, Default-Annotations)
+
+    Benachbarte Elemente mit gleicher Formatierung werden zusammengefasst -
+    ein beim Upload an 2000 Zeichen geteilter Text hat dieselbe Signatur.
+    """
+    normalized = []
+    for part in rich_text or []:
+        text = part.get('text') or {}
+        content = text.get('content', part.get('plain_text', ''))
+        link = (text.get('link') or {}).get('url')
+        annotations = sorted(
+            key for key, value in (part.get('annotations') or {}).items()
+            if value and key != 'color'
+        )
+        if normalized and normalized[-1][1:] == (link, annotations):
+            normalized[-1] = (normalized[-1][0] + content, link, annotations)
+        else:
+            normalized.append((content, link, annotations))
+    return normalized
+
+
+def block_signature(block):
+    """(Typ, Content-Hash) - gleiche Signatur heißt: Block muss nicht angefasst werden"""
+    block_type = block.get('type', '')
+    data = block.get(block_type) or {}
+
+    content = {'rich_text': normalize_rich_text(data.get('rich_text'))}
+    for field in CONTENT_FIELDS:
+        if field in data and not (field == 'color' and data[field] == 'default'):
+            content[field] = data[field]
+
+    digest = hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return block_type, digest
+
+
+class BlockDiff:
+    """Richtet die bestehende Block-Liste an den neuen Blocks aus
+
+    Gleiche Signaturen (Typ + Content-Hash) bleiben unangetastet - Block-IDs,
+    Kommentare und Backlinks in Notion bleiben erhalten. Geänderte Blocks
+    gleichen Typs werden per `blocks.update` aktualisiert, neue Blocks per
+    `blocks.children.append(after=...)` direkt hinter ihrem Vorgänger
+    eingefügt, übrige gelöscht.
+
+    Ergebnis:
+        updates: [(block_id, neuer Block)]
+        inserts: [(after_block_id oder None, [neue Blocks])]
+        deletes: [block_id]
+    """
+
+    def __init__(self, existing_blocks: list, new_blocks: list):
+        self.existing = [block for block in existing_blocks if block.get('type') not in PROTECTED_BLOCK_TYPES]
+        self.new = new_blocks
+        self.updates = []
+        self.inserts = []
+        self.deletes = []
+        self.unchanged = 0
+        self.compute()
+
+    def align(self):
+        """new_index → ('keep'|'update', existing_index) oder None (einfügen)"""
+        existing_signatures = [block_signature(block) for block in self.existing]
+        new_signatures = [block_signature(block) for block in self.new]
+        matcher = SequenceMatcher(None, existing_signatures, new_signatures, autojunk=False)
+
+        assignment = [None] * len(self.new)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for offset in range(i2 - i1):
+                    assignment[j1 + offset] = ('keep', i1 + offset)
+            elif tag == 'replace':
+                # Geänderte Blocks: gleiche Typen der Reihe nach paaren → Update statt Delete + Insert
+                i = i1
+                for j in range(j1, j2):
+                    while i < i2 and existing_signatures[i][0] != new_signatures[j][0]:
+                        i += 1
+                    if i >= i2:
+                        break
+                    assignment[j] = ('update', i)
+                    i += 1
+        return assignment
+
+    def anchor_leading_inserts(self, assignment):
+        """Notion kann nicht *vor* dem ersten Block einfügen
+
+        Stehen neue Blocks vor dem ersten erhaltenen Block, wird ein ohnehin
+        zu löschender Block davor auf den ersten neuen Block umgeschrieben
+        (gleicher Typ). Sonst wird der erste erhaltene Block gelöscht und neu
+        eingefügt, bis der Seitenanfang wieder einen Anker hat.
+        """
+        new_type = self.new[0].get('type') if self.new else None
+        while assignment and assignment[0] is None:
+            first = next((j for j, match in enumerate(assignment) if match), None)
+            if first is None:
+                return assignment
+
+            existing_index = assignment[first][1]
+            reusable = next((i for i in range(existing_index)
+                             if self.existing[i].get('type') == new_type), None)
+            if reusable is not None:
+                assignment[0] = ('update', reusable)
+                return assignment
+
+            assignment[first] = None
+            if self.existing[existing_index].get('type') == new_type:
+                assignment[0] = ('update', existing_index)
+        return assignment
+
+    def compute(self):
+        assignment = self.anchor_leading_inserts(self.align())
+
+        kept = set()
+        anchor = None
+        pending = []
+        for j, match in enumerate(assignment):
+            if match is None:
+                pending.append(self.new[j])
+                continue
+
+            if pending:
+                self.inserts.append((anchor, pending))
+                pending = []
+
+            action, i = match
+            existing_block = self.existing[i]
+            kept.add(i)
+            anchor = existing_block['id']
+            if action == 'keep':
+                self.unchanged += 1
+            else:
+                self.updates.append((existing_block['id'], self.new[j]))
+
+        if pending:
+            self.inserts.append((anchor, pending))
+
+        self.deletes = [block['id'] for i, block in enumerate(self.existing) if i not in kept]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.updates or self.inserts or self.deletes)
+
+    def summary(self) -> str:
+        inserted = sum(len(blocks) for _, blocks in self.inserts)
+        return (f"{self.unchanged} unverändert, {len(self.updates)} aktualisiert, "
+                f"{inserted} eingefügt, {len(self.deletes)} gelöscht")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# block_renderers.py - Renderer-Registry: Notion Block-Typ → Markdown
+
+from attachment_store import ATTACHMENT_BLOCK_TYPES
+
+
+class BlockRenderer:
+    """Basisklasse: ein Renderer pro Block-Typ (oder Gruppe von Typen)
+
+    `render(block, syncer)` liefert Markdown. Der Syncer stellt
+    extract_text_from_rich_text, render_children, link_for_notion_id und
+    den Attachment-Store bereit.
+    """
+
+    block_types = ()
+
+    def render(self, block, syncer) -> str:
+        raise NotImplementedError
+
+    @staticmethod
+    def data(block) -> dict:
+        return block.get(block.get('type', ''), {})
+
+    def text(self, block, syncer) -> str:
+        return syncer.extract_text_from_rich_text(self.data(block).get('rich_text', []))
+
+
+class ParagraphRenderer(BlockRenderer):
+    block_types = ('paragraph',)
+
+    def render(self, block, syncer):
+        # Kinder (eingerückte Absätze) folgen unverschachtelt
+        return f"{self.text(block, syncer)}\n\n{syncer.render_children(block, prefix='')}"
+
+
+class HeadingRenderer(BlockRenderer):
+    block_types = ('heading_1', 'heading_2', 'heading_3')
+    markers = {'heading_1': '#', 'heading_2': '##', 'heading_3': '###'}
+
+    def render(self, block, syncer):
+        # Kinder von Toggle-Headings folgen unverschachtelt
+        marker = self.markers[block['type']]
+        return f"{marker} {self.text(block, syncer)}\n\n{syncer.render_children(block, prefix='')}"
+
+
+class BulletedListItemRenderer(BlockRenderer):
+    block_types = ('bulleted_list_item',)
+
+    def render(self, block, syncer):
+        return f"- {self.text(block, syncer)}\n{syncer.render_children(block)}"
+
+
+class NumberedListItemRenderer(BlockRenderer):
+    block_types = ('numbered_list_item',)
+
+    def render(self, block, syncer):
+        return f"1. {self.text(block, syncer)}\n{syncer.render_children(block)}"
+
+
+class ToDoRenderer(BlockRenderer):
+    block_types = ('to_do',)
+
+    def render(self, block, syncer):
+        checkbox = "[x]" if self.data(block).get('checked', False) else "[ ]"
+        return f"- {checkbox} {self.text(block, syncer)}\n{syncer.render_children(block)}"
+
+
+class CodeRenderer(BlockRenderer):
+    block_types = ('code',)
+
+    def render(self, block, syncer):
+        language = self.data(block).get('language', '')
+        return f"```{language}\n{self.text(block, syncer)}\n```\n\n"
+
+
+class QuoteRenderer(BlockRenderer):
+    block_types = ('quote',)
+
+    def render(self, block, syncer):
+        return f"> {self.text(block, syncer)}\n{syncer.render_children(block, prefix='> ')}\n"
+
+
+class CalloutRenderer(BlockRenderer):
+    block_types = ('callout',)
+
+    def render(self, block, syncer):
+        icon = (self.data(block).get('icon') or {}).get('emoji', '💡')
+        return f"> {icon} **Callout:** {self.text(block, syncer)}\n{syncer.render_children(block, prefix='> ')}\n"
+
+
+class ToggleRenderer(BlockRenderer):
+    block_types = ('toggle',)
+
+    def render(self, block, syncer):
+        return (f"<details>\n<summary>{self.text(block, syncer)}</summary>\n\n"
+                f"{syncer.render_children(block, prefix='')}</details>\n\n")
+
+
+class DividerRenderer(BlockRenderer):
+    block_types = ('divider',)
+
+    def render(self, block, syncer):
+        return "---\n\n"
+
+
+class ContainerRenderer(BlockRenderer):
+    """Container ohne eigenen Inhalt: Spalten und Synced Blocks"""
+
+    block_types = ('column_list', 'column', 'synced_block')
+
+    def render(self, block, syncer):
+        return syncer.render_children(block, prefix="")
+
+
+class TableRenderer(BlockRenderer):
+    """Tabelle aus ihren table_row Kindern"""
+
+    block_types = ('table',)
+
+    def render(self, block, syncer):
+        rows = [
+            [syncer.extract_text_from_rich_text(cell) for cell in row.get('table_row', {}).get('cells', [])]
+            for row in block.get('children', [])
+        ]
+        if not rows:
+            return ""
+        lines = ["| " + " | ".join(rows[0]) + " |", "|" + "---|" * len(rows[0])]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+        return "\n".join(lines) + "\n\n"
+
+
+class TableRowRenderer(BlockRenderer):
+    """Einzelne Zeile außerhalb einer Tabelle (normalerweise rendert TableRenderer sie)"""
+
+    block_types = ('table_row',)
+
+    def render(self, block, syncer):
+        cells = [syncer.extract_text_from_rich_text(cell) for cell in self.data(block).get('cells', [])]
+        return "| " + " | ".join(cells) + " |\n"
+
+
+class AttachmentRenderer(BlockRenderer):
+    """Bilder, Dateien, PDFs, Videos, Audio → Obsidian-Embeds aus dem Store (externe URLs als Link)"""
+
+    block_types = ATTACHMENT_BLOCK_TYPES
+
+    def render(self, block, syncer):
+        file_info = self.data(block)
+        caption = syncer.extract_text_from_rich_text(file_info.get('caption', []))
+        caption_line = f"{caption}\n" if caption else ""
+
+        relative_path = syncer.attachments.ensure(block)
+        if relative_path:
+            return f"![[{relative_path}]]\n{caption_line}\n"
+
+        if file_info.get('type') == 'external':
+            url = file_info.get('external', {}).get('url', '')
+            if block['type'] == 'image':
+                return f"![{caption}]({url})\n\n"
+            return f"[{caption or url}]({url})\n\n"
+
+        return f"<!-- Notion Block: {block['type']} (Download fehlgeschlagen) -->\n"
+
+
+class BookmarkRenderer(BlockRenderer):
+    block_types = ('bookmark', 'embed', 'link_preview')
+
+    def render(self, block, syncer):
+        data = self.data(block)
+        url = data.get('url', '')
+        caption = syncer.extract_text_from_rich_text(data.get('caption', []))
+        return f"[{caption or url}]({url})\n\n"
+
+
+class EquationRenderer(BlockRenderer):
+    block_types = ('equation',)
+
+    def render(self, block, syncer):
+        return f"$$\n{self.data(block).get('expression', '')}\n$$\n\n"
+
+
+class ChildPageRenderer(BlockRenderer):
+    """Unterseite/-Database als Wikilink (wird selbst als eigene Datei gesynct)"""
+
+    block_types = ('child_page', 'child_database')
+
+    def render(self, block, syncer):
+        link = syncer.link_for_notion_id(block['id'])
+        if link == block['id']:
+            icon = '📄' if block['type'] == 'child_page' else '🗂️'
+            return f"{icon} {self.data(block).get('title', '')}\n\n"
+        return f"{link}\n\n"
+
+
+class LinkToPageRenderer(BlockRenderer):
+    block_types = ('link_to_page',)
+
+    def render(self, block, syncer):
+        data = self.data(block)
+        target_id = data.get(data.get('type', ''), '')
+        link = syncer.link_for_notion_id(target_id) if target_id else ''
+        return f"{link}\n\n" if link and link != target_id else ""
+
+
+class TemplateRenderer(BlockRenderer):
+    block_types = ('template',)
+
+    def render(self, block, syncer):
+        return f"{self.text(block, syncer)}\n\n{syncer.render_children(block, prefix='')}"
+
+
+class NavigationRenderer(BlockRenderer):
+    """Inhaltsverzeichnis/Breadcrumb - erzeugt Obsidian selbst"""
+
+    block_types = ('table_of_contents', 'breadcrumb')
+
+    def render(self, block, syncer):
+        return ""
+
+
+class UnsupportedRenderer(BlockRenderer):
+    """Fallback für unbekannte Block-Typen"""
+
+    block_types = ('unsupported',)
+
+    def render(self, block, syncer):
+        return f"<!-- Notion Block: {block.get('type', '')} (nicht unterstützt) -->\n"
+
+
+class RendererRegistry:
+    """Dispatch-Tabelle Block-Typ → Renderer-Instanz"""
+
+    def __init__(self, renderers=(), fallback: BlockRenderer = None):
+        self.renderers = {}
+        self.fallback = fallback or UnsupportedRenderer()
+        for renderer in renderers:
+            self.register(renderer)
+
+    def register(self, renderer: BlockRenderer, *block_types):
+        """Renderer für seine block_types (oder die übergebenen) eintragen - überschreibt Vorhandene"""
+        for block_type in block_types or renderer.block_types:
+            self.renderers[block_type] = renderer
+        return renderer
+
+    def render(self, block, syncer) -> str:
+        renderer = self.renderers.get(block.get('type', ''), self.fallback)
+        return renderer.render(block, syncer)
+
+    def copy(self):
+        registry = RendererRegistry(fallback=self.fallback)
+        registry.renderers = dict(self.renderers)
+        return registry
+
+
+default_registry = RendererRegistry([
+    ParagraphRenderer(), HeadingRenderer(), BulletedListItemRenderer(), NumberedListItemRenderer(),
+    ToDoRenderer(), CodeRenderer(), QuoteRenderer(), CalloutRenderer(), ToggleRenderer(),
+    DividerRenderer(), ContainerRenderer(), TableRenderer(), TableRowRenderer(), AttachmentRenderer(),
+    BookmarkRenderer(), EquationRenderer(), ChildPageRenderer(), LinkToPageRenderer(),
+    TemplateRenderer(), NavigationRenderer(), UnsupportedRenderer(),
+])
+
+
+def register_renderer(renderer_class):
+    """Erweiterungs-Hook: eigene Renderer-Klasse global registrieren
+
+        @register_renderer
+        class MermaidCodeRenderer(CodeRenderer):
+            ...
+
+    Gilt für alle danach erstellten Syncer; einzelne Syncer können über
+    `syncer.renderers.register(...)` auch nur lokal erweitern.
+    """
+    default_registry.register(renderer_class())
+    return renderer_class
@@ -7,11 +7,14 @@ import hashlib
 from datetime import datetime
 from pathlib import Path
 import frontmatter
+from pending_queue import PendingQueue
 
 class ObsidianChangeDetector:
-    def __init__(self):
-        self.obsidian_path = Path(os.getenv('OBSIDIAN_PATH', '/shared/obsidian'))
+    def __init__(self, obsidian_path=None):
+        self.obsidian_path = Path(obsidian_path or os.getenv('OBSIDIAN_PATH', '/shared/obsidian'))
         self.state_file = self.obsidian_path / '.change_detection_state.json'
+        self.queue = PendingQueue(self.obsidian_path)
+        self.unqueued_pending = []
         self.load_state()
     
     def load_state(self):
@@ -103,6 +106,10 @@ class ObsidianChangeDetector:
             if not current_info:
                 continue
             
+            # Pending laut Frontmatter, aber nicht in der Queue (z.B. Queue verloren)
+            if current_info['sync_status'] == 'pending' and relative_path not in self.queue.items:
+                self.unqueued_pending.append(relative_path)
+            
             # Vergleiche mit letztem State
             last_info = self.state.get(relative_path, {})
             
@@ -166,6 +173,9 @@ class ObsidianChangeDetector:
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(frontmatter.dumps(post))
             
+            # In die Reverse-Sync Queue (Dedupe über den Pfad)
+            self.queue.add(change_info['filepath'], post.metadata['change_reason'])
+            
             print(f"✅ Als pending markiert: {file_path.name}")
             return True
             
@@ -177,12 +187,19 @@ class ObsidianChangeDetector:
         """Hauptfunktion: Erkenne Änderungen und markiere als pending"""
         print("🚀 Starte intelligente Change Detection...")
         
+        # Beim ersten Lauf bestehende pending Dateien übernehmen
+        self.queue.ensure_seeded()
+        
         # Erkenne Änderungen
         changed_files = self.detect_changes()
         
+        for relative_path in self.unqueued_pending:
+            self.queue.add(relative_path, 'pending_frontmatter')
+        
         if not changed_files:
             print("✅ Keine Änderungen gefunden - alle Dateien sind up-to-date")
             self.save_state()
+            self.queue.compact()
             return 0
         
         # Markiere geänderte Dateien als pending
@@ -194,6 +211,7 @@ class ObsidianChangeDetector:
         
         # State speichern
         self.save_state()
+        self.queue.compact()
         
         print(f"🎉 Change Detection abgeschlossen!")
         print(f"   📝 {len(changed_files)} Änderungen erkannt")
@@ -215,22 +233,9 @@ class ObsidianChangeDetector:
         print(f"   📁 Tracked Files: {len(self.state)}")
         print(f"   📍 State File: {self.state_file}")
         
-        # Pending Files zählen
-        pending_count = 0
-        for file_path in self.obsidian_path.glob("**/*.md"):
-            if not self.should_track_file(file_path):
-                continue
-                
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
-                
-                if post.metadata.get('sync_status') == 'pending':
-                    pending_count += 1
-            except:
-                continue
-        
-        print(f"   ⏳ Pending Files: {pending_count}")
+        # Pending Files aus der Queue (kein Vault-Scan)
+        print(f"   ⏳ Pending Files: {len(self.queue.pending())}")
+        print(f"   🅿️ Geparkt: {len(self.queue.parked())}")
 
 def main():
     """Main function mit Command-Line Interface"""
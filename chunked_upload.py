@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# chunked_upload.py - Große Notes in API-konformen Häppchen zu Notion hochladen
+
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+# Notion-Limits pro Request bzw. pro Rich-Text-Element
+MAX_CHILDREN_PER_REQUEST = 100
+MAX_RICH_TEXT_LENGTH = 2000
+
+
+def split_text(content: str, limit: int = MAX_RICH_TEXT_LENGTH) -> list:
+    """Text in Stücke ≤ limit teilen - bevorzugt an Zeilenumbrüchen, dann an Leerzeichen"""
+    pieces = []
+    while len(content) > limit:
+        cut = content.rfind('\n', 0, limit)
+        if cut <= 0:
+            cut = content.rfind(' ', 0, limit)
+        # Trennzeichen bleibt am Ende des Stücks - zusammengesetzt ergibt sich der Originaltext
+        cut = cut + 1 if cut > 0 else limit
+        pieces.append(content[:cut])
+        content = content[cut:]
+    pieces.append(content)
+    return pieces
+
+
+def split_rich_text(rich_text: list, limit: int = MAX_RICH_TEXT_LENGTH) -> list:
+    """Zu lange Text-Elemente in mehrere Elemente mit gleichen Annotations/Links aufteilen"""
+    result = []
+    for part in rich_text:
+        text = part.get('text')
+        if part.get('type', 'text') != 'text' or not text or len(text.get('content', '')) <= limit:
+            result.append(part)
+            continue
+        for piece in split_text(text['content'], limit):
+            result.append({**part, 'text': {**text, 'content': piece}})
+    return result
+
+
+def prepare_blocks(blocks: list) -> list:
+    """Blocks mit aufgeteiltem Rich Text (Kopien - die Eingabe bleibt unverändert)"""
+    prepared = []
+    for block in blocks:
+        block_type = block.get('type')
+        data = block.get(block_type)
+        if isinstance(data, dict) and 'rich_text' in data:
+            block = {**block, block_type: {**data, 'rich_text': split_rich_text(data['rich_text'])}}
+        prepared.append(block)
+    return prepared
+
+
+def chunked(blocks: list, size: int = MAX_CHILDREN_PER_REQUEST):
+    for start in range(0, len(blocks), size):
+        yield blocks[start:start + size]
+
+
+class ChunkedUploader:
+    """Erstellt Pages mit dem ersten Chunk und hängt den Rest in 100er-Appends an
+
+    Alle Requests laufen über den Notion-Client und damit über den
+    gemeinsamen Rate-Limiter des Transports. Nach jedem bestätigten Chunk
+    merkt sich `.notion_upload_journal.json` Page-ID und Fortschritt - ein
+    abgebrochener Upload setzt beim nächsten Lauf dort wieder an, solange
+    sich weder Inhalt noch Parent geändert haben.
+    """
+
+    def __init__(self, notion, obsidian_path: Path):
+        self.notion = notion
+        self.journal_file = Path(obsidian_path) / '.notion_upload_journal.json'
+        self.load()
+
+    def load(self):
+        self.journal = {}
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, 'r', encoding='utf-8') as f:
+                    self.journal = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden des Upload-Journals: {e}")
+
+    def save(self):
+        try:
+            tmp_file = self.journal_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.journal, f, indent=2)
+            tmp_file.replace(self.journal_file)
+        except Exception as e:
+            print(f"⚠️ Fehler beim Speichern des Upload-Journals: {e}")
+
+    @staticmethod
+    def content_hash(blocks: list) -> str:
+        return hashlib.sha256(json.dumps(blocks, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def create_page(self, key: str, parent: dict, properties: dict, blocks: list) -> str:
+        """Page mit beliebig vielen Blocks erstellen (key: Vault-Pfad der Note)"""
+        blocks = prepare_blocks(blocks)
+        content_hash = self.content_hash(blocks)
+        entry = self.journal.get(key)
+
+        # Anderer Parent (z.B. Fallback Unterseite → Database-Entry): die halbe
+        # Page unter dem alten Parent wird verworfen statt fortgesetzt
+        if entry and entry.get('content_hash') == content_hash and entry.get('parent') == parent:
+            page_id = entry['page_id']
+            print(f"   ⏯️ Setze Upload fort: {entry['confirmed']}/{len(blocks)} Blocks bereits in Notion")
+        else:
+            if entry:
+                self.discard(entry['page_id'])
+
+            first_chunk = blocks[:MAX_CHILDREN_PER_REQUEST]
+            page = self.notion.pages.create(parent=parent, properties=properties, children=first_chunk)
+            page_id = page['id']
+            entry = {'page_id': page_id, 'parent': parent, 'content_hash': content_hash,
+                     'confirmed': len(first_chunk), 'started_at': datetime.now().isoformat()}
+
+        if entry['confirmed'] < len(blocks):
+            self.journal[key] = entry
+            self.save()
+            self.append(page_id, blocks[entry['confirmed']:], journal_key=key)
+
+        if key in self.journal:
+            del self.journal[key]
+            self.save()
+        return page_id
+
+    def append(self, block_id: str, blocks: list, after: str = None, journal_key: str = None):
+        """Blocks in 100er-Chunks anhängen (mit after= direkt hinter dem Anker-Block)"""
+        blocks = prepare_blocks(blocks)
+
+        for chunk in chunked(blocks):
+            kwargs = {'block_id': block_id, 'children': chunk}
+            if after:
+                kwargs['after'] = after
+            response = self.notion.blocks.children.append(**kwargs)
+
+            if after:
+                # Nächster Chunk hinter den gerade angelegten Blocks
+                after = response['results'][-1]['id']
+
+            if journal_key:
+                self.journal[journal_key]['confirmed'] += len(chunk)
+                self.save()
+
+    def discard(self, page_id: str):
+        """Unvollständig hochgeladene Page mit veraltetem Inhalt archivieren"""
+        try:
+            self.notion.pages.update(page_id=page_id, archived=True)
+            print(f"   🗑️ Unvollständiger Upload verworfen: {page_id[:8]}...")
+        except Exception as e:
+            print(f"⚠️ Unvollständiger Upload {page_id[:8]}... nicht archivierbar: {e}")
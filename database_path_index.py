@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# database_path_index.py - Obsidian Path → Page-ID der Sync-Database (einmal laden statt Query pro Datei)
+
+import os
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PATH_PROPERTY = "Obsidian Path"
+FULL_RELOAD_HOURS = int(os.getenv('FULL_SYNC_INTERVAL_HOURS', '24'))
+
+
+class DatabasePathIndex:
+    """Alle Zeilen der Obsidian-Sync-Database als {Obsidian Path: {page_id, last_edited_time}}
+
+    Ein paginierter databases.query pro Lauf ersetzt den gefilterten Query
+    pro Datei in find_existing_page. Die Map liegt in `.notion_db_paths.json`;
+    spätere Läufe fragen nur Zeilen ab dem neuesten gesehenen
+    last_edited_time ab. Ein voller Reload spätestens alle
+    FULL_SYNC_INTERVAL_HOURS räumt gelöschte Zeilen aus der Map.
+    """
+
+    def __init__(self, notion, obsidian_path: Path, database_id: str):
+        self.notion = notion
+        self.database_id = database_id
+        self.index_file = Path(obsidian_path) / '.notion_db_paths.json'
+        self.loaded = False
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        self.data = {}
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden der Database-Path-Map: {e}")
+
+        # Andere Database (z.B. NOTION_DATABASE_ID geändert) → neu aufbauen
+        if self.data.get('database_id') != self.database_id:
+            self.data = {}
+        self.data.setdefault('database_id', self.database_id)
+        self.data.setdefault('paths', {})
+        self.paths = self.data['paths']
+        self.by_page = {entry['page_id']: path for path, entry in self.paths.items()}
+
+    def save(self):
+        """Map speichern (nur wenn geändert)"""
+        if not self.dirty:
+            return
+        try:
+            tmp_file = self.index_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            tmp_file.replace(self.index_file)
+            self.dirty = False
+        except Exception as e:
+            print(f"⚠️ Fehler beim Speichern der Database-Path-Map: {e}")
+
+    def needs_full_reload(self) -> bool:
+        last_full_load = self.data.get('last_full_load')
+        if not last_full_load or not self.data.get('watermark'):
+            return True
+        return datetime.now() - datetime.fromisoformat(last_full_load) > timedelta(hours=FULL_RELOAD_HOURS)
+
+    def path_property_id(self):
+        """ID der 'Obsidian Path' Property - Queries liefern nur diese Property aus"""
+        if 'property_id' not in self.data:
+            database = self.notion.databases.retrieve(database_id=self.database_id)
+            self.data['property_id'] = (database.get('properties', {}).get(PATH_PROPERTY) or {}).get('id')
+        return self.data['property_id']
+
+    def refresh(self):
+        """Einmal pro Lauf: voll laden oder nur seit dem Watermark geänderte Zeilen nachladen"""
+        if self.loaded:
+            return
+
+        full_reload = self.needs_full_reload()
+        query_params = {"database_id": self.database_id, "page_size": 100}
+        property_id = self.path_property_id()
+        if property_id:
+            query_params["filter_properties"] = [property_id]
+        if not full_reload:
+            query_params["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": self.data['watermark']}
+            }
+
+        rows = []
+        start_cursor = None
+        while True:
+            if start_cursor:
+                query_params["start_cursor"] = start_cursor
+            response = self.notion.databases.query(**query_params)
+            rows.extend(response.get('results', []))
+            if not response.get('has_more'):
+                break
+            start_cursor = response.get('next_cursor')
+
+        if full_reload:
+            self.paths.clear()
+            self.by_page.clear()
+            self.data['last_full_load'] = datetime.now().isoformat()
+
+        for row in rows:
+            self.update_row(row)
+
+        self.loaded = True
+        self.dirty = True
+        mode = "voll geladen" if full_reload else "inkrementell aktualisiert"
+        print(f"📊 Database-Path-Map {mode}: {len(rows)} Zeilen abgefragt, {len(self.paths)} Pfade")
+
+    def update_row(self, row):
+        last_edited_time = row.get('last_edited_time')
+        if last_edited_time and last_edited_time > self.data.get('watermark', ''):
+            self.data['watermark'] = last_edited_time
+
+        if row.get('archived') or row.get('in_trash'):
+            self.remove_page(row['id'])
+            return
+
+        rich_text = (row.get('properties', {}).get(PATH_PROPERTY) or {}).get('rich_text', [])
+        path = ''.join(part.get('plain_text', '') for part in rich_text)
+        if not path:
+            self.remove_page(row['id'])
+            return
+
+        existing = self.paths.get(path)
+        # Mehrere Zeilen mit demselben Pfad: die zuletzt bearbeitete gewinnt
+        if existing and existing['page_id'] != row['id'] and existing.get('last_edited_time', '') > (last_edited_time or ''):
+            return
+        self.register(path, row['id'], last_edited_time)
+
+    def register(self, path: str, page_id: str, last_edited_time: str = None):
+        """Pfad → Page-ID eintragen (auch direkt nach dem Erstellen einer Page)"""
+        self.remove_page(page_id)
+        self.paths[path] = {'page_id': page_id, 'last_edited_time': last_edited_time}
+        self.by_page[page_id] = path
+        self.dirty = True
+
+    def remove_page(self, page_id: str):
+        path = self.by_page.pop(page_id, None)
+        if path is not None and self.paths.get(path, {}).get('page_id') == page_id:
+            del self.paths[path]
+            self.dirty = True
+
+    def lookup(self, path: str):
+        """Page-ID für einen Vault-Pfad oder None"""
+        self.refresh()
+        entry = self.paths.get(path)
+        return entry['page_id'] if entry else None
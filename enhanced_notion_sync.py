@@ -2,25 +2,113 @@
 # enhanced_notion_sync.py - Notion → Obsidian Sync mit Ordnerstruktur
 
 import os
+import io
 import json
 import re
-from datetime import datetime
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from notion_client import Client
 from markdownify import markdownify
 import frontmatter
+from vault_index import VaultIndex
+from notion_transport import NotionTransport, create_notion_client
+from block_cache import BlockCache
+from vault_writer import VaultWriter
+from property_renderer import PropertyRenderer
+from attachment_store import AttachmentStore
+from block_renderers import default_registry
+from page_meta_cache import PageMetadataCache
+
+
+def build_annotation_wrappers():
+    """Alle 32 Kombinationen aus bold/italic/code/strikethrough/underline → (Präfix, Suffix)
+    
+    Reihenfolge wie bisher: bold innen, underline außen.
+    """
+    marks = [('**', '**'), ('*', '*'), ('`', '`'), ('~~', '~~'), ('<u>', '</u>')]
+    wrappers = {}
+    for mask in range(32):
+        flags = tuple(bool(mask & (1 << i)) for i in range(5))
+        prefix, suffix = '', ''
+        for (opening, closing), enabled in zip(marks, flags):
+            if enabled:
+                prefix, suffix = opening + prefix, suffix + closing
+        wrappers[flags] = (prefix, suffix)
+    return wrappers
+
+
+ANNOTATION_WRAPPERS = build_annotation_wrappers()
+
+
+class IncompleteBlockTree(Exception):
+    """Block-Baum einer Page konnte nicht vollständig geladen werden - Page wird in diesem Lauf übersprungen"""
+
 
 class EnhancedNotionToObsidian:
-    def __init__(self):
-        self.notion_token = os.getenv('NOTION_TOKEN')
-        self.obsidian_path = Path(os.getenv('OBSIDIAN_PATH', '/shared/obsidian'))
+    def __init__(self, notion_token=None, obsidian_path=None, transport=None):
+        # Ohne Argumente aus der Umgebung (ein Workspace pro Prozess)
+        self.notion_token = notion_token or os.getenv('NOTION_TOKEN')
+        self.obsidian_path = Path(obsidian_path or os.getenv('OBSIDIAN_PATH', '/shared/obsidian'))
         
         if not self.notion_token:
             raise ValueError("NOTION_TOKEN environment variable ist nicht gesetzt!")
         
-        self.notion = Client(auth=self.notion_token)
+        # Gemeinsamer Transport: Rate-Limit, Retries, Keep-Alive (auch für alle Worker)
+        self.transport = transport or NotionTransport()
+        self.notion = create_notion_client(self.notion_token, self.transport)
         self.setup_directories()
         
+        # Paralleles Block-Fetching (Multi-Workspace: Executor des Fair-Schedulers)
+        self.fetch_workers = int(os.getenv('NOTION_FETCH_WORKERS', '4'))
+        self.executor_factory = ThreadPoolExecutor
+        self.prefetched_content = {}
+        
+        # Pages, deren Block-Baum in diesem Lauf nicht vollständig geladen werden konnte:
+        # weder cachen noch schreiben (sonst wird der Inhalt der Note gelöscht)
+        self.failed_pages = {}
+        
+        # Schreib-Statistik (unveränderte Dateien werden übersprungen)
+        self.write_stats = {'written': 0, 'skipped': 0}
+        
+        # Write-Behind Stage: Rendern/Fetchen überlappt mit Disk-I/O
+        self.writer = VaultWriter(on_error=self.handle_write_error)
+        
+        # Verschachtelte Blocks: maximale Tiefe und Block-Budget pro Page
+        self.block_max_depth = int(os.getenv('NOTION_BLOCK_MAX_DEPTH', '8'))
+        self.block_budget = int(os.getenv('NOTION_BLOCK_BUDGET', '5000'))
+        
+        # Lokaler Block-Cache: (Page-ID, last_edited_time) → Block-Baum
+        self.block_cache = BlockCache(self.obsidian_path)
+        
+        # Bilder/Dateien: paralleler Download in attachments/ (Notion-URLs laufen ab)
+        self.attachments = AttachmentStore(
+            self.obsidian_path, refresh_block=lambda block_id: self.notion.blocks.retrieve(block_id=block_id)
+        )
+        
+        # Block-Renderer: Dispatch-Tabelle, pro Syncer über self.renderers.register() erweiterbar
+        self.renderers = default_registry.copy()
+        
+        # Page-Metadaten für den Reverse-Sync: jede gesehene Page aktualisiert den Cache
+        self.page_meta = PageMetadataCache(self.obsidian_path)
+        
+        # Persistenter notion_id → Pfad Index (ersetzt Vault-Scan pro Lookup)
+        self.index = VaultIndex(self.obsidian_path)
+        
+        # Database-Properties → Frontmatter (Renderer einmal pro Schema kompiliert)
+        self.property_renderer = PropertyRenderer(link_resolver=self.link_for_notion_id)
+        self.planned_paths = {}
+        
+        # Inkrementeller Sync: last_edited_time Watermark
+        self.state_file = self.obsidian_path / '.notion_sync_state.json'
+        self.overlap_minutes = int(os.getenv('SYNC_OVERLAP_MINUTES', '5'))
+        self.full_sync_interval_hours = int(os.getenv('FULL_SYNC_INTERVAL_HOURS', '24'))
+        self.load_sync_state()
+        
+        # Gelöschte/archivierte Pages: erst nach Karenzzeit ins Archiv verschieben
+        self.archive_grace_hours = float(os.getenv('ARCHIVE_GRACE_HOURS', '24'))
+        self.tombstone_file = self.obsidian_path / '.notion_tombstones.json'
+        
         # Mapping für Notion Page Sources
         self.folder_mapping = {
             'notion': 'from-notion',
@@ -28,6 +116,73 @@ class EnhancedNotionToObsidian:
             'collaboration': 'collaboration'
         }
     
+    def load_sync_state(self):
+        """Forward-Sync-Status (Watermark) laden"""
+        self.sync_state = {
+            'watermark': None,
+            'last_full_sync': None,
+            'last_incremental_sync': None,
+            'block_owners': {},
+            'missing_since': {},
+            'database_watermarks': {}
+        }
+        
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.sync_state.update(json.load(f))
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden des Forward-Sync-Status: {e}")
+    
+    def save_sync_state(self):
+        """Forward-Sync-Status (Watermark) speichern"""
+        try:
+            with open(self.state_file, 'w', encoding='utf-8') as f:
+                json.dump(self.sync_state, f, indent=2)
+        except Exception as e:
+            print(f"⚠️ Fehler beim Speichern des Forward-Sync-Status: {e}")
+    
+    def parse_notion_time(self, value):
+        """Notion ISO-Timestamp (…Z) → naive UTC datetime"""
+        if not value:
+            return None
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    
+    def watermark_times(self, pages):
+        """last_edited_time der Pages, bis zu denen ein Watermark vorrücken darf
+        
+        Fehlgeschlagene Pages (self.failed_pages) bremsen: der Watermark bleibt
+        vor der ältesten, damit der nächste Lauf sie erneut findet.
+        """
+        edited_times = [p['last_edited_time'] for p in pages if p.get('last_edited_time')]
+        failed_times = [self.parse_notion_time(p['last_edited_time']) for p in pages
+                        if p['id'] in self.failed_pages and p.get('last_edited_time')]
+        if failed_times:
+            oldest_failed = min(failed_times)
+            edited_times = [t for t in edited_times if self.parse_notion_time(t) < oldest_failed]
+        return edited_times
+    
+    def advance_watermark(self, pages):
+        """Watermark auf das neueste last_edited_time der erfolgreich gesyncten Pages setzen"""
+        edited_times = self.watermark_times(pages)
+        if self.failed_pages:
+            print(f"⚠️ {len(self.failed_pages)} Pages fehlgeschlagen - Watermark bleibt davor")
+        if not edited_times:
+            return
+        
+        newest = max(edited_times, key=self.parse_notion_time)
+        current = self.sync_state.get('watermark')
+        if not current or self.parse_notion_time(newest) > self.parse_notion_time(current):
+            self.sync_state['watermark'] = newest
+    
+    def is_full_sync_due(self):
+        """Periodischer Voll-Abgleich (fängt Lücken im Search-Index auf)"""
+        if not self.sync_state.get('watermark') or not self.sync_state.get('last_full_sync'):
+            return True
+        
+        last_full = datetime.fromisoformat(self.sync_state['last_full_sync'])
+        return datetime.now() - last_full > timedelta(hours=self.full_sync_interval_hours)
+    
     def setup_directories(self):
         """Ordnerstruktur erstellen"""
         directories = [
@@ -67,22 +222,8 @@ class EnhancedNotionToObsidian:
         return 'from-notion'
     
     def get_existing_file_by_notion_id(self, notion_id):
-        """Finde existierende Obsidian-Datei anhand der Notion ID"""
-        for file_path in self.obsidian_path.glob("**/*.md"):
-            if 'archive' in str(file_path):
-                continue
-                
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
-                
-                if post.metadata.get('notion_id') == notion_id:
-                    return file_path.relative_to(self.obsidian_path)
-            
-            except Exception:
-                continue
-        
-        return None
+        """Finde existierende Obsidian-Datei anhand der Notion ID (via Vault-Index)"""
+        return self.index.lookup_path(notion_id)
     
     def check_for_conflicts(self, file_path, new_content, new_metadata):
         """Prüft auf Konflikte bei Updates"""
@@ -149,67 +290,379 @@ class EnhancedNotionToObsidian:
         
         return merged_content, merged_metadata
     
-    def get_all_pages(self):
-        """Alle Notion Pages abrufen (erweitert)"""
+    def discover_workspace(self):
+        """Ein ungefilterter Search-Durchlauf für Pages UND Databases
+        
+        Returns (pages, databases) - inkl. Database-Entries für die
+        hierarchische Sync-Struktur. Bei einem Fehler ist das Ergebnis
+        unvollständig und wird komplett verworfen.
+        """
         try:
-            # Alle Pages
             all_pages = []
+            databases = []
             has_more = True
             next_cursor = None
             
             while has_more:
-                query_params = {
-                    "filter": {"property": "object", "value": "page"}
-                }
+                query_params = {"page_size": 100}
                 
                 if next_cursor:
                     query_params["start_cursor"] = next_cursor
                 
                 response = self.notion.search(**query_params)
-                all_pages.extend(response.get('results', []))
+                for obj in response.get('results', []):
+                    if obj.get('object') == 'database':
+                        databases.append(obj)
+                    elif obj.get('object') == 'page':
+                        all_pages.append(obj)
                 
                 has_more = response.get('has_more', False)
                 next_cursor = response.get('next_cursor')
             
-            # GEÄNDERT: Alle Pages zurückgeben (inkl. Database-Entries)
-            # für hierarchische Sync-Struktur
-            return all_pages
+            return all_pages, databases
             
         except Exception as e:
             print(f"Fehler beim Abrufen der Pages: {e}")
-            return []
+            return [], []
+    
+    def get_changed_pages(self, since):
+        """Pages mit last_edited_time >= since (Search absteigend sortiert, Abbruch am Watermark)"""
+        changed_pages = []
+        has_more = True
+        next_cursor = None
+        
+        while has_more:
+            query_params = {
+                "filter": {"property": "object", "value": "page"},
+                "sort": {"direction": "descending", "timestamp": "last_edited_time"}
+            }
+            
+            if next_cursor:
+                query_params["start_cursor"] = next_cursor
+            
+            response = self.notion.search(**query_params)
+            
+            for page in response.get('results', []):
+                edited = self.parse_notion_time(page.get('last_edited_time'))
+                if edited and edited < since:
+                    # Sortiert → alles Weitere ist älter als der Watermark
+                    return changed_pages
+                changed_pages.append(page)
+            
+            has_more = response.get('has_more', False)
+            next_cursor = response.get('next_cursor')
+        
+        return changed_pages
+    
+    def resolve_incremental_path(self, page):
+        """Zielpfad für eine geänderte Page ohne vollständige Hierarchie ermitteln
+        
+        Returns (file_path, existing) oder (None, False) wenn nur ein Voll-Abgleich
+        die Position bestimmen kann.
+        """
+        safe_title = self.sanitize_filename(self.get_page_title(page))
+        parent_id = self.resolve_parent_id(page) or 'workspace'
+        
+        existing_filepath = self.get_existing_file_by_notion_id(page['id'])
+        if existing_filepath:
+            # Parent gewechselt → neue Position kennt nur der Voll-Abgleich
+            known_parent = (self.index.get(page['id']) or {}).get('parent_id')
+            if known_parent and known_parent != parent_id:
+                return None, False
+            
+            # Titel geändert → im selben Ordner umbenennen
+            if existing_filepath.name == f"_{existing_filepath.parent.name}.md":
+                folder_path = existing_filepath.parent.parent / safe_title
+                target_path = folder_path / f"_{safe_title}.md"
+            else:
+                folder_path = None
+                target_path = existing_filepath.parent / f"{safe_title}.md"
+            
+            if target_path != existing_filepath:
+                self.relocate_if_moved({
+                    'id': page['id'],
+                    'file_path': str(target_path),
+                    'folder_path': str(folder_path) if folder_path else None
+                })
+                existing_filepath = self.get_existing_file_by_notion_id(page['id'])
+            
+            return existing_filepath, True
+        
+        if page.get('parent', {}).get('type') == 'workspace':
+            return Path(f"from-notion/{safe_title}.md"), False
+        
+        parent_path = self.get_existing_file_by_notion_id(parent_id)
+        
+        # Nur wenn der Parent schon ein Ordner (_Parent.md bzw. _Database.md) ist
+        if parent_path and parent_path.name.startswith('_'):
+            return parent_path.parent / f"{safe_title}.md", False
+        
+        return None, False
+    
+    def sync_changed_page(self, page, file_path, existing):
+        """Eine einzelne geänderte Page an ihrem Vault-Pfad neu rendern"""
+        title = self.get_page_title(page)
+        
+        # Strukturinfos aus der bestehenden Datei übernehmen
+        structure = {'notion_type': 'standalone_page', 'level': len(Path(file_path).parts) - 2}
+        if existing:
+            try:
+                with open(self.obsidian_path / file_path, 'r', encoding='utf-8') as f:
+                    existing_meta = frontmatter.load(f).metadata
+                for key in ['notion_type', 'level', 'children_count']:
+                    if key in existing_meta:
+                        structure[key] = existing_meta[key]
+            except Exception:
+                pass
+        
+        markdown_content, metadata = self.page_to_markdown(page)
+        metadata.update(structure)
+        metadata.update({
+            'notion_id': page['id'],
+            'title': title,
+            'synced_at': datetime.now().isoformat()
+        })
+        
+        if existing and structure['notion_type'] == 'standalone_page':
+            has_conflict, existing_post = self.check_for_conflicts(
+                file_path, markdown_content, metadata
+            )
+            if has_conflict:
+                print(f"    ⚠️ Konflikt erkannt")
+                markdown_content, metadata = self.handle_conflict(
+                    file_path, existing_post, markdown_content, metadata
+                )
+        
+        full_path = self.obsidian_path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        self.save_markdown_file(full_path, markdown_content, metadata,
+                                self.resolve_parent_id(page) or 'workspace')
+    
+    def sync_incremental(self):
+        """Nur seit dem Watermark geänderte Pages syncen (Fallback: Voll-Abgleich)"""
+        if self.is_full_sync_due():
+            print("🔁 Periodischer Voll-Abgleich fällig")
+            return self.sync_all_pages()
+        
+        watermark = self.parse_notion_time(self.sync_state['watermark'])
+        since = watermark - timedelta(minutes=self.overlap_minutes)
+        
+        print(f"⚡ Starte inkrementellen Sync (Änderungen seit {since.isoformat()}Z)...")
+        
+        try:
+            changed_pages = self.get_changed_pages(since)
+        except Exception as e:
+            print(f"⚠️ Inkrementelle Suche fehlgeschlagen ({e}) → Voll-Abgleich")
+            return self.sync_all_pages()
+        
+        print(f"📄 {len(changed_pages)} geänderte Pages gefunden")
+        
+        # Database-Zeilen direkt per databases.query (konsistent, gefiltert) statt nur über Search
+        database_rows = self.get_changed_database_rows()
+        changed_by_id = {page['id']: page for page in changed_pages}
+        for rows in database_rows.values():
+            changed_by_id.update({row['id']: row for row in rows})
+        changed_pages = list(changed_by_id.values())
+        self.page_meta.observe(changed_pages)
+        
+        # In Notion archivierte/gelöschte Pages sofort ins Archiv verschieben
+        archived_ids = [page['id'] for page in changed_pages if self.is_archived(page)]
+        if archived_ids:
+            self.archive_pages(archived_ids, 'archived_in_notion')
+        
+        # Position aller geänderten Pages vorab bestimmen
+        plan = []
+        for page in changed_pages:
+            if self.is_archived(page):
+                continue
+            file_path, existing = self.resolve_incremental_path(page)
+            if file_path is None:
+                print(f"🧭 Neue oder verschobene Page: {self.get_page_title(page)} → Voll-Abgleich")
+                return self.sync_all_pages()
+            plan.append((page, file_path, existing))
+        
+        self.prefetch_page_contents([page for page, _, _ in plan])
+        
+        synced_count = 0
+        for page, file_path, existing in plan:
+            try:
+                print(f"{'🔄 Update' if existing else '✅ Neu'}: {file_path}")
+                self.sync_changed_page(page, file_path, existing)
+                synced_count += 1
+            except Exception as e:
+                print(f"❌ Fehler bei {self.get_page_title(page)}: {e}")
+                self.failed_pages[page['id']] = str(e)
+        
+        self.writer.flush()
+        self.index.save()
+        self.attachments.save()
+        self.page_meta.save()
+        self.advance_watermark(changed_pages)
+        self.advance_database_watermarks(database_rows)
+        self.sync_state['last_incremental_sync'] = datetime.now().isoformat()
+        self.save_sync_state()
+        
+        print(f"\n🎉 Inkrementeller Sync abgeschlossen: {synced_count} Dateien aktualisiert")
+        print(f"   💾 {self.write_stats['written']} geschrieben, {self.write_stats['skipped']} unverändert übersprungen")
+        self.block_cache.print_stats()
+        self.attachments.print_stats()
+        self.writer.print_stats()
+        return synced_count
     
-    def build_page_hierarchy(self, pages):
-        """Hierarchie-Baum aus Pages aufbauen"""
+    def resolve_parent_id(self, obj):
+        """Parent-ID einer Page - block_id Parents (Spalten, Toggles) werden zur besitzenden Page aufgelöst"""
+        parent = obj.get('parent', {})
+        parent_type = parent.get('type')
+        
+        if parent_type in ('page_id', 'database_id'):
+            return parent.get(parent_type)
+        if parent_type == 'block_id':
+            return self.resolve_block_owner(parent.get('block_id'))
+        
+        # workspace → Root
+        return None
+    
+    def resolve_block_owner(self, block_id):
+        """Besitzende Page/Database eines Blocks (gecacht, auch über Läufe hinweg)
+        
+        Gecacht werden nur aufgelöste Owner - ein Abruffehler wird im nächsten
+        Lauf erneut versucht statt dauerhaft als None gemerkt.
+        """
+        block_owners = self.sync_state.setdefault('block_owners', {})
+        chain = []
+        current = block_id
+        owner = None
+        
+        for _ in range(self.block_max_depth + 2):
+            if block_owners.get(current):
+                owner = block_owners[current]
+                break
+            
+            chain.append(current)
+            try:
+                block = self.notion.blocks.retrieve(block_id=current)
+            except Exception as e:
+                print(f"⚠️ Parent-Block {current[:8]}... nicht abrufbar: {e}")
+                break
+            
+            parent = block.get('parent', {})
+            parent_type = parent.get('type')
+            if parent_type in ('page_id', 'database_id'):
+                owner = parent.get(parent_type)
+                break
+            if parent_type != 'block_id':
+                break
+            current = parent.get('block_id')
+        
+        if owner:
+            for chained_block_id in chain:
+                block_owners[chained_block_id] = owner
+        return owner
+    
+    def build_page_hierarchy(self, pages, databases=()):
+        """Hierarchie aus Pages und Databases aufbauen - ein Durchlauf, alle Parent-Typen
+        
+        Database-Einträge hängen unter ihrer Database, Pages in Spalten/Toggles
+        unter der Page, die den Block enthält.
+        """
         hierarchy = {}
-        page_children = {}
         
-        # Schritt 1: Alle Pages indexieren
+        # Schritt 1: Alle Nodes indexieren (Databases als reine Ordner-Container)
+        for database in databases:
+            hierarchy[database['id']] = {
+                'page': database,
+                'children': [],
+                'parent_id': None,
+                'is_database': True
+            }
+        
         for page in pages:
-            page_id = page['id']
-            hierarchy[page_id] = {
+            hierarchy[page['id']] = {
                 'page': page,
                 'children': [],
                 'parent_id': None
             }
-            
-            # Parent-Relationship extrahieren
-            parent = page.get('parent', {})
-            if parent.get('type') == 'page_id':
-                parent_id = parent.get('page_id')
-                hierarchy[page_id]['parent_id'] = parent_id
-                
-                if parent_id not in page_children:
-                    page_children[parent_id] = []
-                page_children[parent_id].append(page_id)
         
-        # Schritt 2: Children zuordnen
-        for parent_id, children_ids in page_children.items():
-            if parent_id in hierarchy:
-                hierarchy[parent_id]['children'] = children_ids
+        # Schritt 2: Parents auflösen und Children zuordnen
+        for node_id, node in hierarchy.items():
+            # Database-Ordner liegen immer direkt unter from-notion/
+            if node.get('is_database'):
+                continue
+            
+            parent_id = self.resolve_parent_id(node['page'])
+            if parent_id in hierarchy and parent_id != node_id:
+                node['parent_id'] = parent_id
+                hierarchy[parent_id]['children'].append(node_id)
         
         return hierarchy
     
+    def build_sync_plan(self, hierarchy, base_paths=None):
+        """Vault-Pfade aller Nodes iterativ berechnen (kein Rekursionslimit)
+        
+        Liefert die Einträge in derselben Reihenfolge wie eine Tiefensuche ab
+        den Roots - vor dem ersten Content-Fetch steht damit jeder Pfad fest.
+        `base_paths` verankert Roots in einem Unterordner (Teilbaum-Sync).
+        """
+        plan = []
+        visited = set()
+        base_paths = base_paths or {}
+        roots = [node_id for node_id, node in hierarchy.items() if node['parent_id'] is None]
+        
+        while True:
+            stack = []
+            for root_id in reversed(roots):
+                base_path = base_paths.get(root_id, "from-notion")
+                stack.append((root_id, base_path, len(Path(base_path).parts) - 1))
+            
+            while stack:
+                node_id, current_path, level = stack.pop()
+                if node_id in visited:
+                    continue
+                visited.add(node_id)
+                
+                node = hierarchy[node_id]
+                children = node['children']
+                
+                if node.get('is_database'):
+                    title = self.extract_text_from_rich_text(node['page'].get('title', [])) or f"Database_{node_id[:8]}"
+                    safe_title = self.sanitize_filename(title)
+                    folder_path = f"from-notion/{safe_title}"
+                    file_path = f"{folder_path}/_{safe_title}.md"
+                    notion_type = 'database_main'
+                elif children:
+                    title = self.get_page_title(node['page'])
+                    safe_title = self.sanitize_filename(title)
+                    folder_path = f"{current_path}/{safe_title}"
+                    file_path = f"{folder_path}/_{safe_title}.md"
+                    notion_type = 'page_with_children'
+                else:
+                    title = self.get_page_title(node['page'])
+                    folder_path = None
+                    file_path = f"{current_path}/{self.sanitize_filename(title)}.md"
+                    notion_type = 'standalone_page'
+                
+                plan.append({
+                    'id': node_id,
+                    'title': title,
+                    'notion_type': notion_type,
+                    'file_path': file_path,
+                    'folder_path': folder_path,
+                    'level': level,
+                    'children_count': len(children),
+                    'is_root': node['parent_id'] is None
+                })
+                
+                for child_id in reversed(children):
+                    stack.append((child_id, folder_path, level + 1))
+            
+            # Zyklen (A → B → A) sind von keiner Root erreichbar → als Roots behandeln
+            roots = [node_id for node_id in hierarchy if node_id not in visited]
+            if not roots:
+                break
+            print(f"⚠️ {len(roots)} Pages mit zyklischen Parents - werden als Root behandelt")
+        
+        return plan
+    
     def has_child_pages(self, page_id, hierarchy):
         """Prüft ob eine Page Unterseiten hat"""
         return len(hierarchy.get(page_id, {}).get('children', [])) > 0
@@ -233,28 +686,74 @@ class EnhancedNotionToObsidian:
         
         return f"Page_{page['id'][:8]}"
     
-    def get_database_entries(self, database_id):
-        """Alle Entries einer Database abrufen"""
-        try:
-            all_entries = []
-            has_more = True
-            start_cursor = None
+    def get_database_entries(self, database_id, since=None):
+        """Entries einer Database abrufen (optional nur last_edited_time >= since)
+        
+        Fehler werden nicht verschluckt - der Aufrufer entscheidet, ob der
+        Watermark der Database weiterlaufen darf.
+        """
+        all_entries = []
+        has_more = True
+        start_cursor = None
+        
+        while has_more:
+            query_params = {"database_id": database_id, "page_size": 100}
+            if since:
+                query_params["filter"] = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": since.isoformat() + 'Z'}
+                }
+            if start_cursor:
+                query_params["start_cursor"] = start_cursor
             
-            while has_more:
-                query_params = {"database_id": database_id}
-                if start_cursor:
-                    query_params["start_cursor"] = start_cursor
-                    
-                response = self.notion.databases.query(**query_params)
-                all_entries.extend(response.get('results', []))
-                
-                has_more = response.get('has_more', False)
-                start_cursor = response.get('next_cursor')
+            response = self.notion.databases.query(**query_params)
+            all_entries.extend(response.get('results', []))
             
-            return all_entries
-        except Exception as e:
-            print(f"⚠️ Fehler beim Abrufen der Database Entries für {database_id}: {e}")
-            return []
+            has_more = response.get('has_more', False)
+            start_cursor = response.get('next_cursor')
+        
+        return all_entries
+    
+    def get_changed_database_rows(self):
+        """Geänderte Zeilen aller bekannten Databases parallel abfragen
+        
+        Pro Database ein gefilterter databases.query ab ihrem eigenen Watermark.
+        Alle Worker laufen über den gemeinsamen Transport (ein Rate-Limit).
+        Returns {database_id: rows} - fehlgeschlagene Databases fehlen.
+        """
+        database_watermarks = self.sync_state.setdefault('database_watermarks', {})
+        if not database_watermarks:
+            return {}
+        
+        def query(database_id):
+            watermark = self.parse_notion_time(database_watermarks[database_id] or self.sync_state['watermark'])
+            return self.get_database_entries(database_id, watermark - timedelta(minutes=self.overlap_minutes))
+        
+        results = {}
+        workers = max(1, min(self.fetch_workers, len(database_watermarks)))
+        with self.executor_factory(max_workers=workers) as executor:
+            futures = {database_id: executor.submit(query, database_id) for database_id in database_watermarks}
+            for database_id, future in futures.items():
+                try:
+                    results[database_id] = future.result()
+                except Exception as e:
+                    print(f"⚠️ Fehler beim Abfragen der Database {database_id}: {e}")
+        
+        changed_rows = sum(len(rows) for rows in results.values())
+        print(f"🗂️ {changed_rows} geänderte Database-Zeilen in {len(results)} Databases")
+        return results
+    
+    def advance_database_watermarks(self, database_rows):
+        """Watermark pro Database auf ihre neueste gesehene Zeile setzen"""
+        database_watermarks = self.sync_state.setdefault('database_watermarks', {})
+        
+        for database_id, rows in database_rows.items():
+            edited_times = self.watermark_times(rows)
+            current = database_watermarks.get(database_id)
+            if current:
+                edited_times.append(current)
+            if edited_times:
+                database_watermarks[database_id] = max(edited_times, key=self.parse_notion_time)
     
     def categorize_pages_by_database(self, pages):
         """Pages in Database-Entries vs Standalone trennen"""
@@ -271,13 +770,10 @@ class EnhancedNotionToObsidian:
         
         return database_entries, standalone_pages
     
-    def build_database_structure(self):
-        """Database-Ordner mit _DatabaseName.md Hauptdateien erstellen"""
-        databases = self.get_all_databases()
+    def build_database_structure(self, databases):
+        """Database-Ordner mit _DatabaseName.md Hauptdateien erstellen (Databases aus der Discovery)"""
         database_folders = {}
         
-        print("🔄 Erstelle Database-Ordner-Struktur...")
-        
         for database in databases:
             try:
                 database_id = database['id']
@@ -286,25 +782,18 @@ class EnhancedNotionToObsidian:
                 if not title:
                     title = f"Database_{database_id[:8]}"
                 
-                # Ordner-Name und Hauptdatei mit Underscore-Prefix
                 folder_name = self.sanitize_filename(title)
-                main_filename = f"_{folder_name}.md"
-                
-                # Pfade  
                 target_folder = f"from-notion/{folder_name}"
-                main_filepath = f"{target_folder}/{main_filename}"
+                main_filepath = f"{target_folder}/_{folder_name}.md"
                 
-                # Ordner erstellen
                 (self.obsidian_path / target_folder).mkdir(parents=True, exist_ok=True)
                 
-                # Database-Eigenschaften als Markdown
                 description = database.get('description', [])
                 if description:
                     content = self.extract_text_from_rich_text(description)
                 else:
                     content = f"# {title}\n\nDies ist die Hauptseite der Database '{title}'."
                 
-                # Metadata für Database-Hauptdatei
                 metadata = {
                     'notion_id': database_id,
                     'notion_type': 'database_main',
@@ -313,97 +802,89 @@ class EnhancedNotionToObsidian:
                     'title': f"Database: {title}"
                 }
                 
-                # _Database.md Datei speichern
                 full_path = self.obsidian_path / main_filepath
                 self.save_markdown_file(full_path, content, metadata)
-                
-                # Database-Ordner merken
                 database_folders[database_id] = folder_name
                 
-                print(f"🗂️ Database-Ordner erstellt: {target_folder}/")
-                print(f"📄 Hauptdatei erstellt: {main_filename}")
+                print(f"🗂️ Database-Ordner: {target_folder}/")
                 
             except Exception as e:
                 print(f"❌ Fehler bei Database {database.get('id', 'unknown')}: {e}")
         
         return database_folders
     
-    def build_database_structure(self):
-        """Kompatibilität: Database-Objects verarbeiten (falls vorhanden)"""
-        try:
-            databases = self.notion.search(filter={"property": "object", "value": "database"})
-            database_folders = {}
-            
-            for database in databases.get('results', []):
-                try:
-                    database_id = database['id']
-                    title = self.extract_text_from_rich_text(database.get('title', []))
-                    
-                    if not title:
-                        title = f"Database_{database_id[:8]}"
-                    
-                    folder_name = self.sanitize_filename(title)
-                    target_folder = f"from-notion/{folder_name}"
-                    main_filepath = f"{target_folder}/_{folder_name}.md"
-                    
-                    (self.obsidian_path / target_folder).mkdir(parents=True, exist_ok=True)
-                    
-                    description = database.get('description', [])
-                    if description:
-                        content = self.extract_text_from_rich_text(description)
-                    else:
-                        content = f"# {title}\n\nDies ist die Hauptseite der Database '{title}'."
-                    
-                    metadata = {
-                        'notion_id': database_id,
-                        'notion_type': 'database_main',
-                        'database_name': title,
-                        'synced_at': datetime.now().isoformat(),
-                        'title': f"Database: {title}"
-                    }
-                    
-                    full_path = self.obsidian_path / main_filepath
-                    self.save_markdown_file(full_path, content, metadata)
-                    database_folders[database_id] = folder_name
-                    
-                    print(f"🗂️ Database-Ordner: {target_folder}/")
-                    
-                except Exception as e:
-                    print(f"❌ Fehler bei Database {database.get('id', 'unknown')}: {e}")
-            
-            return database_folders
-            
-        except Exception as e:
-            print(f"❌ Fehler beim Abrufen der Database-Objects: {e}")
-            return {}
-    
-    def sync_page_recursively(self, page_id, hierarchy, current_path="from-notion", level=0):
-        """Rekursive Synchronisation einer Page und ihrer Unterseiten"""
-        if page_id not in hierarchy:
-            return 0
+    def relocate_if_moved(self, entry):
+        """Umbenannte/verschobene Page per rename() an ihren neuen Pfad bewegen
         
-        page_data = hierarchy[page_id]
-        page = page_data['page']
-        children = page_data['children']
-        has_children = len(children) > 0
+        Hat die Page einen Ordner, wird der ganze Teilbaum mit einem einzigen
+        rename() verschoben - Unterseiten werden nicht neu geschrieben, nur
+        ihre Index-Pfade nachgezogen.
+        """
+        current_path = self.get_existing_file_by_notion_id(entry['id'])
+        target_path = Path(entry['file_path'])
+        if not current_path or current_path == target_path:
+            return
         
-        synced_count = 0
-        indent = "  " * level
+        # Ausstehende Writes dürfen nicht in den alten Pfad gehen
+        self.writer.flush()
         
-        # Page-Titel extrahieren
-        title = self.get_page_title(page)
-        safe_title = self.sanitize_filename(title)
+        current_is_folder_page = current_path.name == f"_{current_path.parent.name}.md"
         
         try:
-            if has_children:
-                # Page hat Unterseiten → Ordner + _PageName.md erstellen
-                folder_path = f"{current_path}/{safe_title}"
-                main_file_path = f"{folder_path}/_{safe_title}.md"
+            if entry['folder_path'] and current_is_folder_page:
+                old_folder = current_path.parent
+                new_folder = Path(entry['folder_path'])
+                
+                if old_folder != new_folder:
+                    if (self.obsidian_path / new_folder).exists():
+                        print(f"⚠️ Zielordner existiert bereits, kein Verschieben: {new_folder}")
+                        return
+                    (self.obsidian_path / new_folder).parent.mkdir(parents=True, exist_ok=True)
+                    os.rename(self.obsidian_path / old_folder, self.obsidian_path / new_folder)
+                    self.index.move(old_folder, new_folder)
+                    print(f"🚚 Ordner verschoben: {old_folder} → {new_folder}")
                 
-                print(f"{indent}📂 {title} (hat {len(children)} Unterseiten) → Ordner + Hauptdatei")
+                moved_path = new_folder / current_path.name
+                if moved_path != target_path:
+                    os.rename(self.obsidian_path / moved_path, self.obsidian_path / target_path)
+                    self.index.move(moved_path, target_path)
+            else:
+                if (self.obsidian_path / target_path).exists():
+                    print(f"⚠️ Zieldatei existiert bereits, kein Verschieben: {target_path}")
+                    return
+                (self.obsidian_path / target_path).parent.mkdir(parents=True, exist_ok=True)
+                os.rename(self.obsidian_path / current_path, self.obsidian_path / target_path)
+                self.index.move(current_path, target_path)
+                print(f"🚚 Verschoben: {current_path} → {target_path}")
+                
+                # Page hat keine Unterseiten mehr → leeren alten Ordner entfernen
+                if current_is_folder_page:
+                    try:
+                        (self.obsidian_path / current_path.parent).rmdir()
+                    except OSError:
+                        pass
+        
+        except OSError as e:
+            print(f"⚠️ Verschieben fehlgeschlagen ({current_path} → {target_path}): {e}")
+    
+    def sync_plan_entry(self, entry, hierarchy):
+        """Eine Page aus dem Sync-Plan an ihren vorberechneten Pfad schreiben"""
+        page = hierarchy[entry['id']]['page']
+        title = entry['title']
+        level = entry['level']
+        indent = "  " * level
+        parent_id = self.resolve_parent_id(page) or 'workspace'
+        
+        try:
+            # Titel- oder Parent-Änderung → vorhandene Datei/Ordner verschieben statt neu anlegen
+            self.relocate_if_moved(entry)
+            
+            if entry['notion_type'] == 'page_with_children':
+                # Page hat Unterseiten → Ordner + _PageName.md erstellen
+                print(f"{indent}📂 {title} (hat {entry['children_count']} Unterseiten) → Ordner + Hauptdatei")
                 
                 # Ordner erstellen
-                (self.obsidian_path / folder_path).mkdir(parents=True, exist_ok=True)
+                (self.obsidian_path / entry['folder_path']).mkdir(parents=True, exist_ok=True)
                 
                 # Hauptdatei (_PageName.md) erstellen
                 markdown_content, metadata = self.page_to_markdown(page)
@@ -411,211 +892,322 @@ class EnhancedNotionToObsidian:
                     'notion_id': page['id'],
                     'notion_type': 'page_with_children',
                     'title': title,
-                    'children_count': len(children),
+                    'children_count': entry['children_count'],
                     'level': level,
                     'synced_at': datetime.now().isoformat()
                 })
                 
-                full_path = self.obsidian_path / main_file_path
-                self.save_markdown_file(full_path, markdown_content, metadata)
-                synced_count += 1
-                
-                # Rekursiv alle Unterseiten synchronisieren
-                for child_id in children:
-                    synced_count += self.sync_page_recursively(
-                        child_id, hierarchy, folder_path, level + 1
-                    )
-                    
+                full_path = self.obsidian_path / entry['file_path']
+                self.save_markdown_file(full_path, markdown_content, metadata, parent_id)
+                return 1
+            
+            # Page hat keine Unterseiten → normale .md Datei
+            file_path = entry['file_path']
+            
+            print(f"{indent}📄 {title} (keine Unterseiten) → Datei")
+            
+            # Prüfe ob bereits existiert
+            existing_filepath = self.get_existing_file_by_notion_id(page['id'])
+            
+            if existing_filepath:
+                print(f"{indent}    🔄 Update: {existing_filepath}")
+                file_path = existing_filepath
             else:
-                # Page hat keine Unterseiten → normale .md Datei
-                file_path = f"{current_path}/{safe_title}.md"
-                
-                print(f"{indent}📄 {title} (keine Unterseiten) → Datei")
-                
-                # Prüfe ob bereits existiert
-                existing_filepath = self.get_existing_file_by_notion_id(page['id'])
-                
-                if existing_filepath:
-                    print(f"{indent}    🔄 Update: {existing_filepath}")
-                    file_path = existing_filepath
-                else:
-                    print(f"{indent}    ✅ Neu: {file_path}")
-                
-                # Markdown generieren
-                markdown_content, metadata = self.page_to_markdown(page)
-                metadata.update({
-                    'notion_id': page['id'],
-                    'notion_type': 'standalone_page',
-                    'title': title,
-                    'level': level,
-                    'synced_at': datetime.now().isoformat()
-                })
+                print(f"{indent}    ✅ Neu: {file_path}")
+            
+            # Markdown generieren
+            markdown_content, metadata = self.page_to_markdown(page)
+            metadata.update({
+                'notion_id': page['id'],
+                'notion_type': 'standalone_page',
+                'title': title,
+                'level': level,
+                'synced_at': datetime.now().isoformat()
+            })
+            
+            # Konflikt-Check falls existiert
+            if existing_filepath:
+                has_conflict, existing_post = self.check_for_conflicts(
+                    existing_filepath, markdown_content, metadata
+                )
                 
-                # Konflikt-Check falls existiert
-                if existing_filepath:
-                    has_conflict, existing_post = self.check_for_conflicts(
-                        existing_filepath, markdown_content, metadata
+                if has_conflict:
+                    print(f"{indent}    ⚠️ Konflikt erkannt")
+                    markdown_content, metadata = self.handle_conflict(
+                        existing_filepath, existing_post, markdown_content, metadata
                     )
-                    
-                    if has_conflict:
-                        print(f"{indent}    ⚠️ Konflikt erkannt")
-                        markdown_content, metadata = self.handle_conflict(
-                            existing_filepath, existing_post, markdown_content, metadata
-                        )
-                
-                # Datei speichern
-                full_path = self.obsidian_path / file_path
-                full_path.parent.mkdir(parents=True, exist_ok=True)
-                self.save_markdown_file(full_path, markdown_content, metadata)
-                synced_count += 1
-                
+            
+            # Datei speichern
+            full_path = self.obsidian_path / file_path
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            self.save_markdown_file(full_path, markdown_content, metadata, parent_id)
+            return 1
+            
         except Exception as e:
             print(f"{indent}❌ Fehler bei {title}: {e}")
-        
-        return synced_count
+            self.failed_pages[page['id']] = str(e)
+            return 0
     
-    def save_markdown_file(self, file_path, content, metadata):
-        """Markdown-Datei mit Frontmatter speichern"""
+    def save_markdown_file(self, file_path, content, metadata, parent_id=None):
+        """Markdown-Datei mit Frontmatter speichern (nur wenn sich der Inhalt geändert hat)"""
         try:
-            # Frontmatter-Post erstellen
+            file_path = Path(file_path)
+            relative_path = file_path.relative_to(self.obsidian_path)
+            notion_id = metadata.get('notion_id')
+            content_hash = self.index.hash_content(content, metadata)
+            
+            if self.is_unchanged(file_path, relative_path, notion_id, content_hash):
+                self.write_stats['skipped'] += 1
+                return
+            
+            # Frontmatter-Post erstellen (im Speicher rendern)
             post = frontmatter.Post(content)
             post.metadata = metadata
             
-            # Datei schreiben
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(frontmatter.dumps(post))
+            file_content = frontmatter.dumps(post)
+            
+            # Vault-Index aktualisieren (schlägt der Write fehl, entfernt handle_write_error den Eintrag)
+            if notion_id:
+                self.index.update(
+                    notion_id,
+                    relative_path,
+                    title=metadata.get('title'),
+                    last_edited_time=metadata.get('updated'),
+                    content_hash=content_hash,
+                    parent_id=parent_id
+                )
+            
+            # Write-Behind: Writer-Thread schreibt atomar (Temp-Datei + rename)
+            self.writer.put(file_path, file_content, key=notion_id)
+            self.write_stats['written'] += 1
                 
         except Exception as e:
             print(f"⚠️ Fehler beim Speichern von {file_path}: {e}")
     
-    def get_page_content(self, page_id):
-        """Content einer Notion Page abrufen (erweitert)"""
+    def handle_write_error(self, file_path, notion_id):
+        """Fehlgeschlagener Write (aus writer.flush()): Index-Eintrag verwerfen, Page erneut syncen"""
+        if notion_id:
+            self.index.remove(notion_id)
+            self.failed_pages[notion_id] = f"Write fehlgeschlagen: {file_path}"
+    
+    def is_unchanged(self, file_path, relative_path, notion_id, content_hash):
+        """Vergleicht den neuen Inhalts-Hash mit Index bzw. Datei auf der Platte"""
+        if not file_path.exists():
+            return False
+        
+        entry = self.index.get(notion_id) if notion_id else None
+        if entry and entry.get('path') == str(relative_path):
+            return entry.get('content_hash') == content_hash
+        
+        # Kein passender Index-Eintrag → Datei auf der Platte vergleichen
         try:
-            blocks = []
-            has_more = True
-            next_cursor = None
+            with open(file_path, 'r', encoding='utf-8') as f:
+                existing_post = frontmatter.load(f)
+            return self.index.hash_content(existing_post.content, existing_post.metadata) == content_hash
+        except Exception:
+            return False
+    
+    def prefetch_page_contents(self, pages):
+        """Block-Bäume vieler Pages vorab laden: erst Block-Cache, dann parallel von der API
+        
+        Schreiben bleibt sequentiell in der ursprünglichen Reihenfolge -
+        page_to_markdown nimmt sich die Blocks nur aus dem Prefetch-Puffer.
+        Mit NOTION_FETCH_WORKERS=1 entfällt nur der API-Prefetch - Attachments
+        der gecachten Bäume lädt weiterhin der eigene Download-Pool parallel.
+        """
+        missing = []
+        for page in pages:
+            if page['id'] in self.prefetched_content:
+                continue
+            cached = self.block_cache.get(page['id'], page.get('last_edited_time'))
+            if cached is not None:
+                self.prefetched_content[page['id']] = cached
+            else:
+                missing.append(page)
+        
+        if missing and self.fetch_workers > 1:
+            print(f"⚡ Lade Blocks für {len(missing)} Pages ({self.fetch_workers} Worker)...")
+            trees = self.fetch_block_trees([page['id'] for page in missing])
             
-            while has_more:
-                query_params = {"block_id": page_id}
-                
-                if next_cursor:
-                    query_params["start_cursor"] = next_cursor
+            # Pages ohne vollständigen Baum stehen in failed_pages und werden übersprungen
+            for page in missing:
+                if page['id'] in trees:
+                    self.block_cache.put(page['id'], page.get('last_edited_time'), trees[page['id']])
+            self.prefetched_content.update(trees)
+        
+        self.prefetch_attachments([self.prefetched_content.get(page['id'], []) for page in pages])
+    
+    def prefetch_attachments(self, trees):
+        """Dateien aller Attachment-Blocks der Bäume parallel laden, bevor gerendert wird"""
+        attachment_blocks = []
+        stack = [block for tree in trees for block in tree]
+        while stack:
+            block = stack.pop()
+            if self.attachments.is_attachment(block):
+                attachment_blocks.append(block)
+            stack.extend(block.get('children', []))
+        
+        if attachment_blocks:
+            print(f"📎 Prüfe {len(attachment_blocks)} Attachments ({self.attachments.workers} Worker)...")
+            self.attachments.ensure_all(attachment_blocks)
+    
+    def get_page_content(self, page_id, last_edited_time=None):
+        """Content einer Notion Page abrufen (Prefetch-Puffer → Block-Cache → API)"""
+        if page_id in self.prefetched_content:
+            return self.prefetched_content.pop(page_id)
+        
+        if page_id in self.failed_pages:
+            raise IncompleteBlockTree(self.failed_pages[page_id])
+        
+        cached = self.block_cache.get(page_id, last_edited_time)
+        if cached is not None:
+            return cached
+        
+        trees = self.fetch_block_trees([page_id])
+        if page_id not in trees:
+            raise IncompleteBlockTree(self.failed_pages.get(page_id, 'Block-Fetch fehlgeschlagen'))
+        
+        self.block_cache.put(page_id, last_edited_time, trees[page_id])
+        return trees[page_id]
+    
+    def fetch_block_trees(self, page_ids):
+        """Verschachtelte Blocks per Breitensuche laden
+        
+        Pro Ebene werden die Child-Listen aller Pages gleichzeitig geholt -
+        tiefe Pages kosten so ~1 Round-Trip pro Ebene statt pro Block.
+        Kinder landen in block['children']. Schlägt ein Fetch fehl, fehlt die
+        Page im Ergebnis (Grund in self.failed_pages) - nie ein Teilbaum.
+        """
+        trees = {page_id: [] for page_id in page_ids}
+        budgets = {page_id: self.block_budget for page_id in page_ids}
+        
+        # (page_id, block_id, Ziel-Liste für die Kinder)
+        level = [(page_id, page_id, trees[page_id]) for page_id in page_ids]
+        depth = 0
+        
+        with self.executor_factory(max_workers=max(1, self.fetch_workers)) as executor:
+            while level:
+                results = executor.map(lambda item: self.try_fetch_block_children(item[1]), level)
+                next_level = []
                 
-                response = self.notion.blocks.children.list(**query_params)
-                blocks.extend(response.get('results', []))
+                for (page_id, block_id, target), (children, error) in zip(level, results):
+                    if page_id in self.failed_pages:
+                        continue
+                    if error is not None:
+                        print(f"⚠️ Blocks von {page_id[:8]}... nicht vollständig geladen ({error}) - Page wird übersprungen")
+                        self.failed_pages[page_id] = str(error)
+                        continue
+                    
+                    if len(children) > budgets[page_id]:
+                        print(f"⚠️ Block-Budget ({self.block_budget}) erreicht für {page_id[:8]}... - Rest abgeschnitten")
+                        children = children[:budgets[page_id]]
+                    budgets[page_id] -= len(children)
+                    target.extend(children)
+                    
+                    if depth >= self.block_max_depth:
+                        continue
+                    
+                    for child in children:
+                        if self.should_descend(child):
+                            child['children'] = []
+                            next_level.append((page_id, child['id'], child['children']))
                 
-                has_more = response.get('has_more', False)
-                next_cursor = response.get('next_cursor')
-            
-            return blocks
-            
+                # Fehlgeschlagene Ebene verwirft den ganzen Baum - tiefere Ebenen nicht mehr laden
+                level = [item for item in next_level
+                         if budgets[item[0]] > 0 and item[0] not in self.failed_pages]
+                depth += 1
+        
+        return {page_id: tree for page_id, tree in trees.items() if page_id not in self.failed_pages}
+    
+    def try_fetch_block_children(self, block_id):
+        """(Kinder, None) oder (None, Fehler) - für executor.map ohne Abbruch der ganzen Ebene"""
+        try:
+            return self.fetch_block_children(block_id), None
         except Exception as e:
-            print(f"Fehler beim Abrufen des Contents für {page_id}: {e}")
-            return []
+            return None, e
     
-    def block_to_markdown(self, block):
-        """Einzelnen Block zu Markdown konvertieren (erweitert)"""
-        block_type = block.get('type', '')
-        
-        # Text-basierte Blocks
-        if block_type in ['paragraph', 'heading_1', 'heading_2', 'heading_3']:
-            text_content = self.extract_text_from_rich_text(
-                block.get(block_type, {}).get('rich_text', [])
-            )
+    def should_descend(self, block):
+        """Kinder laden? Unterseiten/-Databases werden als eigene Pages gesynct"""
+        return block.get('has_children') and block.get('type') not in ('child_page', 'child_database')
+    
+    def fetch_block_children(self, block_id):
+        """Alle direkten Kinder eines Blocks (oder einer Page) von der API abrufen
+        
+        Fehler werden nicht verschluckt - eine leere Liste würde als
+        vollständiger (leerer) Inhalt gecacht und geschrieben.
+        """
+        blocks = []
+        has_more = True
+        next_cursor = None
+        
+        while has_more:
+            query_params = {"block_id": block_id}
             
-            if block_type == 'heading_1':
-                return f"# {text_content}\n\n"
-            elif block_type == 'heading_2':
-                return f"## {text_content}\n\n"
-            elif block_type == 'heading_3':
-                return f"### {text_content}\n\n"
-            else:  # paragraph
-                return f"{text_content}\n\n"
-        
-        # Listen
-        elif block_type == 'bulleted_list_item':
-            text = self.extract_text_from_rich_text(
-                block.get('bulleted_list_item', {}).get('rich_text', [])
-            )
-            return f"- {text}\n"
-        
-        elif block_type == 'numbered_list_item':
-            text = self.extract_text_from_rich_text(
-                block.get('numbered_list_item', {}).get('rich_text', [])
-            )
-            return f"1. {text}\n"
-        
-        # Code block
-        elif block_type == 'code':
-            code_block = block.get('code', {})
-            language = code_block.get('language', '')
-            text = self.extract_text_from_rich_text(code_block.get('rich_text', []))
-            return f"```{language}\n{text}\n```\n\n"
-        
-        # Quote
-        elif block_type == 'quote':
-            text = self.extract_text_from_rich_text(
-                block.get('quote', {}).get('rich_text', [])
-            )
-            return f"> {text}\n\n"
-        
-        # Divider
-        elif block_type == 'divider':
-            return "---\n\n"
-        
-        # To-do
-        elif block_type == 'to_do':
-            todo = block.get('to_do', {})
-            checked = todo.get('checked', False)
-            text = self.extract_text_from_rich_text(todo.get('rich_text', []))
-            checkbox = "[x]" if checked else "[ ]"
-            return f"- {checkbox} {text}\n"
-        
-        # Toggle (Collapsible)
-        elif block_type == 'toggle':
-            text = self.extract_text_from_rich_text(
-                block.get('toggle', {}).get('rich_text', [])
-            )
-            return f"<details>\n<summary>{text}</summary>\n\n<!-- Toggle content would go here -->\n</details>\n\n"
-        
-        # Callout
-        elif block_type == 'callout':
-            callout = block.get('callout', {})
-            text = self.extract_text_from_rich_text(callout.get('rich_text', []))
-            icon = callout.get('icon', {}).get('emoji', '💡')
-            return f"> {icon} **Callout:** {text}\n\n"
+            if next_cursor:
+                query_params["start_cursor"] = next_cursor
+            
+            response = self.notion.blocks.children.list(**query_params)
+            blocks.extend(response.get('results', []))
+            
+            has_more = response.get('has_more', False)
+            next_cursor = response.get('next_cursor')
         
-        # Andere Block-Typen als Kommentar
-        else:
-            return f"<!-- Notion Block: {block_type} (nicht unterstützt) -->\n"
+        return blocks
+    
+    def render_blocks(self, blocks, out):
+        """Blocks nacheinander in einen Writer (z.B. io.StringIO) rendern"""
+        for block in blocks:
+            out.write(self.block_to_markdown(block))
+    
+    def render_children(self, block, prefix="    "):
+        """Verschachtelte Kinder eines Blocks rendern, Zeilen mit `prefix` eingerückt"""
+        children = block.get('children')
+        if not children:
+            return ""
+        
+        buffer = io.StringIO()
+        self.render_blocks(children, buffer)
+        content = buffer.getvalue()
+        if not prefix:
+            return content
+        
+        # Leerzeilen in Quotes/Callouts müssen das '>' behalten
+        empty_prefix = prefix.rstrip()
+        return "".join(
+            prefix + line if line.strip() else empty_prefix + line
+            for line in content.splitlines(True)
+        )
+    
+    def block_to_markdown(self, block):
+        """Einzelnen Block über die Renderer-Registry zu Markdown konvertieren"""
+        return self.renderers.render(block, self)
     
     def extract_text_from_rich_text(self, rich_text_array):
         """Text aus Notion Rich Text Array extrahieren (erweitert)"""
-        text = ""
+        parts = []
         for item in rich_text_array:
-            content = item.get('text', {}).get('content', '')
-            annotations = item.get('annotations', {})
+            text = item.get('text', {})
+            content = text.get('content', '')
             
             # Links
-            if item.get('text', {}).get('link'):
-                url = item.get('text', {}).get('link', {}).get('url', '')
-                content = f"[{content}]({url})"
-            
-            # Formatierung anwenden
-            if annotations.get('bold'):
-                content = f"**{content}**"
-            if annotations.get('italic'):
-                content = f"*{content}*"
-            if annotations.get('code'):
-                content = f"`{content}`"
-            if annotations.get('strikethrough'):
-                content = f"~~{content}~~"
-            if annotations.get('underline'):
-                content = f"<u>{content}</u>"
-            
-            text += content
-        
-        return text
+            link = text.get('link')
+            if link:
+                content = f"[{content}]({link.get('url', '')})"
+            
+            # Formatierung: (Präfix, Suffix) aus der vorberechneten Tabelle
+            annotations = item.get('annotations')
+            if annotations:
+                prefix, suffix = ANNOTATION_WRAPPERS[(
+                    bool(annotations.get('bold')), bool(annotations.get('italic')),
+                    bool(annotations.get('code')), bool(annotations.get('strikethrough')),
+                    bool(annotations.get('underline'))
+                )]
+                if prefix:
+                    content = f"{prefix}{content}{suffix}"
+            
+            parts.append(content)
+        
+        return "".join(parts)
     
     def sanitize_filename(self, filename):
         """Dateinamen für Filesystem bereinigen (erweitert)"""
@@ -628,6 +1220,16 @@ class EnhancedNotionToObsidian:
         # Länge begrenzen
         return filename[:100].strip('_')
     
+    def link_for_notion_id(self, notion_id):
+        """Relation-Ziel als Obsidian-Link, falls die Page im Vault liegt (oder im Plan steht)"""
+        path = self.planned_paths.get(notion_id)
+        if not path:
+            entry = self.index.get(notion_id)
+            path = entry['path'] if entry else None
+        if path:
+            return f"[[{Path(path).stem}]]"
+        return notion_id
+    
     def page_to_markdown(self, page):
         """Komplette Page zu Markdown konvertieren (erweitert)"""
         properties = page.get('properties', {})
@@ -653,86 +1255,411 @@ class EnhancedNotionToObsidian:
             'synced_at': datetime.now().isoformat()
         }
         
+        # Database-Zeilen: alle Properties typisiert ins Frontmatter
+        if page.get('parent', {}).get('type') == 'database_id':
+            for key, value in self.property_renderer.render(properties).items():
+                frontmatter_data.setdefault(key, value)
+        
         # Content abrufen
-        blocks = self.get_page_content(page_id)
+        blocks = self.get_page_content(page_id, page.get('last_edited_time'))
         
-        # Markdown Content generieren
-        markdown_content = f"# {title}\n\n"
+        # Markdown Content in einen Buffer streamen (linear statt += Kopien)
+        buffer = io.StringIO()
+        buffer.write(f"# {title}\n\n")
+        self.render_blocks(blocks, buffer)
         
-        for block in blocks:
-            markdown_content += self.block_to_markdown(block)
+        # Frontmatter wird erst in save_markdown_file hinzugefügt
+        return buffer.getvalue(), frontmatter_data
+    
+    def is_archived(self, obj):
+        """In Notion archiviert oder im Papierkorb"""
+        return bool(obj.get('archived') or obj.get('in_trash'))
+    
+    def reconcile_deletions(self, seen_ids):
+        """Index gegen die in diesem Lauf gesehenen IDs abgleichen (kein Vault-Scan)
+        
+        Fehlt eine Page zum ersten Mal, wird nur der Zeitpunkt vermerkt - erst
+        wenn sie länger als ARCHIVE_GRACE_HOURS fehlt, wird sie archiviert.
+        So lösen verzögerte Search-Ergebnisse keine Archivierung aus.
+        """
+        missing_since = self.sync_state.setdefault('missing_since', {})
+        now = datetime.now()
+        
+        # Wieder aufgetauchte oder nicht mehr indexierte Pages vergessen
+        for notion_id in list(missing_since):
+            if notion_id in seen_ids or not self.index.get(notion_id):
+                del missing_since[notion_id]
+        
+        expired = []
+        for notion_id, entry in self.index.entries.items():
+            if notion_id in seen_ids or not entry['path'].startswith('from-notion/'):
+                continue
+            
+            first_missing = datetime.fromisoformat(missing_since.setdefault(notion_id, now.isoformat()))
+            if now - first_missing >= timedelta(hours=self.archive_grace_hours):
+                expired.append(notion_id)
         
-        # Frontmatter hinzufügen
-        post = frontmatter.Post(markdown_content, **frontmatter_data)
+        waiting = len(missing_since) - len(expired)
+        if waiting:
+            print(f"⏳ {waiting} Pages fehlen in Notion - Archivierung nach Karenzzeit ({self.archive_grace_hours:g}h)")
         
-        return frontmatter.dumps(post), frontmatter_data
+        if expired:
+            self.archive_pages(expired, 'missing_in_notion')
+        return len(expired)
+    
+    def archive_pages(self, notion_ids, reason):
+        """Notes gesammelt nach archive/notion-deleted/<Zeitstempel>/ verschieben + Tombstones"""
+        # Ausstehende Writes dürfen nicht nach dem Verschieben neu entstehen
+        self.writer.flush()
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        batch_dir = Path('archive') / 'notion-deleted' / timestamp
+        missing_since = self.sync_state.setdefault('missing_since', {})
+        tombstones = []
+        emptied_dirs = set()
+        
+        for notion_id in notion_ids:
+            entry = self.index.get(notion_id)
+            if not entry:
+                continue
+            
+            source = Path(entry['path'])
+            relative = source.relative_to('from-notion') if source.parts[0] == 'from-notion' else source
+            target = batch_dir / relative
+            
+            try:
+                if (self.obsidian_path / source).exists():
+                    (self.obsidian_path / target).parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(self.obsidian_path / source, self.obsidian_path / target)
+                    emptied_dirs.add(source.parent)
+            except OSError as e:
+                print(f"⚠️ Archivieren fehlgeschlagen ({source}): {e}")
+                continue
+            
+            tombstones.append({
+                'notion_id': notion_id,
+                'title': entry.get('title'),
+                'path': str(source),
+                'archived_path': str(target),
+                'archived_at': datetime.now().isoformat(),
+                'missing_since': missing_since.pop(notion_id, None),
+                'reason': reason
+            })
+            self.index.remove(notion_id)
+        
+        # Leer gewordene Ordner (von unten nach oben) entfernen
+        for directory in sorted(emptied_dirs, key=lambda d: len(d.parts), reverse=True):
+            while directory.parts and directory != Path('from-notion'):
+                try:
+                    (self.obsidian_path / directory).rmdir()
+                except OSError:
+                    break
+                directory = directory.parent
+        
+        if tombstones:
+            self.append_tombstones(tombstones)
+            print(f"🪦 {len(tombstones)} Pages archiviert → {batch_dir}")
+        return len(tombstones)
+    
+    def append_tombstones(self, tombstones):
+        """Tombstone-Records an .notion_tombstones.json anhängen"""
+        records = []
+        if self.tombstone_file.exists():
+            try:
+                with open(self.tombstone_file, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden der Tombstones: {e}")
+        
+        records.extend(tombstones)
+        
+        try:
+            with open(self.tombstone_file, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"⚠️ Fehler beim Speichern der Tombstones: {e}")
+    
+    def execute_sync_plan(self, plan, hierarchy):
+        """Sync-Plan in Tiefensuch-Reihenfolge abarbeiten"""
+        print("🔄 Starte Synchronisation...")
+        synced_count = 0
+        
+        # Relations auf Pages verlinken, die in diesem Lauf erst noch geschrieben werden
+        self.planned_paths = {entry['id']: entry['file_path'] for entry in plan}
+        
+        for entry in plan:
+            # Database-Hauptdateien schreibt build_database_structure (umbenannt wird hier)
+            if entry['notion_type'] == 'database_main':
+                self.relocate_if_moved(entry)
+                continue
+            if entry['is_root']:
+                print(f"\n📂 Verarbeite Root-Page: {entry['title']}")
+            synced_count += self.sync_plan_entry(entry, hierarchy)
+        
+        return synced_count
+    
+    def retrieve_objects(self, object_type, object_ids):
+        """Pages bzw. Databases parallel per retrieve holen (Fehler → ausgelassen)"""
+        def retrieve(object_id):
+            try:
+                if object_type == 'database':
+                    return self.notion.databases.retrieve(database_id=object_id)
+                return self.notion.pages.retrieve(page_id=object_id)
+            except Exception as e:
+                print(f"⚠️ {object_type} {object_id} nicht abrufbar: {e}")
+                return None
+        
+        with self.executor_factory(max_workers=max(1, self.fetch_workers)) as executor:
+            return [obj for obj in executor.map(retrieve, object_ids) if obj]
+    
+    def discover_subtree(self, root_ids):
+        """Nachfahren der Roots per blocks.children.list ermitteln (kein globaler Search)
+        
+        Ebene für Ebene: Block-Bäume der Pages laden (Cache oder API), darin
+        child_page/child_database Blocks sammeln, diese abrufen. Die geladenen
+        Block-Bäume landen direkt im Prefetch-Puffer - der Crawl kostet damit
+        kaum mehr Requests als das Rendern ohnehin.
+        """
+        pages = {}
+        databases = {}
+        block_owners = self.sync_state.setdefault('block_owners', {})
+        
+        # Roots: Page oder Database?
+        frontier = []
+        database_ids = []
+        for root_id in root_ids:
+            try:
+                frontier.append(self.notion.pages.retrieve(page_id=root_id))
+            except Exception:
+                database_ids.append(root_id)
+        
+        while frontier or database_ids:
+            # Databases: Objekt + alle Zeilen (Zeilen sind vollständige Page-Objekte)
+            for database in self.retrieve_objects('database', [d for d in database_ids if d not in databases]):
+                databases[database['id']] = database
+                try:
+                    frontier.extend(self.get_database_entries(database['id']))
+                except Exception as e:
+                    print(f"⚠️ Fehler beim Abrufen der Database Entries für {database['id']}: {e}")
+            database_ids = []
+            
+            frontier = [page for page in frontier if page['id'] not in pages]
+            for page in frontier:
+                pages[page['id']] = page
+            
+            # Block-Bäume der neuen Pages (Cache zuerst), danach liegen sie im Prefetch-Puffer
+            missing = []
+            for page in frontier:
+                cached = self.block_cache.get(page['id'], page.get('last_edited_time'))
+                if cached is not None:
+                    self.prefetched_content[page['id']] = cached
+                else:
+                    missing.append(page)
+            if missing:
+                trees = self.fetch_block_trees([page['id'] for page in missing])
+                for page in missing:
+                    if page['id'] in trees:
+                        self.block_cache.put(page['id'], page.get('last_edited_time'), trees[page['id']])
+                self.prefetched_content.update(trees)
+            
+            # Unterseiten/-Databases in den Bäumen finden (auch in Spalten, Toggles, ...)
+            child_page_ids = []
+            for page in frontier:
+                stack = [(page['id'], block) for block in self.prefetched_content.get(page['id'], [])]
+                while stack:
+                    container_id, block = stack.pop()
+                    if block.get('type') in ('child_page', 'child_database'):
+                        if container_id != page['id']:
+                            # Spart resolve_block_owner später den Weg nach oben
+                            block_owners[container_id] = page['id']
+                        if block['type'] == 'child_page':
+                            child_page_ids.append(block['id'])
+                        elif block['id'] not in databases:
+                            database_ids.append(block['id'])
+                    stack.extend((block['id'], child) for child in block.get('children', []))
+            
+            frontier = self.retrieve_objects('page', [pid for pid in child_page_ids if pid not in pages])
+        
+        return list(pages.values()), list(databases.values())
+    
+    def subtree_base_path(self, page):
+        """Ordner, in dem eine Teilbaum-Root liegt - ihre bestehende Position im Vault"""
+        existing_path = self.get_existing_file_by_notion_id(page['id'])
+        if existing_path:
+            if existing_path.name == f"_{existing_path.parent.name}.md":
+                return str(existing_path.parent.parent)
+            return str(existing_path.parent)
+        
+        parent_path = self.get_existing_file_by_notion_id(self.resolve_parent_id(page))
+        if parent_path and parent_path.name.startswith('_'):
+            return str(parent_path.parent)
+        return "from-notion"
+    
+    def sync_subtree(self, root_ids):
+        """Nur die angegebenen Pages/Databases und ihre Nachfahren syncen
+        
+        Roots bleiben an ihrer bestehenden Position im Vault. Watermark,
+        Voll-Abgleich und Lösch-Abgleich bleiben unberührt - dafür ist
+        der Blick auf einen Teilbaum zu unvollständig.
+        """
+        print(f"🎯 Starte Teilbaum-Sync für {len(root_ids)} Root(s)...")
+        
+        pages, databases = self.discover_subtree(root_ids)
+        self.page_meta.observe(pages)
+        pages = [page for page in pages if not self.is_archived(page)]
+        databases = [db for db in databases if not self.is_archived(db)]
+        print(f"📄 {len(pages)} Pages und {len(databases)} Databases im Teilbaum")
+        
+        if not pages and not databases:
+            print("❌ Keine Pages im Teilbaum gefunden!")
+            return 0
+        
+        self.prefetch_attachments([self.prefetched_content.get(page['id'], []) for page in pages])
+        
+        hierarchy = self.build_page_hierarchy(pages, databases)
+        base_paths = {
+            node_id: self.subtree_base_path(node['page'])
+            for node_id, node in hierarchy.items()
+            if node['parent_id'] is None and not node.get('is_database')
+        }
+        plan = self.build_sync_plan(hierarchy, base_paths)
+        
+        synced_count = self.execute_sync_plan(plan, hierarchy)
+        if databases:
+            synced_count += len(self.build_database_structure(databases))
+        
+        self.writer.flush()
+        self.index.save()
+        self.attachments.save()
+        self.page_meta.save()
+        self.save_sync_state()
+        
+        print(f"\n🎉 Teilbaum-Sync abgeschlossen: {synced_count} Dateien synchronisiert")
+        print(f"   💾 {self.write_stats['written']} geschrieben, {self.write_stats['skipped']} unverändert übersprungen")
+        self.block_cache.print_stats()
+        self.attachments.print_stats()
+        self.writer.print_stats()
+        return synced_count
     
     def sync_all_pages(self):
         """INTELLIGENTE HIERARCHIE: Automatische Erkennung von Parent-Child-Relationships"""
         print(f"🧠 Starte intelligenten hierarchischen Sync...")
         print(f"📁 Obsidian Pfad: {self.obsidian_path}")
         
-        # 1. Alle Pages abrufen
-        all_pages = self.get_all_pages()
-        print(f"📄 {len(all_pages)} Pages insgesamt gefunden")
+        # 1.+2. Discovery: ein Search-Durchlauf liefert Pages und Databases
+        all_pages, databases = self.discover_workspace()
+        print(f"📄 {len(all_pages)} Pages und {len(databases)} Databases gefunden")
         
         if not all_pages:
             print("❌ Keine Pages gefunden!")
             return 0
         
-        # 2. Hierarchie-Baum aufbauen
+        # Archivierte Pages/Databases gelten als nicht mehr vorhanden
+        self.page_meta.observe(all_pages)
+        all_pages = [page for page in all_pages if not self.is_archived(page)]
+        databases = [db for db in databases if not self.is_archived(db)]
+        
+        # 3. Hierarchie-Baum aufbauen (alle Parent-Typen)
         print("🔍 Analysiere Page-Hierarchie...")
-        hierarchy = self.build_page_hierarchy(all_pages)
+        hierarchy = self.build_page_hierarchy(all_pages, databases)
         
-        # 3. Root-Pages finden (Pages ohne Parent)
-        root_pages = []
-        for page_id, page_data in hierarchy.items():
-            if page_data['parent_id'] is None:
-                root_pages.append(page_id)
+        # 4. Sync-Plan: Vault-Pfad jeder Page steht vor dem ersten Content-Fetch fest
+        plan = self.build_sync_plan(hierarchy)
+        root_pages = [entry for entry in plan if entry['is_root'] and entry['notion_type'] != 'database_main']
         
         print(f"🌳 {len(root_pages)} Root-Pages gefunden")
         
-        # 4. Hierarchie-Statistiken
-        pages_with_children = sum(1 for p in hierarchy.values() if len(p['children']) > 0)
+        # Hierarchie-Statistiken
+        pages_with_children = sum(1 for entry in plan if entry['notion_type'] == 'page_with_children')
         total_relationships = sum(len(p['children']) for p in hierarchy.values())
         
         print(f"📊 {pages_with_children} Pages mit Unterseiten")
         print(f"🔗 {total_relationships} Parent-Child-Beziehungen")
         
-        # 5. Rekursive Synchronisation aller Root-Pages
-        print("🔄 Starte rekursive Synchronisation...")
-        synced_count = 0
-        
-        for root_page_id in root_pages:
-            if root_page_id in hierarchy:
-                page_title = self.get_page_title(hierarchy[root_page_id]['page'])
-                print(f"\n📂 Verarbeite Root-Page: {page_title}")
-                synced_count += self.sync_page_recursively(root_page_id, hierarchy)
-        
-        # 6. Zusätzlich: Alte Database-Objects (falls vorhanden)
-        try:
-            database_response = self.notion.search(filter={"property": "object", "value": "database"})
-            databases = database_response.get('results', [])
-            
-            if databases:
-                print(f"\n🗂️ {len(databases)} zusätzliche Database-Objects gefunden")
-                database_folders = self.build_database_structure()
-                synced_count += len(database_folders)
-        except Exception as e:
-            print(f"⚠️ Fehler bei Database-Objects: {e}")
+        # 5. Blocks aller Pages parallel vorab laden (reihenfolgeunabhängig)
+        self.prefetch_page_contents([
+            hierarchy[entry['id']]['page'] for entry in plan if entry['notion_type'] != 'database_main'
+        ])
+        
+        # 6. Plan abarbeiten (iterativ, Reihenfolge wie Tiefensuche)
+        synced_count = self.execute_sync_plan(plan, hierarchy)
+        
+        # 7. Zusätzlich: Database-Hauptdateien (_DatabaseName.md)
+        if databases:
+            print(f"\n🗂️ {len(databases)} zusätzliche Database-Objects gefunden")
+            database_folders = self.build_database_structure(databases)
+            synced_count += len(database_folders)
+        
+        # 8. Ausstehende Writes abwarten - fehlgeschlagene sind danach aus dem Index entfernt
+        self.writer.flush()
+        
+        # 9. Abgleich: lokal indexierte, in Notion verschwundene Pages archivieren
+        seen_ids = {page['id'] for page in all_pages} | {db['id'] for db in databases}
+        self.reconcile_deletions(seen_ids)
+        
+        # 10. Vault-Index und Watermark persistieren
+        self.index.save()
+        self.attachments.save()
+        self.page_meta.save()
+        self.advance_watermark(all_pages)
+        
+        # Ab jetzt inkrementell per databases.query - Watermark je Database aus ihren Zeilen
+        rows_by_database = {db['id']: [] for db in databases}
+        for page in all_pages:
+            database_id = page.get('parent', {}).get('database_id')
+            if database_id in rows_by_database:
+                rows_by_database[database_id].append(page)
+        self.sync_state['database_watermarks'] = {database_id: None for database_id in rows_by_database}
+        self.advance_database_watermarks(rows_by_database)
+        
+        self.sync_state['last_full_sync'] = datetime.now().isoformat()
+        self.save_sync_state()
         
         print(f"\n🎉 Intelligenter hierarchischer Sync abgeschlossen!")
         print(f"   📝 {synced_count} Dateien synchronisiert")
         print(f"   🌳 {len(root_pages)} Root-Hierarchien verarbeitet")
         print(f"   📊 {pages_with_children} Pages mit Unterordnern")
+        print(f"   💾 {self.write_stats['written']} geschrieben, {self.write_stats['skipped']} unverändert übersprungen")
+        self.block_cache.print_stats()
+        self.attachments.print_stats()
+        self.writer.print_stats()
         
         return synced_count
 
 def main():
     """Main function"""
     try:
-        syncer = EnhancedNotionToObsidian()
-        syncer.sync_all_pages()
+        # Engine: --async oder NOTION_SYNC_ENGINE=async (Standard: Threads)
+        engine = os.getenv('NOTION_SYNC_ENGINE', 'threads').lower()
+        if '--async' in sys.argv[1:]:
+            engine = 'async'
+        
+        if engine == 'async':
+            from async_notion_sync import AsyncNotionToObsidian
+            syncer = AsyncNotionToObsidian()
+        else:
+            syncer = EnhancedNotionToObsidian()
+        
+        # Modus: --full / --incremental oder NOTION_SYNC_MODE (Standard: incremental)
+        mode = os.getenv('NOTION_SYNC_MODE', 'incremental').lower()
+        if '--full' in sys.argv[1:]:
+            mode = 'full'
+        elif '--incremental' in sys.argv[1:]:
+            mode = 'incremental'
+        
+        # Teilbaum: --root <page_or_database_id> (mehrfach) oder NOTION_SYNC_ROOTS (kommagetrennt)
+        roots = [sys.argv[i + 1] for i, arg in enumerate(sys.argv[:-1]) if arg == '--root']
+        if not roots:
+            roots = [r.strip() for r in os.getenv('NOTION_SYNC_ROOTS', '').split(',') if r.strip()]
+        
+        if roots:
+            syncer.sync_subtree(roots)
+        elif mode == 'full':
+            syncer.sync_all_pages()
+        else:
+            syncer.sync_incremental()
+        
+        syncer.transport.print_stats()
         
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         print(f"⏰ Letzter Enhanced Sync: {timestamp}")
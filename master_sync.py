@@ -14,6 +14,7 @@ class MasterSyncController:
         self.obsidian_path = Path(os.getenv('OBSIDIAN_PATH', '/shared/obsidian'))
         self.sync_interval = int(os.getenv('SYNC_INTERVAL_MINUTES', '15'))
         self.state_file = self.obsidian_path / '.sync_state.json'
+        self.script_timeout = int(os.getenv('SYNC_SCRIPT_TIMEOUT', '300'))
         
         self.load_sync_state()
     
@@ -48,14 +49,14 @@ class MasterSyncController:
         except Exception as e:
             print(f"⚠️ Fehler beim Speichern des Sync-Status: {e}")
     
-    def run_script(self, script_name, description):
+    def run_script(self, script_name, description, args=()):
         """Python-Script ausführen"""
         try:
             print(f"🔄 Starte {description}...")
             
             result = subprocess.run([
-                'python3', f'/app/{script_name}'
-            ], capture_output=True, text=True, timeout=300)  # 5 Min Timeout
+                'python3', f'/app/{script_name}', *args
+            ], capture_output=True, text=True, timeout=self.script_timeout)
             
             if result.returncode == 0:
                 print(f"✅ {description} erfolgreich")
@@ -74,35 +75,29 @@ class MasterSyncController:
                 return False
         
         except subprocess.TimeoutExpired:
-            print(f"⏰ {description} Timeout (>5 Min)")
+            print(f"⏰ {description} Timeout (>{self.script_timeout}s)")
             return False
         except Exception as e:
             print(f"💥 Unerwarteter Fehler bei {description}: {e}")
             return False
     
     def check_pending_files(self):
-        """Prüft ob Dateien auf Sync warten"""
-        pending_count = 0
-        
-        for file_path in self.obsidian_path.glob("**/*.md"):
-            if 'archive' in str(file_path):
-                continue
-            
-            try:
-                import frontmatter
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
-                
-                if post.metadata.get('sync_status') == 'pending':
-                    pending_count += 1
-            
-            except Exception:
-                continue
-        
-        return pending_count
+        """Prüft ob Dateien auf Sync warten (aus der Pending-Queue, kein Vault-Scan)"""
+        from pending_queue import PendingQueue
+        queue = PendingQueue(self.obsidian_path)
+        queue.ensure_seeded()
+        return len(queue.pending())
     
-    def sync_notion_to_obsidian(self):
-        """Notion → Obsidian Sync ausführen"""
+    def sync_notion_to_obsidian(self, roots=()):
+        """Notion → Obsidian Sync ausführen (optional nur Teilbäume unter `roots`)"""
+        if roots:
+            args = [arg for root_id in roots for arg in ('--root', root_id)]
+            return self.run_script(
+                'enhanced_notion_sync.py',
+                f'Notion → Obsidian Teilbaum-Sync ({len(roots)} Roots)',
+                args
+            )
+        
         success = self.run_script(
             'enhanced_notion_sync.py',
             'Notion → Obsidian Sync'
@@ -287,8 +282,9 @@ def main():
             controller.print_sync_status()
         
         elif command == 'notion-to-obsidian':
-            # Nur Notion → Obsidian
-            success = controller.sync_notion_to_obsidian()
+            # Nur Notion → Obsidian (--root <id> beschränkt auf Teilbäume)
+            roots = [sys.argv[i + 1] for i, arg in enumerate(sys.argv[:-1]) if arg == '--root']
+            success = controller.sync_notion_to_obsidian(roots)
             controller.save_sync_state()
             sys.exit(0 if success else 1)
         
@@ -304,10 +300,42 @@ def main():
             controller.save_sync_state()
             sys.exit(0 if success else 1)
         
+        elif command == 'workspaces':
+            # Alle Workspaces aus NOTION_WORKSPACES_FILE in einem Prozess
+            success = controller.run_script('multi_workspace_sync.py', 'Multi-Workspace Sync')
+            sys.exit(0 if success else 1)
+        
         elif command == 'cleanup':
             # Archive bereinigen
             controller.cleanup_old_files()
         
+        elif command == 'cache-status':
+            # Block-Cache anzeigen
+            from block_cache import BlockCache
+            BlockCache(controller.obsidian_path).show_status()
+        
+        elif command == 'cache-clear':
+            # Block-Cache leeren
+            from block_cache import BlockCache
+            removed = BlockCache(controller.obsidian_path).clear()
+            print(f"🧹 {removed} Cache-Einträge gelöscht")
+        
+        elif command == 'queue-status':
+            # Pending-Queue anzeigen
+            from pending_queue import PendingQueue
+            PendingQueue(controller.obsidian_path).show_status()
+        
+        elif command == 'queue-rescan':
+            # Vault nach pending Dateien durchsuchen (z.B. extern erstellte Notes)
+            from pending_queue import PendingQueue
+            PendingQueue(controller.obsidian_path).rescan()
+        
+        elif command == 'queue-requeue':
+            # Geparkte Einträge erneut versuchen
+            from pending_queue import PendingQueue
+            requeued = PendingQueue(controller.obsidian_path).requeue_parked()
+            print(f"🔁 {requeued} geparkte Einträge wieder eingereiht")
+        
         else:
             print(f"❌ Unbekannter Command: {command}")
             print_usage()
@@ -332,14 +360,43 @@ Commands:
     daemon                  Kontinuierlicher Sync alle 15 Min
     status                  Sync-Status anzeigen
     notion-to-obsidian      Nur Notion → Obsidian
+                            --root <id> (mehrfach): nur diese Pages/Databases + Nachfahren
     change-detection        Nur Change Detection (Obsidian-Änderungen erkennen)
     obsidian-to-notion      Nur Obsidian → Notion
+    workspaces              Mehrere Workspaces/Vaults in einem Prozess syncen
     cleanup                 Alte Archive-Dateien bereinigen
+    cache-status            Block-Cache Größe und Einträge anzeigen
+    cache-clear             Block-Cache leeren
+    queue-status            Pending-Queue (Obsidian → Notion) anzeigen
+    queue-rescan            Vault nach pending Dateien durchsuchen und einreihen
+    queue-requeue           Geparkte Queue-Einträge erneut versuchen
 
 Environment Variables:
     SYNC_INTERVAL_MINUTES   Sync-Intervall in Minuten (Standard: 15)
     NOTION_TOKEN           Notion API Token
     OBSIDIAN_PATH          Pfad zum Obsidian Vault
+    NOTION_SYNC_MODE       incremental (Standard) oder full
+    FULL_SYNC_INTERVAL_HOURS  Voll-Abgleich spätestens alle X Stunden (Standard: 24)
+    ARCHIVE_GRACE_HOURS    Gelöschte Notion-Pages erst nach X Stunden archivieren (Standard: 24)
+    SYNC_OVERLAP_MINUTES   Sicherheits-Overlap für den Watermark (Standard: 5)
+    NOTION_FETCH_WORKERS   Parallele Block-Fetches (Standard: 4)
+    NOTION_RATE_LIMIT      Gemeinsames Request-Limit pro Sekunde (Standard: 3)
+    NOTION_MAX_RETRIES     Retries bei 429/5xx/Timeouts (Standard: 5)
+    NOTION_BLOCK_MAX_DEPTH Maximale Verschachtelungstiefe für Blocks (Standard: 8)
+    NOTION_BLOCK_BUDGET    Maximale Anzahl Blocks pro Page (Standard: 5000)
+    NOTION_CACHE_MAX_MB    Maximale Größe des Block-Caches in MB (Standard: 200)
+    NOTION_SYNC_ENGINE     threads (Standard) oder async (notion_client.AsyncClient)
+    NOTION_ASYNC_CONCURRENCY  Gleichzeitige Requests der Async-Engine (Standard: 16)
+    NOTION_PAGE_TIMEOUT    Timeout pro Page in der Async-Engine in Sekunden (Standard: 120)
+    SYNC_SCRIPT_TIMEOUT    Timeout pro Sync-Script in Sekunden (Standard: 300)
+    VAULT_WRITE_QUEUE      Größe der Write-Behind Queue (Standard: 64)
+    NOTION_SYNC_ROOTS      Kommagetrennte Root-IDs für einen Teilbaum-Sync (Standard: ganzer Workspace)
+    NOTION_WORKSPACES_FILE Workspace-Liste für 'workspaces' (Standard: /app/workspaces.json)
+    NOTION_WORKSPACE_WORKERS  Gemeinsame Fetch-Worker aller Workspaces (Standard: 8)
+    NOTION_ATTACHMENT_WORKERS Parallele Datei-Downloads (Standard: 4)
+    NOTION_ATTACHMENT_MAX_MB  Maximale Dateigröße pro Attachment in MB (Standard: 100)
+    NOTION_PENDING_MAX_ATTEMPTS  Fehlversuche, bevor eine Datei geparkt wird (Standard: 5)
+    NOTION_PAGE_META_TTL_HOURS   Gültigkeit gecachter Page-Metadaten in Stunden (Standard: 6)
     """)
 
 if __name__ == "__main__":
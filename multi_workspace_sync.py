@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# multi_workspace_sync.py - Mehrere Notion-Workspaces/Vaults in einem Prozess syncen
+
+import os
+import sys
+import json
+import threading
+import concurrent.futures
+from collections import deque
+from concurrent.futures import Executor, Future
+from datetime import datetime
+
+from notion_transport import NotionTransport
+from enhanced_notion_sync import EnhancedNotionToObsidian
+
+DEFAULT_CONFIG_FILE = os.getenv('NOTION_WORKSPACES_FILE', '/app/workspaces.json')
+DEFAULT_WORKERS = int(os.getenv('NOTION_WORKSPACE_WORKERS', '8'))
+
+
+class FairScheduler:
+    """Gemeinsamer Worker-Pool mit Round-Robin über die Workspaces
+
+    Jeder Workspace reiht seine Tasks (Block-Fetches, Retrieves, Queries) in
+    eine eigene Lane ein. Freie Worker nehmen reihum den nächsten Task der
+    nächsten Lane mit Arbeit - ein Workspace mit 10k Pages bekommt so nie
+    mehr als seinen Anteil, solange andere Workspaces etwas zu tun haben.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        self.lanes = {}
+        self.order = deque()
+        self.condition = threading.Condition()
+        self.stats = {}
+
+        for i in range(max(1, workers)):
+            threading.Thread(target=self.run, name=f'fair-worker-{i}', daemon=True).start()
+
+    def submit(self, lane, fn, *args, **kwargs) -> Future:
+        """Task in die Lane `lane` einreihen"""
+        future = Future()
+        with self.condition:
+            queue = self.lanes.setdefault(lane, deque())
+            if not queue:
+                self.order.append(lane)
+            queue.append((future, fn, args, kwargs))
+            self.condition.notify()
+        return future
+
+    def next_task(self):
+        """Nächster Task der nächsten Lane (Lane stellt sich danach hinten an)"""
+        with self.condition:
+            while not self.order:
+                self.condition.wait()
+
+            lane = self.order.popleft()
+            queue = self.lanes[lane]
+            task = queue.popleft()
+            if queue:
+                self.order.append(lane)
+
+            self.stats[lane] = self.stats.get(lane, 0) + 1
+            return task
+
+    def run(self):
+        while True:
+            future, fn, args, kwargs = self.next_task()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def executor_factory(self, lane):
+        """Ersatz für ThreadPoolExecutor: EnhancedNotionToObsidian.executor_factory"""
+        def factory(max_workers=None):
+            return LaneExecutor(self, lane)
+        return factory
+
+
+class LaneExecutor(Executor):
+    """concurrent.futures-Executor, der in eine Lane des FairSchedulers einreiht"""
+
+    def __init__(self, scheduler: FairScheduler, lane):
+        self.scheduler = scheduler
+        self.lane = lane
+        self.futures = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = self.scheduler.submit(self.lane, fn, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, **kwargs):
+        if wait:
+            concurrent.futures.wait(self.futures)
+
+
+class MultiWorkspaceSync:
+    """Liste von (Token, Vault, Scope) Einträgen in einem Prozess syncen
+
+    Ein Rate-Limit-Bucket pro Token (Einträge mit demselben Token teilen ihn),
+    ein gemeinsamer FairScheduler für alle Workspaces.
+    """
+
+    def __init__(self, config_file=DEFAULT_CONFIG_FILE, workers: int = DEFAULT_WORKERS):
+        self.config_file = config_file
+        self.workspaces = self.load_config()
+        self.scheduler = FairScheduler(workers)
+        self.transports = {}
+        self.transports_lock = threading.Lock()
+        self.results = {}
+
+    def load_config(self):
+        """workspaces.json laden und validieren"""
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+
+        workspaces = []
+        for i, entry in enumerate(entries):
+            name = entry.get('name') or f"workspace_{i + 1}"
+            token = entry.get('token') or os.getenv(entry.get('token_env', ''), '')
+            if not token:
+                raise ValueError(f"Workspace '{name}': kein Token (token oder token_env)")
+            if not entry.get('obsidian_path'):
+                raise ValueError(f"Workspace '{name}': obsidian_path fehlt")
+            # Kein Fallback auf NOTION_DATABASE_ID - die gehört zu einem anderen Workspace
+            if entry.get('bidirectional') and not entry.get('database_id'):
+                raise ValueError(f"Workspace '{name}': bidirectional braucht eine eigene database_id")
+
+            workspaces.append({
+                'name': name,
+                'token': token,
+                'obsidian_path': entry['obsidian_path'],
+                'roots': entry.get('roots', []),
+                'mode': entry.get('mode', 'incremental').lower(),
+                'bidirectional': entry.get('bidirectional', False),
+                'database_id': entry.get('database_id')
+            })
+        return workspaces
+
+    def transport_for(self, token):
+        """Ein Transport (= ein Bucket) pro Notion-Token"""
+        with self.transports_lock:
+            if token not in self.transports:
+                self.transports[token] = NotionTransport()
+            return self.transports[token]
+
+    def sync_workspace(self, workspace):
+        """Einen Workspace syncen - Fetch-Arbeit läuft über den FairScheduler"""
+        name = workspace['name']
+        transport = self.transport_for(workspace['token'])
+        print(f"🏢 [{name}] Starte Sync → {workspace['obsidian_path']}")
+
+        try:
+            syncer = EnhancedNotionToObsidian(workspace['token'], workspace['obsidian_path'], transport)
+            syncer.executor_factory = self.scheduler.executor_factory(name)
+
+            if workspace['roots']:
+                synced = syncer.sync_subtree(workspace['roots'])
+            elif workspace['mode'] == 'full':
+                synced = syncer.sync_all_pages()
+            else:
+                synced = syncer.sync_incremental()
+
+            if workspace['bidirectional']:
+                from change_detector import ObsidianChangeDetector
+                from reverse_sync_notion import ObsidianToNotion
+
+                ObsidianChangeDetector(workspace['obsidian_path']).process_changes()
+                ObsidianToNotion(
+                    workspace['token'], workspace['obsidian_path'], workspace['database_id'], transport
+                ).sync_pending_files()
+
+            self.results[name] = {'success': True, 'synced': synced}
+            print(f"✅ [{name}] Sync abgeschlossen")
+
+        except Exception as e:
+            self.results[name] = {'success': False, 'error': str(e)}
+            print(f"❌ [{name}] Sync fehlgeschlagen: {e}")
+
+    def run(self):
+        """Alle Workspaces gleichzeitig syncen"""
+        print(f"🚀 Multi-Workspace Sync: {len(self.workspaces)} Workspaces")
+        start_time = datetime.now()
+
+        threads = [
+            threading.Thread(target=self.sync_workspace, args=(workspace,), name=f"ws-{workspace['name']}")
+            for workspace in self.workspaces
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        duration = (datetime.now() - start_time).total_seconds()
+        failed = [name for name, result in self.results.items() if not result['success']]
+
+        print(f"\n🎉 Multi-Workspace Sync abgeschlossen in {duration:.1f}s")
+        for workspace in self.workspaces:
+            name = workspace['name']
+            result = self.results.get(name, {})
+            print(f"   {'✅' if result.get('success') else '❌'} {name}: "
+                  f"{self.scheduler.stats.get(name, 0)} Fetch-Tasks")
+        for transport in self.transports.values():
+            transport.print_stats()
+
+        return not failed
+
+    def list_workspaces(self):
+        """Konfigurierte Workspaces anzeigen (ohne Token)"""
+        print(f"🏢 Workspaces aus {self.config_file}:")
+        for workspace in self.workspaces:
+            scope = f"Roots: {', '.join(workspace['roots'])}" if workspace['roots'] else f"Modus: {workspace['mode']}"
+            direction = "bidirektional" if workspace['bidirectional'] else "Notion → Obsidian"
+            print(f"   📁 {workspace['name']}: {workspace['obsidian_path']} ({scope}, {direction})")
+
+
+def main():
+    """Main function mit Command-Line Interface"""
+    command = sys.argv[1].lower() if len(sys.argv) > 1 else 'run'
+
+    try:
+        multi_sync = MultiWorkspaceSync()
+    except Exception as e:
+        print(f"💥 Workspace-Konfiguration fehlerhaft: {e}")
+        sys.exit(1)
+
+    if command == 'run':
+        success = multi_sync.run()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"⏰ Letzter Multi-Workspace Sync: {timestamp}")
+        sys.exit(0 if success else 1)
+
+    elif command == 'list':
+        multi_sync.list_workspaces()
+
+    else:
+        print(f"❌ Unbekannter Command: {command}")
+        print_usage()
+        sys.exit(1)
+
+
+def print_usage():
+    """Usage Information"""
+    print("""
+🏢 Multi-Workspace Sync - mehrere Notion-Workspaces in einem Prozess
+
+Usage:
+    python3 multi_workspace_sync.py [command]
+
+Commands:
+    run         Alle Workspaces syncen (Standard)
+    list        Konfigurierte Workspaces anzeigen
+
+Konfiguration (JSON-Liste):
+    [
+      {"name": "privat", "token_env": "NOTION_TOKEN_PRIVAT",
+       "obsidian_path": "/shared/privat", "mode": "incremental",
+       "bidirectional": true, "database_id": "<database_id>"},
+      {"name": "projekt", "token_env": "NOTION_TOKEN_FIRMA",
+       "obsidian_path": "/shared/projekt", "roots": ["<page_id>"]}
+    ]
+
+Felder pro Workspace:
+    name                Anzeigename (Standard: workspace_<n>)
+    token / token_env   Notion-Token direkt oder Name der Umgebungsvariable
+    obsidian_path       Vault-Verzeichnis (Pflicht)
+    mode                incremental (Standard) oder full
+    roots               Nur diese Page-IDs samt Unterseiten syncen (statt mode)
+    bidirectional       Zusätzlich Obsidian → Notion syncen (Standard: false)
+    database_id         Sync-Database dieses Workspaces (Pflicht bei bidirectional)
+
+Environment Variables:
+    NOTION_WORKSPACES_FILE     Pfad zur Workspace-Liste (Standard: /app/workspaces.json)
+    NOTION_WORKSPACE_WORKERS   Gemeinsame Fetch-Worker aller Workspaces (Standard: 8)
+    """)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# notion_transport.py - Gemeinsamer Notion-Transport: Rate-Limit, Retries, Keep-Alive
+
+import os
+import asyncio
+import random
+import re
+import threading
+import time
+import httpx
+from notion_client import AsyncClient, Client
+
+# Notion erlaubt im Schnitt ~3 Requests/Sekunde pro Integration
+DEFAULT_RATE = float(os.getenv('NOTION_RATE_LIMIT', '3'))
+DEFAULT_MAX_RETRIES = int(os.getenv('NOTION_MAX_RETRIES', '5'))
+# Für Tests gegen einen lokalen Fake-Server überschreibbar
+NOTION_BASE_URL = os.getenv('NOTION_BASE_URL', 'https://api.notion.com')
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# POSTs ohne Seiteneffekt - dürfen wie GET nach Timeout/5xx wiederholt werden
+READ_ONLY_POST_PATTERN = re.compile(r'/(search|databases/[^/]+/query)$')
+ID_PATTERN = re.compile(r'[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}')
+
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket: `rate` Requests/s, Bursts bis `capacity`"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Blockiert bis ein Token verfügbar ist"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wie acquire(), aber ohne den Event-Loop zu blockieren"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Bucket leeren und für `seconds` sperren (z.B. nach 429 Retry-After)"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class TransportBase:
+    """Gemeinsame Logik für den Sync- und Async-Transport: Bucket, Backoff, Zähler"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0, bucket: TokenBucket = None,
+                 share_with: 'TransportBase' = None):
+        self.bucket = bucket or TokenBucket(rate)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+
+        # Bucket und Zähler eines anderen Transports mitbenutzen (gleicher Token)
+        if share_with is not None:
+            self.bucket = share_with.bucket
+            self.stats = share_with.stats
+            self.stats_lock = share_with.stats_lock
+
+    @staticmethod
+    def endpoint_name(request: httpx.Request) -> str:
+        """`POST blocks/{id}/children` - IDs zusammengefasst für die Zähler"""
+        path = request.url.path
+        if path.startswith('/v1/'):
+            path = path[4:]
+        return f"{request.method} {ID_PATTERN.sub('{id}', path)}"
+
+    @staticmethod
+    def is_retry_safe(request: httpx.Request) -> bool:
+        """Darf der Request nach Timeout/5xx erneut gesendet werden?
+
+        Schreibende POST/PATCH (pages.create, blocks.children.append, ...) hat
+        der Server evtl. schon ausgeführt - ein Retry würde Pages oder Chunks
+        doppelt anlegen. Die gehen nur bei 429 und Verbindungsfehlern erneut raus.
+        """
+        if request.method not in ('POST', 'PATCH'):
+            return True
+        return request.method == 'POST' and bool(READ_ONLY_POST_PATTERN.search(request.url.path))
+
+    def may_retry_error(self, request: httpx.Request, error: Exception) -> bool:
+        # Verbindung kam nie zustande → Request hat den Server nicht erreicht
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)) or self.is_retry_safe(request)
+
+    def may_retry_response(self, request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code not in RETRY_STATUS_CODES:
+            return False
+        return response.status_code == 429 or self.is_retry_safe(request)
+
+    def count(self, endpoint: str, key: str):
+        with self.stats_lock:
+            counters = self.stats.setdefault(endpoint, {
+                'requests': 0, 'retries': 0, 'rate_limited': 0, 'errors': 0
+            })
+            counters[key] += 1
+
+    def retry_delay(self, attempt: int, response: httpx.Response = None) -> float:
+        """Exponentielles Backoff mit Jitter; Retry-After hat Vorrang"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(delay / 2, delay)
+
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+        return delay
+
+    def handle_retry_response(self, endpoint: str, attempt: int, response: httpx.Response) -> float:
+        """Wartezeit vor dem nächsten Versuch; 429 sperrt stattdessen den Bucket"""
+        delay = self.retry_delay(attempt, response)
+
+        if response.status_code == 429:
+            # 429 gilt für die ganze Integration → Bucket sperren,
+            # damit alle Threads (inkl. diesem) beim acquire() warten
+            self.count(endpoint, 'rate_limited')
+            self.bucket.pause(delay)
+            return 0
+        return delay
+
+    def print_stats(self):
+        """Request-Zähler pro Endpoint ausgeben"""
+        if not self.stats:
+            return
+
+        total = sum(c['requests'] for c in self.stats.values())
+        print(f"📡 Notion API: {total} Requests")
+        for endpoint, counters in sorted(self.stats.items()):
+            print(f"   {endpoint}: {counters['requests']} Requests, "
+                  f"{counters['retries']} Retries, {counters['rate_limited']}× 429, "
+                  f"{counters['errors']} Fehler")
+
+
+class NotionTransport(TransportBase, httpx.BaseTransport):
+    """httpx-Transport mit Token-Bucket, Retries (429/5xx/Timeouts) und Zählern
+
+    Schreibende POST/PATCH werden nur bei 429 und Verbindungsfehlern
+    wiederholt (siehe is_retry_safe).
+
+    Ein Transport pro Notion-Token; alle Threads eines Clients teilen sich
+    den Bucket und den Keep-Alive Connection-Pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transport = httpx.HTTPTransport(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = self.endpoint_name(request)
+        attempt = 0
+
+        while True:
+            self.bucket.acquire()
+            self.count(endpoint, 'requests')
+
+            try:
+                response = self.transport.handle_request(request)
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                if attempt >= self.max_retries or not self.may_retry_error(request, e):
+                    self.count(endpoint, 'errors')
+                    raise
+                delay = self.retry_delay(attempt)
+            else:
+                if not self.may_retry_response(request, response):
+                    return response
+
+                if attempt >= self.max_retries:
+                    self.count(endpoint, 'errors')
+                    return response
+
+                response.close()
+                delay = self.handle_retry_response(endpoint, attempt, response)
+
+            self.count(endpoint, 'retries')
+            attempt += 1
+            if delay:
+                time.sleep(delay)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncNotionTransport(TransportBase, httpx.AsyncBaseTransport):
+    """Async-Variante von NotionTransport (für notion_client.AsyncClient)
+
+    Teilt sich bei Bedarf den Bucket mit dem Sync-Transport, damit beide
+    zusammen im Notion-Limit bleiben.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = self.endpoint_name(request)
+        attempt = 0
+
+        while True:
+            await self.bucket.acquire_async()
+            self.count(endpoint, 'requests')
+
+            try:
+                response = await self.transport.handle_async_request(request)
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                if attempt >= self.max_retries or not self.may_retry_error(request, e):
+                    self.count(endpoint, 'errors')
+                    raise
+                delay = self.retry_delay(attempt)
+            else:
+                if not self.may_retry_response(request, response):
+                    return response
+
+                if attempt >= self.max_retries:
+                    self.count(endpoint, 'errors')
+                    return response
+
+                await response.aclose()
+                delay = self.handle_retry_response(endpoint, attempt, response)
+
+            self.count(endpoint, 'retries')
+            attempt += 1
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def create_notion_client(auth: str, transport: NotionTransport = None) -> Client:
+    """notion_client.Client über den gemeinsamen Transport erstellen"""
+    transport = transport or NotionTransport()
+    return Client(
+        auth=auth,
+        base_url=NOTION_BASE_URL,
+        client=httpx.Client(transport=transport)
+    )
+
+
+def create_async_notion_client(auth: str, transport: AsyncNotionTransport = None) -> AsyncClient:
+    """notion_client.AsyncClient über einen Async-Transport erstellen"""
+    transport = transport or AsyncNotionTransport()
+    return AsyncClient(
+        auth=auth,
+        base_url=NOTION_BASE_URL,
+        client=httpx.AsyncClient(transport=transport)
+    )
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# page_meta_cache.py - Gemeinsamer Cache für Page-Metadaten (Existenz, archiviert, Parent, last_edited_time)
+
+import os
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from notion_client import APIErrorCode, APIResponseError
+
+DEFAULT_TTL_HOURS = float(os.getenv('NOTION_PAGE_META_TTL_HOURS', '6'))
+
+
+def parent_id_of(page: dict):
+    """page_id/database_id/block_id des Parents (Workspace-Root → None)"""
+    parent = page.get('parent', {})
+    parent_type = parent.get('type', '')
+    return parent.get(parent_type) if parent_type.endswith('_id') else None
+
+
+class PageMetadataCache:
+    """Metadaten pro Page-ID: Memo für den laufenden Prozess + `.notion_page_meta.json` mit TTL
+
+    Der Reverse-Sync fragt Existenz und Archiv-Status hier ab statt per
+    pages.retrieve (classify_update_type und find_existing_page teilen sich
+    einen Retrieve). Der Forward-Sync trägt jede gesehene Page ein - ein
+    neueres last_edited_time ersetzt den Cache-Eintrag sofort.
+    """
+
+    def __init__(self, obsidian_path: Path, ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.cache_file = Path(obsidian_path) / '.notion_page_meta.json'
+        self.ttl = timedelta(hours=ttl_hours)
+        # In diesem Lauf abgefragte/gesehene IDs sind ohne TTL gültig
+        self.memo = set()
+        self.dirty = False
+        self.stats = {'hits': 0, 'retrieved': 0}
+        self.load()
+
+    def load(self):
+        self.entries = {}
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden des Page-Metadaten-Caches: {e}")
+
+    def save(self):
+        """Cache speichern (abgelaufene Einträge fallen dabei weg)"""
+        if not self.dirty:
+            return
+        self.entries = {page_id: entry for page_id, entry in self.entries.items() if self.is_fresh(page_id)}
+        try:
+            tmp_file = self.cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2)
+            tmp_file.replace(self.cache_file)
+            self.dirty = False
+        except Exception as e:
+            print(f"⚠️ Fehler beim Speichern des Page-Metadaten-Caches: {e}")
+
+    def is_fresh(self, page_id: str) -> bool:
+        if page_id in self.memo:
+            return True
+        entry = self.entries.get(page_id)
+        if not entry:
+            return False
+        return datetime.now() - datetime.fromisoformat(entry['checked_at']) < self.ttl
+
+    def put(self, page_id: str, exists: bool, page: dict = None):
+        page = page or {}
+        self.entries[page_id] = {
+            'exists': exists,
+            'archived': bool(page.get('archived') or page.get('in_trash')),
+            'parent_id': parent_id_of(page),
+            'last_edited_time': page.get('last_edited_time'),
+            'checked_at': datetime.now().isoformat()
+        }
+        self.memo.add(page_id)
+        self.dirty = True
+        return self.entries[page_id]
+
+    def observe(self, pages):
+        """Vom Forward-Sync gesehene Pages eintragen - neuere last_edited_time ersetzt den Eintrag"""
+        for page in pages:
+            entry = self.entries.get(page['id'])
+            last_edited_time = page.get('last_edited_time') or ''
+            if entry and entry['exists'] and (entry.get('last_edited_time') or '') > last_edited_time:
+                continue
+            self.put(page['id'], True, page)
+
+    def get(self, page_id: str):
+        """Gültiger Cache-Eintrag oder None"""
+        if self.is_fresh(page_id):
+            self.stats['hits'] += 1
+            return self.entries[page_id]
+        return None
+
+    def retrieve(self, notion, page_id: str) -> dict:
+        """Metadaten aus dem Cache, sonst per pages.retrieve (nicht gefunden wird mitgecacht)
+
+        Andere Fehler (Rate-Limit, Netzwerk) werden nicht gecacht und weitergereicht.
+        """
+        entry = self.get(page_id)
+        if entry:
+            return entry
+
+        self.stats['retrieved'] += 1
+        try:
+            page = notion.pages.retrieve(page_id=page_id)
+        except APIResponseError as e:
+            if e.code == APIErrorCode.ObjectNotFound:
+                return self.put(page_id, False)
+            raise
+        return self.put(page_id, True, page)
+
+    def is_available(self, notion, page_id: str) -> bool:
+        """Page existiert und liegt nicht im Papierkorb"""
+        entry = self.retrieve(notion, page_id)
+        return entry['exists'] and not entry['archived']
+
+    def print_stats(self):
+        print(f"   🗃️ Page-Metadaten: {self.stats['hits']} aus dem Cache, {self.stats['retrieved']} abgefragt")
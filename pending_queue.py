@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# pending_queue.py - Persistente Warteschlange für den Reverse-Sync (Obsidian → Notion)
+
+import os
+import json
+from datetime import datetime
+from pathlib import Path
+import frontmatter
+
+DEFAULT_MAX_ATTEMPTS = int(os.getenv('NOTION_PENDING_MAX_ATTEMPTS', '5'))
+
+
+def is_pending(metadata: dict) -> bool:
+    """Frontmatter einer Datei, die zu Notion gesynct werden soll"""
+    return metadata.get('sync_status') == 'pending' or metadata.get('sync_direction') == 'to_notion'
+
+
+class PendingQueue:
+    """Append-only Journal `.notion_pending_queue.jsonl` mit einem Eintrag pro Vault-Pfad
+
+    Die Change Detection reiht ein, der Reverse-Sync arbeitet ab - pending
+    Arbeit zu finden kostet O(pending) statt eines Vault-Scans. Gleicher Pfad
+    wird nicht doppelt eingereiht. Fehlgeschlagene Einträge werden erneut
+    versucht und nach `max_attempts` Fehlversuchen geparkt, damit eine
+    kaputte Datei nicht jeden Lauf blockiert.
+    """
+
+    def __init__(self, obsidian_path: Path, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.obsidian_path = Path(obsidian_path)
+        self.journal_file = self.obsidian_path / '.notion_pending_queue.jsonl'
+        self.max_attempts = max_attempts
+        self.load()
+
+    def exists(self) -> bool:
+        return self.journal_file.exists()
+
+    def load(self):
+        """Journal abspielen → aktueller Stand pro Pfad"""
+        self.items = {}
+        self.journal_lines = 0
+        if not self.journal_file.exists():
+            return
+
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    self.apply(json.loads(line))
+                    self.journal_lines += 1
+                except Exception:
+                    # Abgebrochener Schreibvorgang (letzte Zeile unvollständig)
+                    print("⚠️ Ungültige Zeile im Pending-Journal übersprungen")
+
+    def apply(self, record: dict):
+        op = record['op']
+        path = record['path']
+
+        if op == 'add':
+            item = self.items.get(path)
+            if item and not item.get('parked'):
+                # Dedupe: bereits eingereiht, nur den Grund aktualisieren
+                item['reason'] = record.get('reason') or item.get('reason')
+            else:
+                # Neu - oder geparkt und inzwischen erneut geändert
+                self.items[path] = {'path': path, 'reason': record.get('reason'),
+                                    'enqueued_at': record['at'], 'attempts': 0, 'parked': False}
+        elif op == 'item':
+            self.items[path] = {key: value for key, value in record.items() if key != 'op'}
+        elif op == 'done':
+            self.items.pop(path, None)
+        elif op == 'fail' and path in self.items:
+            self.items[path].update(attempts=record['attempts'], last_error=record.get('error'),
+                                    parked=record['parked'])
+        elif op == 'requeue' and path in self.items:
+            self.items[path].update(attempts=0, parked=False)
+
+    def record(self, op: str, path: str, **fields):
+        """Eintrag anwenden und ans Journal anhängen"""
+        record = {'op': op, 'path': path, 'at': datetime.now().isoformat(), **fields}
+        self.apply(record)
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+        self.journal_lines += 1
+
+    def add(self, path: str, reason: str = None):
+        self.record('add', str(path), reason=reason)
+
+    def done(self, path: str):
+        if str(path) in self.items:
+            self.record('done', str(path))
+
+    def fail(self, path: str, error):
+        item = self.items.get(str(path))
+        if not item:
+            return
+        attempts = item.get('attempts', 0) + 1
+        parked = attempts >= self.max_attempts
+        self.record('fail', str(path), attempts=attempts, parked=parked, error=str(error)[:500])
+        if parked:
+            print(f"🅿️ Geparkt nach {attempts} Fehlversuchen: {path}")
+
+    def requeue_parked(self) -> int:
+        """Geparkte Einträge wieder freigeben (z.B. nach manueller Korrektur)"""
+        parked = self.parked()
+        for item in parked:
+            self.record('requeue', item['path'])
+        return len(parked)
+
+    def pending(self) -> list:
+        """Abzuarbeitende Einträge in Einreihungs-Reihenfolge"""
+        return sorted((item for item in self.items.values() if not item.get('parked')),
+                      key=lambda item: item['enqueued_at'])
+
+    def parked(self) -> list:
+        return [item for item in self.items.values() if item.get('parked')]
+
+    def compact(self):
+        """Journal auf den aktuellen Stand eindampfen, wenn es deutlich größer geworden ist"""
+        if self.journal_lines <= 2 * len(self.items) + 100:
+            return
+        tmp_file = self.journal_file.with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for item in self.items.values():
+                f.write(json.dumps({'op': 'item', **item}) + "\n")
+        tmp_file.replace(self.journal_file)
+        self.journal_lines = len(self.items)
+
+    def ensure_seeded(self):
+        """Einmaliger Vault-Scan, solange es noch kein Journal gibt (Migration)"""
+        if self.exists():
+            return
+        print("🔍 Pending-Queue anlegen: einmaliger Vault-Scan...")
+        self.journal_file.touch()
+        self.rescan()
+
+    def rescan(self) -> int:
+        """Vault nach pending Dateien durchsuchen und einreihen (z.B. extern erstellte Notes)"""
+        added = 0
+        for file_path in self.obsidian_path.glob("**/*.md"):
+            if 'archive' in str(file_path):
+                continue
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    post = frontmatter.load(f)
+            except Exception:
+                continue
+
+            relative_path = str(file_path.relative_to(self.obsidian_path))
+            if is_pending(post.metadata) and relative_path not in self.items:
+                self.add(relative_path, 'rescan')
+                added += 1
+        print(f"   📥 {added} Dateien eingereiht")
+        return added
+
+    def show_status(self):
+        """Queue-Status ausgeben"""
+        print("📬 Pending-Queue Status:")
+        print(f"   📍 Journal: {self.journal_file}")
+        print(f"   ⏳ Pending: {len(self.pending())}")
+        parked = self.parked()
+        print(f"   🅿️ Geparkt: {len(parked)}")
+        for item in parked:
+            print(f"      - {item['path']}: {item.get('last_error', '')}")
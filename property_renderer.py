@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# property_renderer.py - Notion Database-Properties → typisierte Frontmatter-Werte
+
+import re
+
+# Frontmatter-Felder, die der Sync selbst setzt - gleichnamige Properties bekommen ein Präfix
+RESERVED_KEYS = {
+    'notion_id', 'notion_type', 'title', 'created', 'updated', 'synced_at',
+    'sync_status', 'sync_direction', 'level', 'children_count', 'database_name',
+    'created_by', 'updated_at'
+}
+
+
+def plain_text(rich_text):
+    return ''.join(part.get('plain_text', '') for part in rich_text or [])
+
+
+def render_date(value):
+    """Datum als ISO-String, Zeiträume als [start, end]"""
+    if not value:
+        return None
+    if value.get('end'):
+        return [value.get('start'), value['end']]
+    return value.get('start')
+
+
+def render_user(user):
+    return user.get('name') or user.get('id')
+
+
+def render_file(file):
+    """Externe Links als URL - von Notion gehostete Dateien nur als Name (signierte URLs laufen nach 1h ab)"""
+    if file.get('type') == 'external':
+        return (file.get('external') or {}).get('url') or file.get('name')
+    return file.get('name')
+
+
+def render_formula(value):
+    formula = value.get('formula') or {}
+    formula_type = formula.get('type')
+    if formula_type == 'date':
+        return render_date(formula.get('date'))
+    return formula.get(formula_type)
+
+
+def render_unique_id(value):
+    unique_id = value.get('unique_id') or {}
+    if unique_id.get('number') is None:
+        return None
+    prefix = unique_id.get('prefix')
+    return f"{prefix}-{unique_id['number']}" if prefix else unique_id['number']
+
+
+def render_any(value):
+    """Dynamischer Fallback - nur für Rollup-Arrays, deren Elementtyp erst pro Zelle feststeht"""
+    value_type = value.get('type')
+    renderer = VALUE_RENDERERS.get(value_type)
+    return renderer(value) if renderer else None
+
+
+def render_rollup(value):
+    rollup = value.get('rollup') or {}
+    rollup_type = rollup.get('type')
+    if rollup_type == 'array':
+        return [item for item in (render_any(v) for v in rollup.get('array', [])) if item is not None]
+    if rollup_type == 'date':
+        return render_date(rollup.get('date'))
+    return rollup.get(rollup_type)
+
+
+# Property-Typ → Renderer für den Zellwert (ohne Relation, die braucht den Link-Resolver)
+VALUE_RENDERERS = {
+    'rich_text': lambda v: plain_text(v.get('rich_text')) or None,
+    'title': lambda v: plain_text(v.get('title')) or None,
+    'number': lambda v: v.get('number'),
+    'checkbox': lambda v: v.get('checkbox'),
+    'select': lambda v: (v.get('select') or {}).get('name'),
+    'status': lambda v: (v.get('status') or {}).get('name'),
+    'multi_select': lambda v: [option.get('name') for option in v.get('multi_select') or []],
+    'date': lambda v: render_date(v.get('date')),
+    'people': lambda v: [render_user(user) for user in v.get('people') or []],
+    'files': lambda v: [render_file(file) for file in v.get('files') or []],
+    'url': lambda v: v.get('url'),
+    'email': lambda v: v.get('email'),
+    'phone_number': lambda v: v.get('phone_number'),
+    'formula': render_formula,
+    'rollup': render_rollup,
+    'created_time': lambda v: v.get('created_time'),
+    'last_edited_time': lambda v: v.get('last_edited_time'),
+    'created_by': lambda v: render_user(v.get('created_by') or {}),
+    'last_edited_by': lambda v: render_user(v.get('last_edited_by') or {}),
+    'unique_id': render_unique_id,
+}
+
+
+class PropertyRenderer:
+    """Properties einer Database-Zeile als typisierte Frontmatter-Werte
+
+    Pro Schema (Property-Name, -ID und -Typ) wird einmal eine Liste
+    (frontmatter_key, property_name, renderer) kompiliert und gecacht -
+    alle Zeilen derselben Database nutzen sie ohne erneuten Typ-Dispatch.
+    """
+
+    def __init__(self, link_resolver=None):
+        # notion_id → Link-Text für Relations (z.B. [[Note]]), sonst bleibt die ID
+        self.link_resolver = link_resolver or (lambda notion_id: notion_id)
+        self.compiled = {}
+        self.stats = {'schemas': 0, 'rows': 0}
+
+    @staticmethod
+    def frontmatter_key(name: str) -> str:
+        key = re.sub(r'\W+', '_', name.strip().lower()).strip('_') or 'property'
+        return f"prop_{key}" if key in RESERVED_KEYS else key
+
+    def render_relation(self, value):
+        return [self.link_resolver(relation['id']) for relation in value.get('relation') or []]
+
+    def compile(self, schema_key):
+        """Renderer-Liste für ein Schema erstellen (einmal pro Database-Schema)"""
+        fields = []
+        used_keys = set()
+
+        for name, _, property_type in schema_key:
+            # Der Titel steht bereits als 'title' im Frontmatter
+            if property_type == 'title':
+                continue
+
+            if property_type == 'relation':
+                renderer = self.render_relation
+            else:
+                renderer = VALUE_RENDERERS.get(property_type)
+            if renderer is None:
+                continue
+
+            key = self.frontmatter_key(name)
+            suffix = 2
+            while key in used_keys:
+                key = f"{self.frontmatter_key(name)}_{suffix}"
+                suffix += 1
+            used_keys.add(key)
+
+            fields.append((key, name, renderer))
+
+        self.stats['schemas'] += 1
+        return fields
+
+    def render(self, properties: dict) -> dict:
+        """Alle Properties einer Zeile → {frontmatter_key: Wert}"""
+        schema_key = tuple((name, prop.get('id'), prop.get('type')) for name, prop in properties.items())
+
+        fields = self.compiled.get(schema_key)
+        if fields is None:
+            fields = self.compiled[schema_key] = self.compile(schema_key)
+
+        self.stats['rows'] += 1
+        return {key: renderer(properties[name]) for key, name, renderer in fields}
@@ -6,20 +6,35 @@ import json
 import requests
 from pathlib import Path
 from datetime import datetime
-from notion_client import Client
 import frontmatter
 import re
+from notion_client import APIErrorCode, APIResponseError
+from notion_transport import NotionTransport, create_notion_client
+from block_diff import BlockDiff
+from chunked_upload import ChunkedUploader, prepare_blocks
+from pending_queue import PendingQueue, is_pending
+from database_path_index import DatabasePathIndex
+from page_meta_cache import PageMetadataCache
 
 class ObsidianToNotion:
-    def __init__(self):
-        self.notion_token = os.getenv('NOTION_TOKEN')
-        self.obsidian_path = Path(os.getenv('OBSIDIAN_PATH', '/shared/obsidian'))
-        self.notion_database_id = os.getenv('NOTION_DATABASE_ID', '')
+    def __init__(self, notion_token=None, obsidian_path=None, notion_database_id=None, transport=None):
+        # Ohne Argumente aus der Umgebung (ein Workspace pro Prozess)
+        self.notion_token = notion_token or os.getenv('NOTION_TOKEN')
+        self.obsidian_path = Path(obsidian_path or os.getenv('OBSIDIAN_PATH', '/shared/obsidian'))
+        self.notion_database_id = notion_database_id or os.getenv('NOTION_DATABASE_ID', '')
         
         if not self.notion_token:
             raise ValueError("NOTION_TOKEN ist nicht gesetzt!")
         
-        self.notion = Client(auth=self.notion_token)
+        # Gemeinsamer Transport: Rate-Limit, Retries, Keep-Alive
+        self.transport = transport or NotionTransport()
+        self.notion = create_notion_client(self.notion_token, self.transport)
+        
+        # Große Notes: 100er-Chunks, fortsetzbar über das Upload-Journal
+        self.uploader = ChunkedUploader(self.notion, self.obsidian_path)
+        
+        # Reverse-Sync arbeitet die Queue der Change Detection ab (kein Vault-Scan)
+        self.queue = PendingQueue(self.obsidian_path)
         
         # Database-Setup ist optional - Fallback auf direkte Page-Updates
         self.database_available = False
@@ -34,6 +49,15 @@ class ObsidianToNotion:
         else:
             # Prüfe ob Database existiert
             self.database_available = self.verify_database_access()
+        
+        # Page-Metadaten (Existenz, archiviert, Parent) - geteilt mit dem Forward-Sync
+        self.page_meta = PageMetadataCache(self.obsidian_path)
+        
+        # _Parent.md Dateien nur einmal pro Lauf parsen: (Pfad, mtime) → notion_id
+        self.parent_file_memo = {}
+        
+        # Obsidian Path → Page-ID der Sync-Database (einmal pro Lauf geladen, persistiert)
+        self.path_index = DatabasePathIndex(self.notion, self.obsidian_path, self.notion_database_id)
     
     def create_or_find_database(self):
         """Notion Database für Obsidian-Sync erstellen oder finden"""
@@ -312,14 +336,16 @@ class ObsidianToNotion:
                 }
             }
             
-            # Page erstellen
-            new_page = self.notion.pages.create(
+            # Page erstellen (erster Chunk), Rest in 100er-Appends
+            page_id = self.uploader.create_page(
+                filepath,
                 parent={"database_id": self.notion_database_id},
                 properties=properties,
-                children=blocks
+                blocks=blocks
             )
+            self.path_index.register(filepath, page_id)
             
-            return new_page['id']
+            return page_id
         
         except Exception as e:
             print(f"❌ Fehler beim Erstellen der Notion Page: {e}")
@@ -346,22 +372,10 @@ class ObsidianToNotion:
             # Page Properties updaten
             self.notion.pages.update(page_id=page_id, properties=properties)
             
-            # Content aktualisieren (alle Blocks löschen und neu erstellen)
-            # Existierende Blocks holen
-            existing_blocks = self.notion.blocks.children.list(block_id=page_id)
-            
-            # Alle Blocks löschen
-            for block in existing_blocks['results']:
-                self.notion.blocks.delete(block_id=block['id'])
-            
-            # Neue Blocks hinzufügen
-            new_blocks = self.markdown_to_notion_blocks(content)
-            
-            if new_blocks:
-                self.notion.blocks.children.append(
-                    block_id=page_id,
-                    children=new_blocks
-                )
+            # Content aktualisieren: nur geänderte Blocks anfassen (Block-IDs bleiben erhalten)
+            existing_blocks = self.list_block_children(page_id)
+            new_blocks = prepare_blocks(self.markdown_to_notion_blocks(content))
+            self.apply_block_diff(page_id, BlockDiff(existing_blocks, new_blocks))
             
             return page_id
         
@@ -369,6 +383,65 @@ class ObsidianToNotion:
             print(f"❌ Fehler beim Aktualisieren der Notion Page: {e}")
             raise
     
+    @staticmethod
+    def is_page_gone(error) -> bool:
+        """API-Fehler, weil die Page gelöscht oder archiviert ist"""
+        if not isinstance(error, APIResponseError):
+            return False
+        return error.code == APIErrorCode.ObjectNotFound or 'archived' in str(error).lower()
+    
+    def update_database_entry(self, page_id: str, title: str, content: str, metadata: dict, filepath: str) -> str:
+        """Database Entry aus der Path-Map aktualisieren - archivierte Zeilen werden neu angelegt
+        
+        Der inkrementelle Reload der Map sieht archivierte/gelöschte Zeilen
+        nicht; deren Eintrag fliegt erst hier beim fehlgeschlagenen Update raus.
+        """
+        try:
+            return self.update_notion_page(page_id, title, content, metadata)
+        except Exception as e:
+            if not self.is_page_gone(e):
+                raise
+            print(f"🗑️ Database Entry {page_id[:8]}... gelöscht oder archiviert → lege neu an")
+            self.path_index.remove_page(page_id)
+            self.page_meta.put(page_id, False)
+            return self.create_notion_page(title, content, metadata, filepath)
+    
+    def list_block_children(self, block_id: str) -> list:
+        """Alle direkten Kinder eines Blocks (paginiert, nicht nur die ersten 100)"""
+        blocks = []
+        start_cursor = None
+        
+        while True:
+            kwargs = {'block_id': block_id, 'page_size': 100}
+            if start_cursor:
+                kwargs['start_cursor'] = start_cursor
+            
+            response = self.notion.blocks.children.list(**kwargs)
+            blocks.extend(response.get('results', []))
+            
+            if not response.get('has_more'):
+                return blocks
+            start_cursor = response.get('next_cursor')
+    
+    def apply_block_diff(self, page_id: str, diff: BlockDiff):
+        """Block-Diff an Notion senden: Inserts, Updates, dann Deletes"""
+        if diff.is_empty:
+            print(f"   ⏭️ Inhalt unverändert ({diff.unchanged} Blocks)")
+            return
+        
+        for after, blocks in diff.inserts:
+            self.uploader.append(page_id, blocks, after=after)
+        
+        for block_id, block in diff.updates:
+            block_type = block['type']
+            self.notion.blocks.update(block_id=block_id, **{block_type: block[block_type]})
+        
+        # Zuletzt löschen - bricht der Lauf ab, fehlt kein Inhalt
+        for block_id in diff.deletes:
+            self.notion.blocks.delete(block_id=block_id)
+        
+        print(f"   🧩 Block-Diff: {diff.summary()}")
+    
     def update_original_notion_page(self, page_id: str, title: str, content: str, metadata: dict):
         """🚨 DEAKTIVIERT: Direkte Updates zu gefährlich - Fallback zu Database Entry"""
         print(f"🚨 SICHERHEITSMODUS: Ursprüngliche Pages werden NICHT modifiziert!")
@@ -388,29 +461,20 @@ class ObsidianToNotion:
             # 1. Priorisiere: Original Notion Page via notion_id (aus Frontmatter)
             if notion_id:
                 try:
-                    # Prüfe ob die ursprüngliche Notion Page noch existiert
-                    original_page = self.notion.pages.retrieve(page_id=notion_id)
-                    if original_page:
+                    # Prüfe ob die ursprüngliche Notion Page noch existiert (Cache, sonst pages.retrieve)
+                    if self.page_meta.is_available(self.notion, notion_id):
                         print(f"🎯 Ursprüngliche Notion Page gefunden: {notion_id[:8]}...")
                         return notion_id, 'original_page'
+                    print(f"⚠️ Ursprüngliche Notion Page gelöscht oder archiviert: {notion_id[:8]}...")
                 except Exception as e:
                     print(f"⚠️ Ursprüngliche Notion Page nicht mehr verfügbar: {e}")
             
-            # 2. Fallback: Suche in Sync-Database nach Obsidian Path (nur wenn Database verfügbar)
+            # 2. Fallback: Obsidian Path in der vorgeladenen Database-Map (nur wenn Database verfügbar)
             if self.database_available:
                 try:
-                    query_result = self.notion.databases.query(
-                        database_id=self.notion_database_id,
-                        filter={
-                            "property": "Obsidian Path",
-                            "rich_text": {
-                                "equals": filepath
-                            }
-                        }
-                    )
+                    database_page_id = self.path_index.lookup(filepath)
                     
-                    if query_result['results']:
-                        database_page_id = query_result['results'][0]['id']
+                    if database_page_id:
                         print(f"📊 Database Entry gefunden: {database_page_id[:8]}...")
                         return database_page_id, 'database_entry'
                         
@@ -440,8 +504,9 @@ class ObsidianToNotion:
         # 3. Fallback: Prüfe ob die Page in Notion noch existiert
         if notion_id:
             try:
-                self.notion.pages.retrieve(page_id=notion_id)
-                return 'existing_page_update'
+                if self.page_meta.is_available(self.notion, notion_id):
+                    return 'existing_page_update'
+                return 'new_page_creation'
             except:
                 # Notion Page existiert nicht mehr → Als neue Page behandeln
                 return 'new_page_creation'
@@ -469,16 +534,20 @@ class ObsidianToNotion:
             # Parent-Ordner ermitteln
             parent_folder = relevant_parts[-2]  # Letzter Ordner vor der Datei
             
-            # Suche nach _ParentName.md im Parent-Ordner
-            parent_path = Path(filepath).parent
+            # Suche nach _ParentName.md im Parent-Ordner (filepath ist relativ zum Vault, nicht zum CWD)
+            parent_path = (self.obsidian_path / filepath).parent
             expected_parent_file = parent_path / f"_{parent_folder}.md"
             
             if expected_parent_file.exists():
                 try:
-                    with open(expected_parent_file, 'r', encoding='utf-8') as f:
-                        parent_post = frontmatter.load(f)
+                    # Geschwister-Dateien teilen sich die Parent-Datei → nur einmal parsen
+                    memo_key = (str(expected_parent_file), expected_parent_file.stat().st_mtime_ns)
+                    if memo_key not in self.parent_file_memo:
+                        with open(expected_parent_file, 'r', encoding='utf-8') as f:
+                            parent_post = frontmatter.load(f)
+                        self.parent_file_memo[memo_key] = parent_post.metadata.get('notion_id')
                     
-                    parent_notion_id = parent_post.metadata.get('notion_id')
+                    parent_notion_id = self.parent_file_memo[memo_key]
                     if parent_notion_id:
                         print(f"🎯 Parent gefunden: {parent_folder} ({parent_notion_id[:8]}...)")
                         return parent_notion_id, parent_folder
@@ -506,14 +575,13 @@ class ObsidianToNotion:
                 "title": [{"type": "text", "text": {"content": title}}]
             }
             
-            # Page als echte Unterseite erstellen
-            new_page = self.notion.pages.create(
+            # Page als echte Unterseite erstellen (erster Chunk), Rest in 100er-Appends
+            new_page_id = self.uploader.create_page(
+                filepath,
                 parent={"page_id": parent_id},
                 properties={"title": {"title": properties["title"]}},
-                children=blocks
+                blocks=blocks
             )
-            
-            new_page_id = new_page['id']
             print(f"✅ Echte Unterseite erstellt: {title} ({new_page_id[:8]}...)")
             
             return new_page_id
@@ -526,31 +594,7 @@ class ObsidianToNotion:
         """Alle pending Obsidian-Dateien zu Notion syncen"""
         print("🚀 Starte Obsidian → Notion Sync...")
         
-        # Alle Dateien mit sync_status = pending finden
-        pending_files = []
-        
-        for file_path in self.obsidian_path.glob("**/*.md"):
-            if 'archive' in str(file_path):
-                continue
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    post = frontmatter.load(f)
-                
-                # Nur Dateien mit pending status oder Claude-erstellte Dateien
-                if (post.metadata.get('sync_status') == 'pending' or 
-                    post.metadata.get('sync_direction') == 'to_notion'):
-                    
-                    relative_path = file_path.relative_to(self.obsidian_path)
-                    pending_files.append({
-                        'filepath': str(relative_path),
-                        'full_path': file_path,
-                        'post': post
-                    })
-            
-            except Exception as e:
-                print(f"⚠️ Fehler beim Lesen von {file_path}: {e}")
-                continue
+        pending_files = self.collect_pending_files()
         
         print(f"📄 {len(pending_files)} Dateien zum Syncen gefunden")
         
@@ -584,7 +628,7 @@ class ObsidianToNotion:
                         continue
                     elif existing_page_id and page_type == 'database_entry':
                         # Update Database Entry (SICHER)
-                        self.update_notion_page(existing_page_id, title, content, metadata)
+                        self.update_database_entry(existing_page_id, title, content, metadata, filepath)
                         print(f"✅ Database Entry Updated (SICHER): {title}")
                     else:
                         print(f"⚠️ Existierende Page nicht gefunden für {title}")
@@ -638,10 +682,49 @@ class ObsidianToNotion:
                 
             except Exception as e:
                 print(f"❌ Fehler bei {filepath}: {e}")
+                self.queue.fail(filepath, e)
                 continue
         
+        self.queue.compact()
+        self.path_index.save()
+        self.page_meta.save()
         print(f"🎉 Reverse-Sync abgeschlossen! {synced_count} Dateien zu Notion gesynct.")
     
+    def collect_pending_files(self) -> list:
+        """Pending Dateien aus der Queue laden - O(pending) statt Vault-Scan"""
+        self.queue.ensure_seeded()
+        pending_files = []
+        
+        for item in self.queue.pending():
+            filepath = item['path']
+            file_path = self.obsidian_path / filepath
+            
+            if not file_path.exists():
+                print(f"🗑️ Nicht mehr vorhanden, aus Queue entfernt: {filepath}")
+                self.queue.done(filepath)
+                continue
+            
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    post = frontmatter.load(f)
+            except Exception as e:
+                print(f"⚠️ Fehler beim Lesen von {file_path}: {e}")
+                self.queue.fail(filepath, e)
+                continue
+            
+            # Inzwischen anderweitig gesynct (z.B. Lauf nach mark_file_synced abgebrochen)
+            if not is_pending(post.metadata):
+                self.queue.done(filepath)
+                continue
+            
+            pending_files.append({
+                'filepath': filepath,
+                'full_path': file_path,
+                'post': post
+            })
+        
+        return pending_files
+    
     def mark_file_synced(self, file_path: Path, post: frontmatter.Post):
         """Obsidian-Datei als gesynct markieren"""
         post.metadata['sync_status'] = 'synced'
@@ -650,12 +733,16 @@ class ObsidianToNotion:
         # Speichere aktualisierte Metadaten (z.B. neue notion_id)
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(frontmatter.dumps(post))
+        
+        self.queue.done(file_path.relative_to(self.obsidian_path))
 
 def main():
     """Main function für Reverse Sync"""
     try:
         syncer = ObsidianToNotion()
         syncer.sync_pending_files()
+        syncer.page_meta.print_stats()
+        syncer.transport.print_stats()
         
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         print(f"⏰ Letzter Reverse-Sync: {timestamp}")
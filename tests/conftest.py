@@ -0,0 +1,5 @@
+# conftest.py - Module liegen flach im Repo-Root
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,151 @@
+# test_attachment_store.py - Download-Stage gegen einen lokalen HTTP-Dateiserver
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from attachment_store import AttachmentStore
+
+
+class FileServer:
+    """Liefert self.files[Pfad] aus (unbekannte Pfade → 403 wie eine abgelaufene S3-URL)"""
+
+    def __init__(self):
+        self.files = {}
+        self.hits = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                server.hits[path] = server.hits.get(path, 0) + 1
+                body = server.files.get(path)
+                if body is None:
+                    self.send_response(403)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = FileServer()
+    yield server
+    server.close()
+
+
+def image_block(block_id, url, last_edited_time='2026-01-01T00:00:00.000Z', expiry_time=None):
+    file = {'url': url}
+    if expiry_time:
+        file['expiry_time'] = expiry_time
+    return {'id': block_id, 'type': 'image', 'last_edited_time': last_edited_time,
+            'image': {'type': 'file', 'file': file, 'caption': []}}
+
+
+def stored_files(tmp_path):
+    return sorted(path.name for path in (tmp_path / 'attachments').iterdir())
+
+
+def test_download_streams_into_content_addressed_path(tmp_path, server):
+    content = b'\x89PNG' + b'x' * 200_000
+    server.files['/bild.png'] = content
+
+    path = AttachmentStore(tmp_path).ensure(image_block('b1', f"{server.url}/bild.png?X-Amz-Signature=abc"))
+
+    assert path == f"attachments/{hashlib.sha256(content).hexdigest()}.png"
+    assert (tmp_path / path).read_bytes() == content
+
+
+def test_identical_content_is_stored_once(tmp_path, server):
+    server.files['/a.png'] = server.files['/kopie.png'] = b'gleiche bytes'
+    store = AttachmentStore(tmp_path)
+
+    first = store.ensure(image_block('b1', f"{server.url}/a.png"))
+    second = store.ensure(image_block('b2', f"{server.url}/kopie.png"))
+
+    assert first == second
+    assert len(stored_files(tmp_path)) == 1
+    assert store.stats['downloaded'] == 1
+    assert store.stats['deduplicated'] == 1
+
+
+def test_unchanged_block_is_skipped_via_manifest(tmp_path, server):
+    server.files['/a.png'] = b'inhalt'
+    store = AttachmentStore(tmp_path)
+    store.ensure(image_block('b1', f"{server.url}/a.png"))
+    store.save()
+
+    store = AttachmentStore(tmp_path)
+    path = store.ensure(image_block('b1', f"{server.url}/a.png"))
+
+    assert (tmp_path / path).exists()
+    assert server.hits['/a.png'] == 1
+    assert store.stats['unchanged'] == 1
+
+
+def test_changed_block_is_downloaded_again(tmp_path, server):
+    server.files['/a.png'] = b'version 1'
+    store = AttachmentStore(tmp_path)
+    old_path = store.ensure(image_block('b1', f"{server.url}/a.png"))
+
+    server.files['/a.png'] = b'version 2'
+    new_path = store.ensure(image_block('b1', f"{server.url}/a.png", last_edited_time='2026-02-01T00:00:00.000Z'))
+
+    assert new_path != old_path
+    assert (tmp_path / new_path).read_bytes() == b'version 2'
+    assert server.hits['/a.png'] == 2
+
+
+def test_oversized_download_leaves_no_partial_file(tmp_path, server):
+    server.files['/gross.bin'] = b'z' * 300_000
+    store = AttachmentStore(tmp_path, max_bytes=100_000)
+
+    assert store.ensure(image_block('b1', f"{server.url}/gross.bin")) is None
+    assert stored_files(tmp_path) == []
+    assert store.stats['failed'] == 1
+    assert 'b1' not in store.manifest
+
+
+def test_expired_url_from_cached_tree_is_refreshed(tmp_path, server):
+    server.files['/neu.png'] = b'frisch'
+    fresh = image_block('b1', f"{server.url}/neu.png")
+    store = AttachmentStore(tmp_path, refresh_block=lambda block_id: fresh)
+
+    stale = image_block('b1', f"{server.url}/alt.png", expiry_time='2020-01-01T00:00:00.000Z')
+    path = store.ensure(stale)
+
+    assert (tmp_path / path).read_bytes() == b'frisch'
+    assert '/alt.png' not in server.hits
+
+
+def test_failed_download_retries_once_with_fresh_url(tmp_path, server):
+    server.files['/neu.png'] = b'frisch'
+    refreshed = []
+
+    def refresh_block(block_id):
+        refreshed.append(block_id)
+        return image_block(block_id, f"{server.url}/neu.png")
+
+    store = AttachmentStore(tmp_path, refresh_block=refresh_block)
+    path = store.ensure(image_block('b1', f"{server.url}/abgelaufen.png"))
+
+    assert (tmp_path / path).read_bytes() == b'frisch'
+    assert refreshed == ['b1']
+    assert server.hits['/abgelaufen.png'] == 1
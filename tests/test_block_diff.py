@@ -0,0 +1,102 @@
+# test_block_diff.py - Minimaler Block-Diff und Anker für Einfügungen am Seitenanfang
+from block_diff import BlockDiff, block_signature
+
+
+def block(block_type, text, block_id=None, **fields):
+    result = {'type': block_type, block_type: {'rich_text': [{'type': 'text', 'text': {'content': text}}], **fields}}
+    if block_id:
+        result['id'] = block_id
+    return result
+
+
+def para(text, block_id=None):
+    return block('paragraph', text, block_id)
+
+
+def test_identical_blocks_are_untouched():
+    diff = BlockDiff([para('a', 'A'), para('b', 'B')], [para('a'), para('b')])
+
+    assert diff.is_empty
+    assert diff.unchanged == 2
+
+
+def test_signature_ignores_split_rich_text():
+    split = {'type': 'paragraph', 'paragraph': {'rich_text': [
+        {'type': 'text', 'text': {'content': 'foo '}, 'plain_text': 'foo '},
+        {'type': 'text', 'text': {'content': 'bar'}, 'plain_text': 'bar'},
+    ]}}
+
+    assert block_signature(split) == block_signature(para('foo bar'))
+
+
+def test_changed_block_of_same_type_is_updated():
+    diff = BlockDiff([para('a', 'A'), para('b', 'B'), para('c', 'C')],
+                     [para('a'), para('b2'), para('c')])
+
+    assert [block_id for block_id, _ in diff.updates] == ['B']
+    assert not diff.inserts and not diff.deletes
+
+
+def test_insert_goes_after_its_predecessor():
+    diff = BlockDiff([para('a', 'A'), para('c', 'C')], [para('a'), para('b'), para('c')])
+
+    assert len(diff.inserts) == 1
+    after, blocks = diff.inserts[0]
+    assert after == 'A'
+    assert blocks[0]['paragraph']['rich_text'][0]['text']['content'] == 'b'
+
+
+def test_removed_block_is_deleted():
+    diff = BlockDiff([para('a', 'A'), para('b', 'B'), para('c', 'C')], [para('a'), para('c')])
+
+    assert diff.deletes == ['B']
+    assert diff.unchanged == 2
+
+
+def test_child_pages_are_never_deleted():
+    child_page = {'id': 'P', 'type': 'child_page', 'child_page': {'title': 'Sub'}}
+
+    diff = BlockDiff([para('a', 'A'), child_page], [para('a')])
+
+    assert diff.is_empty
+
+
+def test_type_change_is_delete_and_insert():
+    diff = BlockDiff([para('a', 'A'), para('b', 'B')], [para('a'), block('heading_2', 'b')])
+
+    assert diff.deletes == ['B']
+    assert diff.inserts[0][0] == 'A'
+
+
+def test_leading_insert_reuses_deleted_block_of_same_type():
+    # 'x' fällt weg, 'new' steht vorne - 'x' wird zu 'new' umgeschrieben statt vor 'a' einzufügen
+    diff = BlockDiff([para('x', 'X'), para('a', 'A')], [para('new'), para('a')])
+
+    assert [block_id for block_id, _ in diff.updates] == ['X']
+    assert not diff.inserts and not diff.deletes
+
+
+def test_leading_insert_rewrites_first_kept_block():
+    # Kein Block vor 'a' - Notion kann nicht davor einfügen, also wird 'a' zum Anker umgeschrieben
+    diff = BlockDiff([para('a', 'A'), para('b', 'B')], [para('new'), para('a'), para('b')])
+
+    assert diff.updates[0][0] == 'A'
+    assert diff.inserts == [('A', [para('a')])]
+    assert all(after is not None for after, _ in diff.inserts)
+
+
+def test_leading_insert_of_other_type_rewrites_page():
+    diff = BlockDiff([para('a', 'A')], [block('heading_1', 'Title'), para('a')])
+
+    assert diff.deletes == ['A']
+    assert diff.inserts == [(None, [block('heading_1', 'Title'), para('a')])]
+
+
+def test_no_inserts_before_first_block_unless_page_is_rewritten():
+    existing = [para(text, text.upper()) for text in 'abcde']
+    new = [para('z'), para('y')] + [para(text) for text in 'abde']
+
+    diff = BlockDiff(existing, new)
+
+    for after, _ in diff.inserts:
+        assert after is not None
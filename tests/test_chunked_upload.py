@@ -0,0 +1,126 @@
+# test_chunked_upload.py - Text-Splitting, Chunk-Grenzen und fortsetzbare Uploads
+from types import SimpleNamespace
+
+import pytest
+
+from chunked_upload import (MAX_CHILDREN_PER_REQUEST, ChunkedUploader, chunked, prepare_blocks,
+                            split_rich_text, split_text)
+
+
+def para(text):
+    return {'type': 'paragraph', 'paragraph': {'rich_text': [{'type': 'text', 'text': {'content': text}}]}}
+
+
+class FakeNotion:
+    """pages.create / pages.update / blocks.children.append mit Protokoll"""
+
+    def __init__(self):
+        self.calls = []
+        self.children = {}
+        self.fail_appends_after = None
+        self.pages = SimpleNamespace(create=self.create_page, update=self.update_page)
+        self.blocks = SimpleNamespace(children=SimpleNamespace(append=self.append))
+
+    def create_page(self, parent, properties, children):
+        page_id = f"page-{len(self.children) + 1}"
+        self.calls.append(('create', parent, len(children)))
+        self.children[page_id] = list(children)
+        return {'id': page_id}
+
+    def update_page(self, page_id, **kwargs):
+        self.calls.append(('update', page_id, kwargs))
+        return {'id': page_id}
+
+    def append(self, block_id, children, after=None):
+        appends = sum(1 for call in self.calls if call[0] == 'append')
+        if self.fail_appends_after is not None and appends >= self.fail_appends_after:
+            raise RuntimeError('502 Bad Gateway')
+        self.calls.append(('append', block_id, len(children)))
+        self.children[block_id].extend(children)
+        return {'results': [{'id': f"{block_id}-{len(self.children[block_id])}"}]}
+
+
+def test_split_text_prefers_newlines():
+    text = 'a' * 8 + '\n' + 'b' * 8
+
+    assert split_text(text, limit=12) == ['a' * 8 + '\n', 'b' * 8]
+
+
+def test_split_text_falls_back_to_spaces_then_hard_cut():
+    assert split_text('aaaa bbbb cccc', limit=10) == ['aaaa bbbb ', 'cccc']
+    assert split_text('x' * 25, limit=10) == ['x' * 10, 'x' * 10, 'x' * 5]
+
+
+@pytest.mark.parametrize('text', ['', 'kurz', 'z' * 2000, ('Zeile mit Text\n' * 400), 'w ' * 3000])
+def test_split_text_round_trips_within_limit(text):
+    pieces = split_text(text)
+
+    assert ''.join(pieces) == text
+    assert all(len(piece) <= 2000 for piece in pieces)
+
+
+def test_split_rich_text_keeps_annotations_and_links():
+    part = {'type': 'text', 'text': {'content': 'y' * 4500, 'link': {'url': 'https://example.com'}},
+            'annotations': {'bold': True}}
+
+    pieces = split_rich_text([part])
+
+    assert [len(piece['text']['content']) for piece in pieces] == [2000, 2000, 500]
+    assert all(piece['annotations'] == {'bold': True} for piece in pieces)
+    assert all(piece['text']['link'] == {'url': 'https://example.com'} for piece in pieces)
+
+
+def test_prepare_blocks_does_not_modify_input():
+    blocks = [para('q' * 2500)]
+
+    prepared = prepare_blocks(blocks)
+
+    assert len(blocks[0]['paragraph']['rich_text']) == 1
+    assert len(prepared[0]['paragraph']['rich_text']) == 2
+
+
+@pytest.mark.parametrize('count, sizes', [(0, []), (100, [100]), (101, [100, 1]), (250, [100, 100, 50])])
+def test_chunk_boundaries(count, sizes):
+    assert [len(chunk) for chunk in chunked(list(range(count)))] == sizes
+
+
+def test_create_page_sends_first_chunk_then_appends(tmp_path):
+    notion = FakeNotion()
+    blocks = [para(str(i)) for i in range(250)]
+
+    page_id = ChunkedUploader(notion, tmp_path).create_page('a.md', {'database_id': 'db'}, {}, blocks)
+
+    assert [call[2] for call in notion.calls] == [MAX_CHILDREN_PER_REQUEST, 100, 50]
+    assert len(notion.children[page_id]) == 250
+
+
+def test_interrupted_upload_resumes(tmp_path):
+    notion = FakeNotion()
+    blocks = [para(str(i)) for i in range(250)]
+    notion.fail_appends_after = 1
+
+    with pytest.raises(RuntimeError):
+        ChunkedUploader(notion, tmp_path).create_page('a.md', {'database_id': 'db'}, {}, blocks)
+
+    notion.fail_appends_after = None
+    page_id = ChunkedUploader(notion, tmp_path).create_page('a.md', {'database_id': 'db'}, {}, blocks)
+
+    assert [call[0] for call in notion.calls] == ['create', 'append', 'append']
+    assert len(notion.children[page_id]) == 250
+    assert ChunkedUploader(notion, tmp_path).journal == {}
+
+
+def test_parent_change_discards_partial_upload(tmp_path):
+    notion = FakeNotion()
+    blocks = [para(str(i)) for i in range(150)]
+    notion.fail_appends_after = 0
+
+    with pytest.raises(RuntimeError):
+        ChunkedUploader(notion, tmp_path).create_page('a.md', {'page_id': 'parent'}, {}, blocks)
+
+    notion.fail_appends_after = None
+    page_id = ChunkedUploader(notion, tmp_path).create_page('a.md', {'database_id': 'db'}, {}, blocks)
+
+    assert ('update', 'page-1', {'archived': True}) in notion.calls
+    assert page_id == 'page-2'
+    assert len(notion.children['page-2']) == 150
@@ -0,0 +1,139 @@
+# test_notion_transport.py - Retry-Verhalten gegen einen lokalen Fake-Server
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from notion_transport import NotionTransport
+
+
+class FakeNotionServer:
+    """HTTP-Server, der pro Pfad eine Liste von (Status, Verzögerung) abspielt"""
+
+    def __init__(self):
+        self.script = {}
+        self.hits = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def handle_request(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self.rfile.read(length)
+                key = f"{self.command} {self.path}"
+                server.hits[key] = server.hits.get(key, 0) + 1
+                steps = server.script.get(key) or [(200, 0)]
+                status, delay = steps.pop(0) if len(steps) > 1 else steps[0]
+                time.sleep(delay)
+                body = b'{"object": "error"}' if status >= 400 else b'{"object": "page"}'
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    if status == 429:
+                        self.send_header('Retry-After', '0')
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            do_GET = do_POST = do_PATCH = do_DELETE = handle_request
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = FakeNotionServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def transport():
+    transport = NotionTransport(rate=1000, max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    yield transport
+    transport.close()
+
+
+def client(server, transport, timeout=5.0):
+    return httpx.Client(base_url=server.url, transport=transport, timeout=timeout)
+
+
+def test_get_retries_5xx_until_success(server, transport):
+    server.script['GET /v1/pages/abc'] = [(502, 0), (503, 0), (200, 0)]
+
+    response = client(server, transport).get('/v1/pages/abc')
+
+    assert response.status_code == 200
+    assert server.hits['GET /v1/pages/abc'] == 3
+    assert transport.stats['GET pages/abc']['retries'] == 2
+
+
+def test_gives_up_after_max_retries(server, transport):
+    server.script['GET /v1/pages/abc'] = [(500, 0)]
+
+    response = client(server, transport).get('/v1/pages/abc')
+
+    assert response.status_code == 500
+    assert server.hits['GET /v1/pages/abc'] == transport.max_retries + 1
+    assert transport.stats['GET pages/abc']['errors'] == 1
+
+
+def test_write_retried_on_429(server, transport):
+    server.script['POST /v1/pages'] = [(429, 0), (200, 0)]
+
+    response = client(server, transport).post('/v1/pages', json={})
+
+    assert response.status_code == 200
+    assert server.hits['POST /v1/pages'] == 2
+    assert transport.stats['POST pages']['rate_limited'] == 1
+
+
+def test_write_not_retried_on_5xx(server, transport):
+    server.script['PATCH /v1/blocks/abc/children'] = [(502, 0), (200, 0)]
+
+    response = client(server, transport).patch('/v1/blocks/abc/children', json={})
+
+    assert response.status_code == 502
+    assert server.hits['PATCH /v1/blocks/abc/children'] == 1
+
+
+def test_write_not_resent_after_timeout(server, transport):
+    # Der Server hat den Request erhalten - ein Retry würde die Page doppelt anlegen
+    server.script['POST /v1/pages'] = [(200, 0.5), (200, 0)]
+
+    with pytest.raises(httpx.ReadTimeout):
+        client(server, transport, timeout=0.2).post('/v1/pages', json={})
+
+    time.sleep(0.4)
+    assert server.hits['POST /v1/pages'] == 1
+    assert transport.stats['POST pages']['errors'] == 1
+
+
+@pytest.mark.parametrize('path', ['/v1/search', '/v1/databases/abc/query'])
+def test_read_only_post_retried_after_timeout(server, transport, path):
+    server.script[f'POST {path}'] = [(200, 0.5), (200, 0)]
+
+    response = client(server, transport, timeout=0.2).post(path, json={})
+
+    assert response.status_code == 200
+    assert server.hits[f'POST {path}'] == 2
+
+
+def test_write_retried_after_connect_error(transport):
+    # Port ohne Server: die Verbindung kommt nie zustande, Retry ist gefahrlos
+    with pytest.raises(httpx.ConnectError):
+        httpx.Client(base_url='http://127.0.0.1:9', transport=transport).post('/v1/pages', json={})
+
+    assert transport.stats['POST pages']['requests'] == transport.max_retries + 1
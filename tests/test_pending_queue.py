@@ -0,0 +1,102 @@
+# test_pending_queue.py - Journal-Replay, Dedupe, Parken und Compaction
+import json
+
+from pending_queue import PendingQueue
+
+
+def journal_records(queue):
+    with open(queue.journal_file, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_replay_restores_state(tmp_path):
+    queue = PendingQueue(tmp_path)
+    queue.add('a.md', 'created')
+    queue.add('b.md', 'modified')
+    queue.add('c.md', 'modified')
+    queue.done('b.md')
+    queue.fail('c.md', 'boom')
+
+    replayed = PendingQueue(tmp_path)
+
+    assert [item['path'] for item in replayed.pending()] == ['a.md', 'c.md']
+    assert replayed.items['c.md']['attempts'] == 1
+    assert replayed.items['c.md']['last_error'] == 'boom'
+
+
+def test_same_path_is_not_queued_twice(tmp_path):
+    queue = PendingQueue(tmp_path)
+    queue.add('a.md', 'created')
+    queue.add('a.md', 'modified')
+
+    assert len(queue.pending()) == 1
+    assert queue.pending()[0]['reason'] == 'modified'
+
+
+def test_failed_item_is_parked_and_requeued(tmp_path):
+    queue = PendingQueue(tmp_path, max_attempts=2)
+    queue.add('a.md')
+    queue.fail('a.md', 'eins')
+    queue.fail('a.md', 'zwei')
+
+    assert queue.pending() == []
+    assert [item['path'] for item in PendingQueue(tmp_path, max_attempts=2).parked()] == ['a.md']
+
+    assert queue.requeue_parked() == 1
+    assert queue.pending()[0]['attempts'] == 0
+
+
+def test_new_change_unparks_item(tmp_path):
+    queue = PendingQueue(tmp_path, max_attempts=1)
+    queue.add('a.md')
+    queue.fail('a.md', 'kaputt')
+    queue.add('a.md', 'modified')
+
+    assert [item['path'] for item in queue.pending()] == ['a.md']
+
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    queue = PendingQueue(tmp_path)
+    queue.add('a.md')
+    with open(queue.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "pa')
+
+    assert [item['path'] for item in PendingQueue(tmp_path).pending()] == ['a.md']
+
+
+def test_compact_rewrites_journal_to_current_state(tmp_path):
+    queue = PendingQueue(tmp_path)
+    for i in range(150):
+        queue.add(f"{i}.md")
+        if i % 3:
+            queue.done(f"{i}.md")
+    before = {path: dict(item) for path, item in queue.items.items()}
+
+    queue.compact()
+
+    records = journal_records(queue)
+    assert len(records) == len(before) == 50
+    assert all(record['op'] == 'item' for record in records)
+    assert PendingQueue(tmp_path).items == before
+
+
+def test_compact_skips_small_journal(tmp_path):
+    queue = PendingQueue(tmp_path)
+    queue.add('a.md')
+    queue.done('a.md')
+
+    queue.compact()
+
+    assert len(journal_records(queue)) == 2
+
+
+def test_seed_scans_vault_once(tmp_path):
+    (tmp_path / 'neu.md').write_text('---\nsync_status: pending\n---\nText\n', encoding='utf-8')
+    (tmp_path / 'fertig.md').write_text('---\nsync_status: synced\n---\nText\n', encoding='utf-8')
+
+    queue = PendingQueue(tmp_path)
+    queue.ensure_seeded()
+    (tmp_path / 'spaeter.md').write_text('---\nsync_status: pending\n---\nText\n', encoding='utf-8')
+    queue.ensure_seeded()
+
+    assert [item['path'] for item in queue.pending()] == ['neu.md']
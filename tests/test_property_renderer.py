@@ -0,0 +1,71 @@
+# test_property_renderer.py - Database-Properties → Frontmatter
+from property_renderer import PropertyRenderer, render_file
+
+
+def rich_text(text):
+    return [{'type': 'text', 'plain_text': text, 'text': {'content': text}}]
+
+
+ROW = {
+    'Name': {'id': 'title', 'type': 'title', 'title': rich_text('Zeile')},
+    'Status': {'id': 's1', 'type': 'status', 'status': {'name': 'Done'}},
+    'Tags': {'id': 't1', 'type': 'multi_select', 'multi_select': [{'name': 'a'}, {'name': 'b'}]},
+    'Zeitraum': {'id': 'd1', 'type': 'date', 'date': {'start': '2026-01-01', 'end': '2026-01-05'}},
+    'Anzahl': {'id': 'n1', 'type': 'number', 'number': 3},
+    'Notiz': {'id': 'r1', 'type': 'rich_text', 'rich_text': []},
+    'Projekt': {'id': 'rel', 'type': 'relation', 'relation': [{'id': 'abc'}]},
+    'Ticket': {'id': 'u1', 'type': 'unique_id', 'unique_id': {'prefix': 'OPS', 'number': 7}},
+    'Title': {'id': 'x1', 'type': 'rich_text', 'rich_text': rich_text('kollidiert')},
+}
+
+
+def test_render_typed_values():
+    values = PropertyRenderer(link_resolver=lambda notion_id: f"[[{notion_id}]]").render(ROW)
+
+    assert values == {
+        'status': 'Done',
+        'tags': ['a', 'b'],
+        'zeitraum': ['2026-01-01', '2026-01-05'],
+        'anzahl': 3,
+        'notiz': None,
+        'projekt': ['[[abc]]'],
+        'ticket': 'OPS-7',
+        'prop_title': 'kollidiert',
+    }
+
+
+def test_schema_is_compiled_once_per_database():
+    renderer = PropertyRenderer()
+    renderer.render(ROW)
+    renderer.render(dict(ROW, Anzahl={'id': 'n1', 'type': 'number', 'number': 4}))
+
+    assert renderer.stats == {'schemas': 1, 'rows': 2}
+
+
+def test_duplicate_keys_get_suffix():
+    values = PropertyRenderer().render({
+        'Due Date': {'id': 'a', 'type': 'number', 'number': 1},
+        'due-date': {'id': 'b', 'type': 'number', 'number': 2},
+    })
+
+    assert values == {'due_date': 1, 'due_date_2': 2}
+
+
+def test_formula_and_rollup():
+    values = PropertyRenderer().render({
+        'F': {'id': 'f', 'type': 'formula', 'formula': {'type': 'date', 'date': {'start': '2026-02-02'}}},
+        'R': {'id': 'r', 'type': 'rollup', 'rollup': {'type': 'array', 'array': [
+            {'type': 'number', 'number': 1}, {'type': 'unknown'}, {'type': 'select', 'select': {'name': 'x'}}
+        ]}},
+    })
+
+    assert values == {'f': '2026-02-02', 'r': [1, 'x']}
+
+
+def test_hosted_files_render_as_name_not_signed_url():
+    hosted = {'type': 'file', 'name': 'bericht.pdf',
+              'file': {'url': 'https://s3.amazonaws.com/x/bericht.pdf?X-Amz-Signature=abc', 'expiry_time': '...'}}
+    external = {'type': 'external', 'name': 'Link', 'external': {'url': 'https://example.com/a.pdf'}}
+
+    assert render_file(hosted) == 'bericht.pdf'
+    assert render_file(external) == 'https://example.com/a.pdf'
@@ -0,0 +1,96 @@
+# test_reverse_sync.py - Reverse-Sync gegen eine simulierte Notion-API (httpx.MockTransport)
+import json
+
+import httpx
+
+from pending_queue import PendingQueue
+from reverse_sync_notion import ObsidianToNotion
+
+DATABASE_ID = 'db000000000000000000000000000001'
+
+
+class FakeNotionApi:
+    """Minimale Notion-API: eine Sync-Database, deren einzige Zeile archiviert ist"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.archived = {row['id'] for row in rows if row.get('archived')}
+        self.created = []
+        self.updated = []
+
+    @staticmethod
+    def error(status, code, message):
+        return httpx.Response(status, json={'object': 'error', 'status': status, 'code': code, 'message': message})
+
+    def __call__(self, request):
+        method, path = request.method, request.url.path.removeprefix('/v1/')
+        body = json.loads(request.content) if request.content else {}
+
+        if method == 'GET' and path == f'databases/{DATABASE_ID}':
+            return httpx.Response(200, json={'object': 'database', 'id': DATABASE_ID,
+                                             'properties': {'Obsidian Path': {'id': 'path'}}})
+        if method == 'POST' and path == f'databases/{DATABASE_ID}/query':
+            # Wie Notion: archivierte Zeilen tauchen im Query nicht (mehr) auf
+            return httpx.Response(200, json={'object': 'list', 'has_more': False, 'next_cursor': None,
+                                             'results': [row for row in self.rows if not row.get('archived')]})
+        if method == 'GET' and path.startswith('pages/'):
+            return self.error(404, 'object_not_found', 'Could not find page')
+        if method == 'PATCH' and path.startswith('pages/'):
+            page_id = path.split('/')[1]
+            if page_id in self.archived:
+                return self.error(400, 'validation_error',
+                                  "Can't edit block that is archived. You must unarchive the block before editing.")
+            self.updated.append(page_id)
+            return httpx.Response(200, json={'object': 'page', 'id': page_id})
+        if method == 'POST' and path == 'pages':
+            page_id = f'new-page-{len(self.created) + 1}'
+            self.created.append(body)
+            return httpx.Response(200, json={'object': 'page', 'id': page_id})
+        if path.startswith('blocks/') and path.endswith('/children'):
+            return httpx.Response(200, json={'object': 'list', 'results': [], 'has_more': False, 'next_cursor': None})
+        return self.error(400, 'invalid_request_url', f'{method} {path}')
+
+
+def row(page_id, path, archived=False):
+    return {'object': 'page', 'id': page_id, 'archived': archived, 'last_edited_time': '2026-01-01T00:00:00.000Z',
+            'properties': {'Obsidian Path': {'type': 'rich_text', 'rich_text': [{'plain_text': path}]}}}
+
+
+def write_note(vault, relative_path):
+    note = vault / relative_path
+    note.parent.mkdir(parents=True, exist_ok=True)
+    note.write_text('---\ntitle: Notiz\nnotion_id: geloeschte-page\nsync_direction: from_notion\n'
+                    'sync_status: pending\n---\nNeuer Inhalt\n', encoding='utf-8')
+
+
+# Kein "archive" im Testnamen: tmp_path enthält ihn, und der Vault-Scan überspringt solche Pfade
+def test_database_row_in_trash_is_recreated(tmp_path):
+    write_note(tmp_path, 'notes/a.md')
+    api = FakeNotionApi([row('alte-zeile', 'notes/a.md')])
+
+    # Erster Lauf: Map kennt Pfad → Zeile, danach wird die Zeile in Notion archiviert
+    syncer = ObsidianToNotion('token', tmp_path, DATABASE_ID, transport=httpx.MockTransport(api))
+    assert syncer.path_index.lookup('notes/a.md') == 'alte-zeile'
+    syncer.path_index.save()
+    api.rows[0]['archived'] = True
+    api.archived.add('alte-zeile')
+
+    syncer = ObsidianToNotion('token', tmp_path, DATABASE_ID, transport=httpx.MockTransport(api))
+    syncer.sync_pending_files()
+
+    assert len(api.created) == 1
+    assert api.created[0]['parent'] == {'database_id': DATABASE_ID}
+    assert syncer.path_index.lookup('notes/a.md') == 'new-page-1'
+    assert 'alte-zeile' not in syncer.path_index.by_page
+    assert PendingQueue(tmp_path).items == {}
+
+
+def test_live_database_row_is_updated_in_place(tmp_path):
+    write_note(tmp_path, 'notes/a.md')
+    api = FakeNotionApi([row('zeile', 'notes/a.md')])
+
+    syncer = ObsidianToNotion('token', tmp_path, DATABASE_ID, transport=httpx.MockTransport(api))
+    syncer.sync_pending_files()
+
+    assert api.updated == ['zeile']
+    assert api.created == []
@@ -0,0 +1,55 @@
+# test_vault_index.py - Pfade im Index nach Umbenennen/Verschieben nachziehen
+from pathlib import Path
+
+from vault_index import VaultIndex
+
+
+def index_with(tmp_path, paths):
+    index = VaultIndex(tmp_path)
+    for notion_id, path in paths.items():
+        index.update(notion_id, path)
+    index.dirty = False
+    return index
+
+
+def test_move_file(tmp_path):
+    index = index_with(tmp_path, {'a': 'from-notion/Alt.md', 'b': 'from-notion/Andere.md'})
+
+    index.move(Path('from-notion/Alt.md'), Path('from-notion/Neu.md'))
+
+    assert index.get('a')['path'] == 'from-notion/Neu.md'
+    assert index.get('b')['path'] == 'from-notion/Andere.md'
+    assert index.dirty
+
+
+def test_move_folder_moves_subtree(tmp_path):
+    index = index_with(tmp_path, {
+        'p': 'from-notion/Projekt/_Projekt.md',
+        'c': 'from-notion/Projekt/Kind.md',
+        'g': 'from-notion/Projekt/Unter/Enkel.md',
+    })
+
+    index.move('from-notion/Projekt', 'from-notion/Archiv/Projekt 2')
+
+    assert index.get('p')['path'] == 'from-notion/Archiv/Projekt 2/_Projekt.md'
+    assert index.get('c')['path'] == 'from-notion/Archiv/Projekt 2/Kind.md'
+    assert index.get('g')['path'] == 'from-notion/Archiv/Projekt 2/Unter/Enkel.md'
+
+
+def test_move_does_not_touch_prefix_siblings(tmp_path):
+    # 'Projekt' darf 'Projektplan' nicht mitverschieben
+    index = index_with(tmp_path, {'x': 'from-notion/Projektplan/Note.md', 'y': 'from-notion/Projekt.md'})
+
+    index.move('from-notion/Projekt', 'from-notion/Neu')
+
+    assert index.get('x')['path'] == 'from-notion/Projektplan/Note.md'
+    assert index.get('y')['path'] == 'from-notion/Projekt.md'
+    assert not index.dirty
+
+
+def test_moved_paths_survive_save(tmp_path):
+    index = index_with(tmp_path, {'a': 'from-notion/Alt/Note.md'})
+    index.move('from-notion/Alt', 'from-notion/Neu')
+    index.save()
+
+    assert VaultIndex(tmp_path).get('a')['path'] == 'from-notion/Neu/Note.md'
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# vault_index.py - Persistenter notion_id → Vault-Pfad Index
+
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+import frontmatter
+
+INDEX_VERSION = 2
+
+# Frontmatter-Felder, die sich bei jedem Lauf ändern, ohne dass sich der Inhalt ändert
+VOLATILE_KEYS = ('synced_at',)
+
+
+class VaultIndex:
+    """notion_id → {path, title, last_edited_time, content_hash, parent_id}
+
+    Liegt als `.notion_index.json` im Vault-Root (wie `.sync_state.json`).
+    Lookups sind O(1); ein kompletter Vault-Scan passiert nur, wenn der
+    Index fehlt, eine alte Version hat oder ein Eintrag ins Leere zeigt.
+    """
+
+    def __init__(self, obsidian_path: Path):
+        self.obsidian_path = Path(obsidian_path)
+        self.index_file = self.obsidian_path / '.notion_index.json'
+        self.entries = {}
+        self.dirty = False
+        self.rebuilt = False
+        self.load()
+
+    def load(self):
+        """Index laden oder bei Bedarf neu aufbauen"""
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+                if data.get('version') == INDEX_VERSION:
+                    self.entries = data.get('entries', {})
+                    return
+                print("🔄 Vault-Index hat alte Version - baue neu auf")
+            except Exception as e:
+                print(f"⚠️ Fehler beim Laden des Vault-Index: {e}")
+
+        self.rebuild()
+
+    def save(self):
+        """Index speichern (nur wenn geändert)"""
+        if not self.dirty:
+            return
+
+        try:
+            tmp_file = self.index_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'updated_at': datetime.now().isoformat(),
+                    'entries': self.entries
+                }, f, indent=2, ensure_ascii=False)
+            tmp_file.replace(self.index_file)
+            self.dirty = False
+        except Exception as e:
+            print(f"⚠️ Fehler beim Speichern des Vault-Index: {e}")
+
+    def rebuild(self):
+        """Kompletter Vault-Scan - nur wenn Index fehlt oder veraltet ist"""
+        print("🔍 Baue Vault-Index auf...")
+        self.entries = {}
+
+        for file_path in self.obsidian_path.glob("**/*.md"):
+            if 'archive' in str(file_path):
+                continue
+
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    post = frontmatter.load(f)
+            except Exception:
+                continue
+
+            notion_id = post.metadata.get('notion_id')
+            if not notion_id or notion_id in self.entries:
+                continue
+
+            self.entries[notion_id] = {
+                'path': str(file_path.relative_to(self.obsidian_path)),
+                'title': post.metadata.get('title'),
+                'last_edited_time': post.metadata.get('updated'),
+                'content_hash': self.hash_content(post.content, post.metadata)
+            }
+
+        self.dirty = True
+        self.rebuilt = True
+        print(f"✅ Vault-Index aufgebaut: {len(self.entries)} Einträge")
+
+    @staticmethod
+    def hash_content(content: str, metadata: dict) -> str:
+        """Hash von Inhalt + Frontmatter ohne flüchtige Felder (synced_at)"""
+        stable_metadata = {k: v for k, v in metadata.items() if k not in VOLATILE_KEYS}
+        digest = hashlib.sha256()
+        digest.update(json.dumps(stable_metadata, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(content.strip().encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, notion_id):
+        """Index-Eintrag für notion_id (oder None)"""
+        return self.entries.get(notion_id)
+
+    def lookup_path(self, notion_id):
+        """Relativer Pfad für notion_id - O(1)"""
+        entry = self.entries.get(notion_id)
+        if not entry:
+            return None
+
+        if (self.obsidian_path / entry['path']).exists():
+            return Path(entry['path'])
+
+        # Eintrag zeigt ins Leere (Datei manuell verschoben/gelöscht) → Index
+        # ist veraltet. Einmal pro Lauf neu aufbauen, danach nur noch entfernen.
+        if not self.rebuilt:
+            self.rebuild()
+            return self.lookup_path(notion_id)
+
+        self.remove(notion_id)
+        return None
+
+    def update(self, notion_id, relative_path, title=None, last_edited_time=None, content_hash=None,
+               parent_id=None):
+        """Eintrag nach einem Schreibvorgang aktualisieren"""
+        self.entries[notion_id] = {
+            'path': str(relative_path),
+            'title': title,
+            'last_edited_time': last_edited_time,
+            'content_hash': content_hash,
+            'parent_id': parent_id
+        }
+        self.dirty = True
+
+    def move(self, old_path, new_path):
+        """Pfade nach einem rename() nachziehen (Datei oder ganzer Ordner-Teilbaum)"""
+        old_path = str(old_path)
+        new_path = str(new_path)
+        old_prefix = old_path + '/'
+
+        for entry in self.entries.values():
+            path = entry['path']
+            if path == old_path:
+                entry['path'] = new_path
+            elif path.startswith(old_prefix):
+                entry['path'] = new_path + '/' + path[len(old_prefix):]
+            else:
+                continue
+            self.dirty = True
+
+    def remove(self, notion_id):
+        """Eintrag entfernen"""
+        if self.entries.pop(notion_id, None) is not None:
+            self.dirty = True
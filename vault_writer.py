@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# vault_writer.py - Write-Behind Stage: atomare Vault-Writes in einem eigenen Thread
+
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_QUEUE_SIZE = int(os.getenv('VAULT_WRITE_QUEUE', '64'))
+BATCH_SIZE = 64
+
+
+class VaultWriter:
+    """Bounded Queue + Writer-Thread für Vault-Dateien
+
+    Jede Datei wird als `.name.tmp` im Zielordner geschrieben, ge-fsynct und
+    per os.replace atomar an ihren Platz gebracht - Obsidian und der Change
+    Detector sehen nie eine halbe Datei. Verzeichnis-fsyncs werden pro
+    Batch zusammengefasst (ein fsync pro Ordner statt pro Datei).
+
+    Fehlgeschlagene Writes sammelt der Writer-Thread nur; `on_error` läuft
+    erst in flush() auf dem aufrufenden Thread (kein Zugriff auf den
+    Vault-Index aus dem Writer-Thread).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, on_error=None):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.on_error = on_error
+        self.failed = []
+        self.failed_lock = threading.Lock()
+        self.stats = {
+            'written': 0, 'errors': 0, 'batches': 0, 'dir_fsyncs': 0,
+            'max_queue_depth': 0, 'total_latency': 0.0, 'max_latency': 0.0
+        }
+        self.thread = threading.Thread(target=self.run, name='vault-writer', daemon=True)
+        self.thread.start()
+
+    def put(self, file_path, content: str, key=None):
+        """Datei zum Schreiben einreihen (blockiert wenn die Queue voll ist)"""
+        self.queue.put((Path(file_path), content, key, time.monotonic()))
+        self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue.qsize())
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            directories = set()
+            for file_path, content, key, enqueued_at in batch:
+                try:
+                    self.write_atomic(file_path, content)
+                    directories.add(file_path.parent)
+                    latency = time.monotonic() - enqueued_at
+                    self.stats['written'] += 1
+                    self.stats['total_latency'] += latency
+                    self.stats['max_latency'] = max(self.stats['max_latency'], latency)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    print(f"⚠️ Fehler beim Speichern von {file_path}: {e}")
+                    with self.failed_lock:
+                        self.failed.append((file_path, key))
+
+            # Renames dauerhaft machen: ein fsync pro Ordner und Batch
+            for directory in directories:
+                self.fsync_directory(directory)
+
+            self.stats['batches'] += 1
+            for _ in batch:
+                self.queue.task_done()
+
+    def write_atomic(self, file_path: Path, content: str):
+        """Temp-Datei im selben Ordner schreiben, fsync, dann atomar umbenennen"""
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+
+    def fsync_directory(self, directory: Path):
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+            self.stats['dir_fsyncs'] += 1
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def flush(self):
+        """Warten bis alle eingereihten Dateien geschrieben sind, dann on_error für Fehlschläge"""
+        self.queue.join()
+        with self.failed_lock:
+            failed, self.failed = self.failed, []
+        if self.on_error:
+            for file_path, key in failed:
+                self.on_error(file_path, key)
+
+    def print_stats(self):
+        """Writer-Statistik ausgeben"""
+        written = self.stats['written']
+        avg_latency = self.stats['total_latency'] / written * 1000 if written else 0
+        print(f"   🖊️ Writer: {written} Dateien in {self.stats['batches']} Batches, "
+              f"{self.stats['dir_fsyncs']} Ordner-fsyncs, max. Queue-Tiefe {self.stats['max_queue_depth']}, "
+              f"Latenz Ø {avg_latency:.1f} ms / max {self.stats['max_latency'] * 1000:.1f} ms")